@@ -9,7 +9,8 @@ import time
 from typing import List
 from fastapi import FastAPI
 from fastapi.responses import JSONResponse
-from fastapi.responses import FileResponse
+from fastapi.responses import Response
+from fastapi import Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import uuid
@@ -18,6 +19,8 @@ from sources.llm_provider import Provider
 from sources.interaction import Interaction
 from sources.agents import CasualAgent, CoderAgent, FileAgent, PlannerAgent, BrowserAgent
 from sources.browser import Browser, create_driver
+from sources.page_cache import PageCache
+from sources.screenshot_frames import ScreenshotFrames
 from sources.utility import pretty_print
 from sources.logger import Logger
 from sources.schemas import QueryRequest, QueryResponse
@@ -58,11 +61,13 @@ api.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 if not os.path.exists(".screenshots"):
     os.makedirs(".screenshots")
 api.mount("/screenshots", StaticFiles(directory=".screenshots"), name="screenshots")
+screenshot_frames = ScreenshotFrames(save_folder=".screenshots")
 
 def initialize_system():
     stealth_mode = config.getboolean('BROWSER', 'stealth_mode')
@@ -95,10 +100,23 @@ def initialize_system():
     )
     logger.info(f"Provider initialized: {provider.provider_name} ({provider.model})")
 
-    browser = Browser(
-        create_driver(headless=headless, stealth_mode=stealth_mode, lang=languages[0]),
-        anticaptcha_manual_install=stealth_mode
-    )
+    page_cache = None # one cache for all the browsers, they share its folder and index
+    if config.getboolean('BROWSER', 'page_cache', fallback=False):
+        page_cache = PageCache(ttl=config.getint('BROWSER', 'page_cache_ttl', fallback=3600))
+
+    def create_browser(anticaptcha_manual_install: bool = False) -> Browser:
+        return Browser(
+            create_driver(headless=headless, stealth_mode=stealth_mode, lang=languages[0],
+                          block_resources=config.get('BROWSER', 'block_resources', fallback="none")),
+            anticaptcha_manual_install=anticaptcha_manual_install,
+            fast_fetch=config.getboolean('BROWSER', 'fast_fetch', fallback=False),
+            timing_profile=config.get('BROWSER', 'timing_profile', fallback="stealth"),
+            page_cache=page_cache,
+            prefetch=config.getint('BROWSER', 'prefetch', fallback=0),
+            screenshot_frames=screenshot_frames
+        )
+
+    browser = create_browser(anticaptcha_manual_install=stealth_mode)
     logger.info("Browser initialized")
 
     agents = [
@@ -120,12 +138,17 @@ def initialize_system():
         BrowserAgent(
             name="Browser",
             prompt_path=f"prompts/{personality_folder}/browser_agent.txt",
-            provider=provider, verbose=False, browser=browser
+            provider=provider, verbose=False, browser=browser,
+            fanout=config.getint('BROWSER', 'fanout', fallback=0)
         ),
         PlannerAgent(
             name="Planner",
             prompt_path=f"prompts/{personality_folder}/planner_agent.txt",
-            provider=provider, verbose=False, browser=browser
+            provider=provider, verbose=False, browser=browser,
+            browser_factory=create_browser,
+            max_browsers=config.getint('BROWSER', 'max_browsers', fallback=1),
+            plan_review=config.get('MAIN', 'plan_review', fallback="verify"),
+            plan_cache=config.getboolean('MAIN', 'plan_cache', fallback=False)
         )
     ]
     logger.info("Agents initialized")
@@ -145,11 +168,15 @@ is_generating = False
 query_resp_history = []
 
 @api.get("/screenshot")
-async def get_screenshot():
+async def get_screenshot(request: Request):
     logger.info("Screenshot endpoint called")
-    screenshot_path = ".screenshots/updated_screen.png"
-    if os.path.exists(screenshot_path):
-        return FileResponse(screenshot_path)
+    screenshot_frames.watched()
+    frame = screenshot_frames.latest()
+    if frame is not None:
+        headers = {"ETag": frame["etag"], "Cache-Control": "no-cache"}
+        if request.headers.get("if-none-match") == frame["etag"]:
+            return Response(status_code=304, headers=headers)
+        return Response(content=frame["data"], media_type="image/png", headers=headers)
     logger.error("No screenshot available")
     return JSONResponse(
         status_code=404,
@@ -172,6 +199,15 @@ async def stop():
     interaction.current_agent.request_stop()
     return JSONResponse(status_code=200, content={"status": "stopped"})
 
+@api.get("/tool_output")
+async def get_tool_output():
+    if interaction.current_agent is None:
+        return JSONResponse(status_code=404, content={"error": "No agent available"})
+    return JSONResponse(status_code=200, content={
+        "agent_name": interaction.current_agent.agent_name,
+        "output": interaction.current_agent.tool_output
+    })
+
 @api.get("/latest_answer")
 async def get_latest_answer():
     global query_resp_history
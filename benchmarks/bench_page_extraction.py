@@ -0,0 +1,71 @@
+"""
+Compare the page text extraction engines on a saved html corpus.
+
+Usage:
+    python benchmarks/bench_page_extraction.py [corpus_dir] [--repeat N]
+
+Every .html file of the corpus (default: benchmarks/html_corpus) is converted with the
+legacy markdownify engine and the lxml engine, the script report if the outputs are
+identical, their similarity when they differ, and the time taken by each engine.
+"""
+
+import os
+import sys
+import glob
+import time
+import difflib
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sources.page_extractor import extract_page_text, LXML_AVAILABLE
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "html_corpus")
+
+def time_engine(html: str, engine: str, repeat: int) -> tuple:
+    """Run an engine repeat times, return the output and the best time in milliseconds."""
+    best = float("inf")
+    output = ""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = extract_page_text(html, engine=engine)
+        best = min(best, time.perf_counter() - start)
+    return output, best * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark page text extraction engines.")
+    parser.add_argument("corpus", nargs="?", default=DEFAULT_CORPUS, help="Directory of saved html pages.")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per page, the best time is kept.")
+    args = parser.parse_args()
+
+    if not LXML_AVAILABLE:
+        print("lxml is not installed, nothing to compare.")
+        return 1
+    files = sorted(glob.glob(os.path.join(args.corpus, "**", "*.html"), recursive=True))
+    if not files:
+        print(f"No html file found in {args.corpus}")
+        return 1
+
+    total_legacy = total_lxml = 0.0
+    identical = 0
+    print(f"{'page':<40} {'same':>5} {'ratio':>6} {'markdownify':>12} {'lxml':>9} {'speedup':>8}")
+    for path in files:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            html = f.read()
+        legacy, legacy_ms = time_engine(html, "markdownify", args.repeat)
+        fast, fast_ms = time_engine(html, "lxml", args.repeat)
+        same = legacy == fast
+        ratio = 1.0 if same else difflib.SequenceMatcher(None, legacy.splitlines(), fast.splitlines()).ratio()
+        identical += same
+        total_legacy += legacy_ms
+        total_lxml += fast_ms
+        name = os.path.relpath(path, args.corpus)[:40]
+        print(f"{name:<40} {str(same):>5} {ratio:>6.3f} {legacy_ms:>10.1f}ms {fast_ms:>7.1f}ms {legacy_ms / max(fast_ms, 1e-6):>7.1f}x")
+
+    print(f"\n{identical}/{len(files)} pages identical, "
+          f"markdownify {total_legacy:.1f}ms, lxml {total_lxml:.1f}ms, "
+          f"speedup {total_legacy / max(total_lxml, 1e-6):.1f}x")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,6 +9,7 @@ from sources.llm_provider import Provider
 from sources.interaction import Interaction
 from sources.agents import Agent, CoderAgent, CasualAgent, FileAgent, PlannerAgent, BrowserAgent, McpAgent
 from sources.browser import Browser, create_driver
+from sources.page_cache import PageCache
 from sources.utility import pretty_print
 
 import warnings
@@ -30,10 +31,22 @@ async def main():
                         server_address=config["MAIN"]["provider_server_address"],
                         is_local=config.getboolean('MAIN', 'is_local'))
 
-    browser = Browser(
-        create_driver(headless=config.getboolean('BROWSER', 'headless_browser'), stealth_mode=stealth_mode, lang=languages[0]),
-        anticaptcha_manual_install=stealth_mode
-    )
+    page_cache = None # one cache for all the browsers, they share its folder and index
+    if config.getboolean('BROWSER', 'page_cache', fallback=False):
+        page_cache = PageCache(ttl=config.getint('BROWSER', 'page_cache_ttl', fallback=3600))
+
+    def create_browser(anticaptcha_manual_install: bool = False) -> Browser:
+        return Browser(
+            create_driver(headless=config.getboolean('BROWSER', 'headless_browser'), stealth_mode=stealth_mode, lang=languages[0],
+                          block_resources=config.get('BROWSER', 'block_resources', fallback="none")),
+            anticaptcha_manual_install=anticaptcha_manual_install,
+            fast_fetch=config.getboolean('BROWSER', 'fast_fetch', fallback=False),
+            timing_profile=config.get('BROWSER', 'timing_profile', fallback="stealth"),
+            page_cache=page_cache,
+            prefetch=config.getint('BROWSER', 'prefetch', fallback=0)
+        )
+
+    browser = create_browser(anticaptcha_manual_install=stealth_mode)
 
     agents = [
         CasualAgent(name=config["MAIN"]["agent_name"],
@@ -47,10 +60,15 @@ async def main():
                   provider=provider, verbose=False),
         BrowserAgent(name="Browser",
                      prompt_path=f"prompts/{personality_folder}/browser_agent.txt",
-                     provider=provider, verbose=False, browser=browser),
+                     provider=provider, verbose=False, browser=browser,
+                     fanout=config.getint('BROWSER', 'fanout', fallback=0)),
         PlannerAgent(name="Planner",
                      prompt_path=f"prompts/{personality_folder}/planner_agent.txt",
-                     provider=provider, verbose=False, browser=browser),
+                     provider=provider, verbose=False, browser=browser,
+                     browser_factory=create_browser,
+                     max_browsers=config.getint('BROWSER', 'max_browsers', fallback=1),
+                     plan_review=config.get('MAIN', 'plan_review', fallback="verify"),
+                     plan_cache=config.getboolean('MAIN', 'plan_cache', fallback=False)),
         #McpAgent(name="MCP Agent",
         #            prompt_path=f"prompts/{personality_folder}/mcp_agent.txt",
         #            provider=provider, verbose=False), # NOTE under development
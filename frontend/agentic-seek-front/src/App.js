@@ -20,6 +20,7 @@ function App() {
   const [status, setStatus] = useState("Agents ready");
   const [expandedReasoning, setExpandedReasoning] = useState(new Set());
   const messagesEndRef = useRef(null);
+  const screenshotEtag = useRef(null);
 
   const fetchLatestAnswer = useCallback(async () => {
     try {
@@ -78,13 +79,17 @@ function App() {
 
   const fetchScreenshot = async () => {
     try {
-      const timestamp = new Date().getTime();
-      const res = await axios.get(
-        `${BACKEND_URL}/screenshots/updated_screen.png?timestamp=${timestamp}`,
-        {
-          responseType: "blob",
-        }
-      );
+      const res = await axios.get(`${BACKEND_URL}/screenshot`, {
+        responseType: "blob",
+        headers: screenshotEtag.current
+          ? { "If-None-Match": screenshotEtag.current }
+          : {},
+        validateStatus: (status) => status === 200 || status === 304,
+      });
+      if (res.status === 304) {
+        return;
+      }
+      screenshotEtag.current = res.headers.etag || null;
       console.log("Screenshot fetched successfully");
       const imageUrl = URL.createObjectURL(res.data);
       setResponseData((prev) => {
@@ -99,6 +104,7 @@ function App() {
       });
     } catch (err) {
       console.error("Error fetching screenshot:", err);
+      screenshotEtag.current = null;
       setResponseData((prev) => ({
         ...prev,
         screenshot: "placeholder.png",
@@ -40,6 +40,7 @@ setup(
         "librosa>=0.10.2.post1",
         "selenium>=4.29.0",
         "markdownify>=1.1.0",
+        "lxml>=5.0.0",
         "text2emotion>=0.0.5",
         "python-dotenv>=1.0.0",
         "adaptive-classifier>=0.0.10",
@@ -4,6 +4,7 @@ from abc import abstractmethod
 import os
 import random
 import time
+import threading
 
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
@@ -11,9 +12,13 @@ from concurrent.futures import ThreadPoolExecutor
 from sources.memory import Memory
 from sources.utility import pretty_print
 from sources.schemas import executorResult
+from sources.tools.block_parser import parse_blocks
 
 random.seed(time.time())
 
+TOOL_OUTPUT_LIMIT = 20000 # characters of the running tool output kept for the API, per block
+MAX_TOOL_WORKERS = 4
+
 class Agent():
     """
     An abstract class for all agents.
@@ -46,9 +51,12 @@ class Agent():
         self.last_answer = ""
         self.last_reasoning = ""
         self.status_message = "Haven't started yet"
+        self.tool_outputs = {}
+        self.block_labels = {}
         self.stop = False
         self.verbose = verbose
         self.executor = ThreadPoolExecutor(max_workers=1)
+        self.tool_executor = ThreadPoolExecutor(max_workers=MAX_TOOL_WORKERS)
     
     @property
     def get_agent_name(self) -> str:
@@ -89,6 +97,19 @@ class Agent():
     def get_blocks_result(self) -> list:
         return self.blocks_result
 
+    @property
+    def tool_output(self) -> str:
+        """The output of the blocks of the last answer, each under the label of its block."""
+        return "\n".join(f"[{label}]\n{output}" for label, output in list(self.tool_outputs.items()))
+
+    def stream_tool_output(self, chunk: str) -> None:
+        """
+        Receive the output of a running tool as it is printed, only the end is kept.
+        The chunk goes to the output of the block run by the calling thread, so blocks running at the same time don't mix.
+        """
+        label = self.block_labels.get(threading.get_ident(), "tool")
+        self.tool_outputs[label] = (self.tool_outputs.get(label, "") + chunk)[-TOOL_OUTPUT_LIMIT:]
+
     def add_tool(self, name: str, tool: Callable) -> None:
         if tool is not Callable:
             raise TypeError("Tool must be a callable object (a method)")
@@ -252,34 +273,92 @@ class Agent():
         pretty_print(block, color="code")
         pretty_print('▂'*64, color="status")
 
-    def execute_modules(self, answer: str) -> Tuple[bool, str]:
+    def run_block(self, name: str, tool, block: str, save: tuple = None, label: str = None) -> executorResult:
+        """
+        Execute a block with a tool, called from the tool executor threads.
+        Args:
+            name (str): Name of the tool.
+            tool: The tool executing the block.
+            block (str): The block to execute.
+            save (tuple, optional): The blocks of the tool and their save path, saved if the block succeed.
+            label (str, optional): Label of the block output in tool_output, default to the tool name.
+        Returns:
+            executorResult: The result of the block.
+        """
+        thread_id = threading.get_ident()
+        self.block_labels[thread_id] = label or name
+        try:
+            output = tool.execute([block])
+        finally:
+            self.block_labels.pop(thread_id, None)
+        feedback = tool.interpreter_feedback(output) # tool interpreter feedback
+        success = not tool.execution_failure_check(output)
+        if success and save is not None:
+            tool.save_block(*save)
+        return executorResult(block, feedback, success, name)
+
+    async def execute_modules(self, answer: str) -> Tuple[bool, str]:
         """
         Execute all the tools the agent has and return the result.
+        The blocks run on the tool executor, off the event loop, in the order they appear in the answer.
+        A block of a tool that changes things (interpreters) waits for every block before it and is skipped if one failed,
+        blocks of read only tools run at the same time once the blocks before them that change things are done.
+        Results are added to blocks_result in the order of the blocks.
         """
         feedback = ""
-        success = True
-        blocks = None
         if answer.startswith("```"):
             answer = "I will execute:\n" + answer # there should always be a text before blocks for the function that display answer
 
         self.success = True
+        self.tool_outputs = {}
+        tags = [block.tag for block in parse_blocks(answer) if block.complete]
+        jobs = []
         for name, tool in self.tools.items():
-            feedback = ""
             blocks, save_path = tool.load_exec_block(answer)
-
             if blocks != None:
                 pretty_print(f"Executing {len(blocks)} {name} blocks...", color="status")
-                for block in blocks:
-                    self.show_block(block)
-                    output = tool.execute([block])
-                    feedback = tool.interpreter_feedback(output) # tool interpreter feedback
-                    success = not tool.execution_failure_check(output)
-                    self.blocks_result.append(executorResult(block, feedback, success, name))
-                    if not success:
-                        self.success = False
-                        self.memory.push('user', feedback)
-                        return False, feedback
+                tool.set_output_listener(self.stream_tool_output)
+                positions = [position for position, tag in enumerate(tags) if tag == tool.tag]
+                for i, (block, position) in enumerate(zip(blocks, positions)):
+                    save = (blocks, save_path) if save_path != None and i == len(blocks) - 1 else None
+                    jobs.append((position, name, tool, block, save, i == len(blocks) - 1, f"{name} block {i + 1}"))
+        jobs.sort(key=lambda job: job[0])
+        for job in jobs:
+            self.show_block(job[3])
+
+        loop = asyncio.get_event_loop()
+        async def run_job(job, after):
+            results = await asyncio.gather(*after)
+            if any(result is None or not result.success for result in results):
+                return None # a block it depends on failed, not executed
+            if self.stop:
+                return None
+            _, name, tool, block, save, _, label = job
+            return await loop.run_in_executor(self.tool_executor, self.run_block, name, tool, block, save, label)
+
+        tasks = []
+        last_ordered = None
+        for job in jobs:
+            if job[2].read_only:
+                after = [last_ordered] if last_ordered is not None else []
+            else:
+                after = list(tasks) # even read only blocks, a read must not see the changes of a later block
+            task = asyncio.ensure_future(run_job(job, after))
+            if not job[2].read_only:
+                last_ordered = task
+            tasks.append(task)
+        results = await asyncio.gather(*tasks)
+
+        for (_, name, tool, block, save, last_of_tool, _), result in zip(jobs, results):
+            if result is None:
+                self.success = False
+                return False, "Execution stopped."
+            self.blocks_result.append(result)
+            feedback = result.feedback
+            if not result.success:
+                self.success = False
+                self.memory.push('user', feedback)
+                return False, feedback
+            if last_of_tool:
                 self.memory.push('user', feedback)
-                if save_path != None:
-                    tool.save_block(blocks, save_path)
         return True, feedback
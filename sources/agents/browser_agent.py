@@ -1,9 +1,11 @@
 import re
 import time
 from datetime import date
-from typing import List, Tuple, Type, Dict
+from functools import partial
+from typing import List, Tuple, Type, Dict, Callable
 from enum import Enum
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 
 from sources.utility import pretty_print, animate_thinking
 from sources.agents.agent import Agent
@@ -11,6 +13,8 @@ from sources.tools.searxSearch import searxSearch
 from sources.browser import Browser
 from sources.logger import Logger
 from sources.memory import Memory
+from sources.relevance import select_relevant_text, reciprocal_rank_fusion
+from sources.boilerplate import BoilerplateIndex
 
 class Action(Enum):
     REQUEST_EXIT = "REQUEST_EXIT"
@@ -20,9 +24,12 @@ class Action(Enum):
     SEARCH = "SEARCH"
     
 class BrowserAgent(Agent):
-    def __init__(self, name, prompt_path, provider, verbose=False, browser=None):
+    def __init__(self, name, prompt_path, provider, verbose=False, browser=None, fanout=0, search_variants=3):
         """
         The Browser agent is an agent that navigate the web autonomously in search of answer
+        Args:
+            fanout (int): Number of links explored and summarized in parallel when the LLM choose several, 0 or 1 to disable.
+            search_variants (int): Number of search queries the LLM can write, searched concurrently and merged.
         """
         super().__init__(name, prompt_path, provider, verbose, browser)
         self.tools = {
@@ -37,6 +44,12 @@ class BrowserAgent(Agent):
         self.last_action = Action.NAVIGATE.value
         self.notes = []
         self.date = self.get_today_date()
+        self.fanout = fanout
+        self.text_budget = 32768
+        self.boilerplate = BoilerplateIndex()
+        self.fanout_executor = ThreadPoolExecutor(max_workers=fanout) if fanout > 1 else None
+        self.search_variants = max(1, search_variants)
+        self.search_executor = ThreadPoolExecutor(max_workers=self.search_variants)
         self.logger = Logger("browser_agent.log")
         self.memory = Memory(self.load_prompt(prompt_path),
                         recover_last_session=False, # session recovery in handled by the interaction class
@@ -86,8 +99,45 @@ class BrowserAgent(Agent):
         Your goal is to find accurate and complete information to satisfy the user’s request.
         User request: {prompt}
         To proceed, choose a relevant link from the search results. Announce your choice by saying: "I will navigate to <link>"
+        {self.fanout_instruction()}
         Do not explain your choice.
         """
+
+    def fanout_instruction(self) -> str:
+        if self.fanout < 2:
+            return ""
+        return f"""If the request needs several sources, you can choose up to {self.fanout} links, they will be read at the same time.
+        Write one "I will navigate to <link>" line per link."""
+
+    def make_fanout_prompt(self, user_prompt: str, search_result: List[dict]) -> str:
+        """Prompt to decide the next step after several pages were explored in parallel."""
+        notes = '\n'.join([note for note in self.notes if note])
+        search_choice = self.stringify_search_results(search_result)
+        return f"""
+        You explored several pages at the same time and took these notes:
+        {notes}
+
+        Remaining search results:
+        {search_choice}
+
+        User request: {user_prompt}
+        Do your notes fully answer the request? Did you verify with multiple pages?
+        If yes, say {Action.REQUEST_EXIT.value} and explain why.
+        If not, choose other links from the remaining search results by saying: "I will navigate to <link>"
+        {self.fanout_instruction()}
+        """
+
+    def make_page_note_prompt(self, user_prompt: str, link: str, page_text: str) -> str:
+        return f"""
+        Webpage ({link}) content:
+        {page_text}
+        End of webpage ({link}).
+
+        User request: {user_prompt}
+        If the page is relevant, write a single paragraph starting with "Note:" with the key facts useful for the request.
+        Notes should be factual and include specific names, numbers or links. Written as: "On {link}, <key fact 1>. <Key fact 2>."
+        If the page is not relevant, only write: "Error: <reason the page does not address the request>".
+        """
     
     def make_navigation_prompt(self, user_prompt: str, page_text: str) -> str:
         remaining_links = self.get_unvisited_links() 
@@ -248,13 +298,102 @@ class BrowserAgent(Agent):
         self.logger.warning("No suitable link selected.")
         return None
     
-    def get_page_text(self, limit_to_model_ctx = False) -> str:
-        """Get the text content of the current page."""
-        page_text = self.browser.get_text()
-        if limit_to_model_ctx:
-            #page_text = self.memory.compress_text_to_max_ctx(page_text)
-            page_text = self.memory.trim_text_to_max_ctx(page_text)
+    def select_fanout_links(self, links: List[str]) -> List[str]:
+        """Select up to fanout unvisited links, without duplicate."""
+        selected = []
+        for lk in links:
+            if lk == self.current_page or lk in self.search_history or lk in selected:
+                continue
+            selected.append(lk)
+        return selected[:self.fanout]
+
+    def page_note_request(self, user_prompt: str, link: str, page_text: str) -> str | None:
+        """Ask the LLM to take a note on a page, with a standalone history so calls can run concurrently."""
+        history = [
+            {'role': 'system', 'content': self.memory.get()[0]['content']},
+            {'role': 'user', 'content': self.make_page_note_prompt(user_prompt, link, page_text)}
+        ]
+        answer = self.remove_reasoning_text(self.llm.respond(history, self.verbose)).strip()
+        if "Note:" not in answer:
+            self.logger.info(f"Page {link} not relevant: {answer[:200]}")
+            return None
+        return answer[answer.find("Note:") + len("Note:"):].strip()
+
+    async def run_browser(self, action: Callable, *args, **kwargs):
+        """Run a blocking browser action (Selenium calls) on the agent executor, so other tasks keep running."""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self.executor, partial(action, *args, **kwargs))
+
+    async def explore_pages(self, user_prompt: str, links: List[str]) -> int:
+        """
+        Load several pages and take notes on them with parallel LLM calls.
+        Args:
+            user_prompt: The user's input query
+            links: The links to explore
+        Returns:
+            int: The number of notes taken
+        """
+        loop = asyncio.get_event_loop()
+        self.status_message = f"Reading {len(links)} pages..."
+        animate_thinking(f"Reading {len(links)} pages in parallel...", color="status")
+        pages = await self.run_browser(self.browser.load_pages, links)
+        self.search_history.extend(links)
+        pages = [(link, self.select_page_text(self.remove_boilerplate(link, text), user_prompt)) for link, text in pages if text]
+        for link, _ in pages:
+            pretty_print(f"Read {link}", color="status")
+        start = time.time()
+        notes = await asyncio.gather(*[
+            loop.run_in_executor(self.fanout_executor, self.page_note_request, user_prompt, link, text)
+            for link, text in pages
+        ], return_exceptions=True)
+        taken = 0
+        for (link, _), note in zip(pages, notes):
+            if isinstance(note, Exception):
+                self.logger.error(f"Note request failed for {link}: {str(note)}")
+                continue
+            if note:
+                self.notes.append(note)
+                taken += 1
+        self.logger.info(f"Explored {len(links)} pages, {taken} notes taken in {time.time() - start:.1f}s of parallel LLM calls.")
+        return taken
+
+    def get_page_text(self, limit_to_model_ctx = False, query: str = None) -> str:
+        """
+        Get the text content of the current page.
+        Args:
+            limit_to_model_ctx (bool): Reduce the text to the model context size.
+            query (str, optional): Keep the parts of the page the most relevant to the query instead of the page beginning.
+        """
+        if query is None:
+            page_text = self.remove_boilerplate(self.browser.get_current_url(), self.browser.get_text())
+            if limit_to_model_ctx:
+                #page_text = self.memory.compress_text_to_max_ctx(page_text)
+                page_text = self.memory.trim_text_to_max_ctx(page_text)
+            return page_text
+        page_text = self.browser.get_text(max_chars=None)
+        if page_text is None:
+            return None
+        page_text = self.remove_boilerplate(self.browser.get_current_url(), page_text)
+        return self.select_page_text(page_text, query, limit_to_model_ctx)
+
+    def remove_boilerplate(self, url: str, page_text: str) -> str:
+        """Remove the lines repeated on most pages of the domain (menus, footers, cookie banners)."""
+        if page_text is None:
+            return None
+        page_text, tokens_saved = self.boilerplate.filter(url, page_text)
+        if tokens_saved:
+            self.logger.info(f"Boilerplate removed from {url}: ~{tokens_saved} tokens saved, {self.boilerplate.get_tokens_saved()} in total.")
         return page_text
+
+    def select_page_text(self, page_text: str, query: str, limit_to_model_ctx: bool = True) -> str:
+        """Keep the chunks of the page text the most relevant to the query within the text budget."""
+        budget = self.text_budget
+        if limit_to_model_ctx:
+            budget = min(budget, self.memory.get_ideal_ctx(self.memory.model_provider) or budget)
+        selected = select_relevant_text(page_text, query, budget)
+        if len(selected) < len(page_text):
+            self.logger.info(f"Page text reduced from {len(page_text)} to {len(selected)} characters for: {query[:64]}")
+        return selected
     
     def conclude_prompt(self, user_query: str) -> str:
         annotated_notes = [f"{i+1}: {note.lower()}" for i, note in enumerate(self.notes)]
@@ -274,22 +413,102 @@ class BrowserAgent(Agent):
     def search_prompt(self, user_prompt: str) -> str:
         return f"""
         Current date: {self.date}
-        Make a efficient search engine query to help users with their request:
+        Make efficient search engine queries to help users with their request:
         {user_prompt}
+        {self.search_variants_instruction()}
         Example:
         User: "go to twitter, login with username toto and password pass79 to my twitter and say hello everyone "
         You: search: Twitter login page. 
 
         User: "I need info on the best laptops for AI this year."
-        You: "search: best laptops 2025 to run Machine Learning model, reviews"
+        You:
+        search: best laptops 2025 to run Machine Learning model, reviews
+        search: laptop GPU VRAM comparison for local LLM 2025
 
         User: "Search for recent news about space missions."
-        You: "search: Recent space missions news, {self.date}"
+        You:
+        search: Recent space missions news, {self.date}
+        search: NASA ESA SpaceX launch schedule {self.date}
 
-        Do not explain, do not write anything beside the search query.
+        Do not explain, do not write anything beside the search queries.
         Except if query does not make any sense for a web search then explain why and say {Action.REQUEST_EXIT.value}
         Do not try to answer query. you can only formulate search term or exit.
         """
+
+    def search_variants_instruction(self) -> str:
+        if self.search_variants < 2:
+            return "Write a single query as: search: <query>"
+        return f"""Write up to {self.search_variants} different queries, one per line as: search: <query>
+        Vary the wording, keywords or angle of each query so they find different pages. A simple request only needs one query."""
+
+    def extract_search_queries(self, text: str) -> List[str]:
+        """Extract the "search: <query>" lines written by the LLM (bullets allowed), the whole answer if there are none."""
+        queries = []
+        for match in re.findall(r'^\s*(?:[-*]|\d+[.)])?\s*search:[ \t]*(.+)$', text, re.IGNORECASE | re.MULTILINE):
+            query = match.strip().strip('"').strip()
+            if query and query.lower() not in [q.lower() for q in queries]:
+                queries.append(query)
+        if not queries and text.strip():
+            queries.append(text.strip())
+        return queries[:self.search_variants]
+
+    def result_key(self, link: str) -> str:
+        """Key to deduplicate search results pointing to the same page."""
+        if self.browser is not None:
+            link = self.browser.clean_url(link)
+        return link.rstrip('/')
+
+    def merge_search_results(self, results_lists: List[List[dict]]) -> List[dict]:
+        """
+        Merge the results of several queries, deduplicated by cleaned url and ranked with reciprocal rank fusion.
+        Args:
+            results_lists: The parsed results of each query, best result first.
+        Returns:
+            List[dict]: The merged results, pages found by several queries first.
+        """
+        results = {}
+        rankings = []
+        for search_result in results_lists:
+            ranking = []
+            for res in search_result:
+                if "link" not in res:
+                    continue
+                key = self.result_key(res["link"])
+                results.setdefault(key, res)
+                ranking.append(key)
+            rankings.append(ranking)
+        return [results[key] for key, _ in reciprocal_rank_fusion(rankings)]
+
+    async def multi_search(self, queries: List[str]) -> List[dict]:
+        """
+        Run the search queries concurrently and merge their results.
+        Args:
+            queries: The search queries
+        Returns:
+            List[dict]: The merged search results
+        Raises:
+            Exception: When every search failed with an exception.
+        """
+        loop = asyncio.get_event_loop()
+        start = time.time()
+        outputs = await asyncio.gather(*[
+            loop.run_in_executor(self.search_executor, self.tools["web_search"].execute, [query], False)
+            for query in queries
+        ], return_exceptions=True)
+        results_lists = []
+        errors = []
+        for query, output in zip(queries, outputs):
+            if isinstance(output, Exception):
+                self.logger.error(f"Search failed for {query}: {str(output)}")
+                errors.append(output)
+                continue
+            results_lists.append(self.jsonify_search_results(output))
+        if errors and not results_lists:
+            raise errors[0]
+        merged = self.merge_search_results(results_lists)
+        total = sum(len(search_result) for search_result in results_lists)
+        self.logger.info(f"{len(queries)} searches in {time.time() - start:.1f}s: {total} results, {len(merged)} unique pages.")
+        return merged
     
     def handle_update_prompt(self, user_prompt: str, page_text: str, fill_success: bool) -> str:
         prompt = f"""
@@ -349,14 +568,16 @@ class BrowserAgent(Agent):
             return ai_prompt, "" 
         animate_thinking(f"Searching...", color="status")
         self.status_message = "Searching..."
-        search_result_raw = self.tools["web_search"].execute([ai_prompt], False)
-        search_result = self.jsonify_search_results(search_result_raw)[:16]
+        queries = self.extract_search_queries(ai_prompt)
+        self.logger.info(f"Search queries: {queries}")
+        search_result = (await self.multi_search(queries))[:16]
         self.show_search_results(search_result)
         prompt = self.make_newsearch_prompt(user_prompt, search_result)
         unvisited = [None]
         while not complete and len(unvisited) > 0 and not self.stop:
             self.memory.clear()
             unvisited = self.select_unvisited(search_result)
+            self.browser.prefetch([res["link"] for res in unvisited])
             answer, reasoning = await self.llm_decide(prompt, show_reasoning = False)
             if self.stop:
                 pretty_print(f"Requested stop.", color="failure")
@@ -371,19 +592,26 @@ class BrowserAgent(Agent):
             if len(extracted_form) > 0:
                 self.status_message = "Filling web form..."
                 pretty_print(f"Filling inputs form...", color="status")
-                fill_success = self.browser.fill_form(extracted_form)
-                page_text = self.get_page_text(limit_to_model_ctx=True)
+                fill_success = await self.run_browser(self.browser.fill_form, extracted_form)
+                page_text = await self.run_browser(self.get_page_text, limit_to_model_ctx=True, query=user_prompt)
                 answer = self.handle_update_prompt(user_prompt, page_text, fill_success)
                 answer, reasoning = await self.llm_decide(prompt)
 
             if Action.FORM_FILLED.value in answer:
                 pretty_print(f"Filled form. Handling page update.", color="status")
-                page_text = self.get_page_text(limit_to_model_ctx=True)
-                self.navigable_links = self.browser.get_navigable()
-                prompt = self.make_navigation_prompt(user_prompt, page_text)
+                page_text = await self.run_browser(self.get_page_text, limit_to_model_ctx=True, query=user_prompt)
+                self.navigable_links = await self.run_browser(self.browser.get_navigable)
+                prompt = await self.run_browser(self.make_navigation_prompt, user_prompt, page_text)
                 continue
 
             links = self.parse_answer(answer)
+            if self.fanout > 1 and Action.REQUEST_EXIT.value not in answer and len(extracted_form) == 0:
+                fanout_links = self.select_fanout_links(links)
+                if len(fanout_links) > 1:
+                    await self.explore_pages(user_prompt, fanout_links)
+                    self.current_page = self.search_history[-1]
+                    prompt = self.make_fanout_prompt(user_prompt, self.select_unvisited(search_result))
+                    continue
             link = self.select_link(links)
             if link == self.current_page:
                 pretty_print(f"Already visited {link}. Search callback.", color="status")
@@ -410,19 +638,23 @@ class BrowserAgent(Agent):
 
             animate_thinking(f"Navigating to {link}", color="status")
             if speech_module: speech_module.speak(f"Navigating to {link}")
-            nav_ok = self.browser.go_to(link)
+            nav_ok = await self.run_browser(self.browser.go_to, link)
             self.search_history.append(link)
             if not nav_ok:
                 pretty_print(f"Failed to navigate to {link}.", color="failure")
                 prompt = self.make_newsearch_prompt(user_prompt, unvisited)
                 continue
             self.current_page = link
-            page_text = self.get_page_text(limit_to_model_ctx=True)
-            self.navigable_links = self.browser.get_navigable()
-            prompt = self.make_navigation_prompt(user_prompt, page_text)
+            page_text = await self.run_browser(self.get_page_text, limit_to_model_ctx=True, query=user_prompt)
+            self.navigable_links = await self.run_browser(self.browser.get_navigable)
+            prompt = await self.run_browser(self.make_navigation_prompt, user_prompt, page_text)
             self.status_message = "Navigating..."
-            self.browser.screenshot()
+            await self.run_browser(self.browser.screenshot)
 
+        self.browser.cancel_prefetch()
+        self.logger.info(f"Driver navigation totals: {self.browser.get_navigation_totals()}")
+        if self.boilerplate.get_tokens_saved():
+            pretty_print(f"Skipped ~{self.boilerplate.get_tokens_saved()} tokens of repeated site boilerplate.", color="info")
         pretty_print("Exited navigation, starting to summarize finding...", color="status")
         prompt = self.conclude_prompt(user_prompt)
         mem_last_idx = self.memory.push('user', prompt)
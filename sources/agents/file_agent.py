@@ -3,6 +3,7 @@ import asyncio
 from sources.utility import pretty_print, animate_thinking
 from sources.agents.agent import Agent
 from sources.tools.fileFinder import FileFinder
+from sources.tools.contentSearch import ContentSearch
 from sources.tools.BashInterpreter import BashInterpreter
 from sources.memory import Memory
 
@@ -14,6 +15,7 @@ class FileAgent(Agent):
         super().__init__(name, prompt_path, provider, verbose, None)
         self.tools = {
             "file_finder": FileFinder(),
+            "content_search": ContentSearch(),
             "bash": BashInterpreter()
         }
         self.work_dir = self.tools["file_finder"].get_work_dir()
@@ -33,7 +35,7 @@ class FileAgent(Agent):
             animate_thinking("Thinking...", color="status")
             answer, reasoning = await self.llm_request()
             self.last_reasoning = reasoning
-            exec_success, _ = self.execute_modules(answer)
+            exec_success, _ = await self.execute_modules(answer)
             answer = self.remove_blocks(answer)
             self.last_answer = answer
         self.status_message = "Ready"
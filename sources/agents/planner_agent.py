@@ -1,5 +1,9 @@
+import os
+import re
 import json
-from typing import List, Tuple, Type, Dict
+import time
+import asyncio
+from typing import List, Tuple, Type, Dict, Callable
 from sources.utility import pretty_print, animate_thinking
 from sources.agents.agent import Agent
 from sources.agents.code_agent import CoderAgent
@@ -10,24 +14,48 @@ from sources.text_to_speech import Speech
 from sources.tools.tools import Tools
 from sources.logger import Logger
 from sources.memory import Memory
+from sources.browser_pool import BrowserPool
+from sources.plan_cache import PlanCache
+
+PLAN_REVIEW_POLICIES = ["always", "on_failure", "verify"]
+ARTIFACT_PATTERN = r'\b[\w\-./]+\.(?:txt|md|csv|json|py|js|html|css|c|h|go|java|sh|yaml|yml|xml|sql|log)\b'
+ARTIFACT_VERBS = r'\b(?:save|write|create|store|export|generate)\b'
+ERROR_MARKERS = ["Traceback (most recent call last)", "Error:", "Exception:", "command not found", "No such file or directory"]
 
 class PlannerAgent(Agent):
-    def __init__(self, name, prompt_path, provider, verbose=False, browser=None):
+    def __init__(self, name, prompt_path, provider, verbose=False, browser=None,
+                 browser_factory: Callable = None, max_browsers=1, max_parallel_tasks=4, plan_review="verify",
+                 plan_cache=False):
         """
         The planner agent is a special agent that divides and conquers the task.
+        Tasks whose dependencies are done run at the same time, each on a new agent.
+        Args:
+            browser_factory (Callable, optional): Create an additional Browser for web tasks running at the same time.
+            max_browsers (int): Maximum number of browsers used at the same time, the main one included.
+            max_parallel_tasks (int): Maximum number of tasks running at the same time.
+            plan_review (str): When the LLM reviews the plan after a task: always, on_failure, or verify (on failure or when a local check finds a problem).
+            plan_cache (bool): Reuse the plans that succeeded for goals of the same form.
         """
+        if plan_review not in PLAN_REVIEW_POLICIES:
+            raise ValueError(f"Unknown plan review policy: {plan_review}. Choose from {PLAN_REVIEW_POLICIES}")
         super().__init__(name, prompt_path, provider, verbose, None)
         self.tools = {
             "json": Tools()
         }
         self.tools['json'].tag = "json"
         self.browser = browser
+        self.browser_pool = BrowserPool(browser, factory=browser_factory, size=max_browsers)
+        self.max_parallel_tasks = max(1, max_parallel_tasks)
         self.agents = {
-            "coder": CoderAgent(name, "prompts/base/coder_agent.txt", provider, verbose=False),
-            "file": FileAgent(name, "prompts/base/file_agent.txt", provider, verbose=False),
-            "web": BrowserAgent(name, "prompts/base/browser_agent.txt", provider, verbose=False, browser=browser),
-            "casual": CasualAgent(name, "prompts/base/casual_agent.txt", provider, verbose=False)
+            "coder": (CoderAgent, "prompts/base/coder_agent.txt"),
+            "file": (FileAgent, "prompts/base/file_agent.txt"),
+            "web": (BrowserAgent, "prompts/base/browser_agent.txt"),
+            "casual": (CasualAgent, "prompts/base/casual_agent.txt")
         }
+        self.active_agents = []
+        self.plan_review = plan_review
+        self.plan_reviews_skipped = 0
+        self.plan_cache = PlanCache() if plan_cache else None
         self.role = "planification"
         self.type = "planner_agent"
         self.memory = Memory(self.load_prompt(prompt_path),
@@ -35,6 +63,25 @@ class PlannerAgent(Agent):
                                 memory_compression=False,
                                 model_provider=provider.get_model_name())
         self.logger = Logger("planner_agent.log")
+
+    def create_agent(self, agent_type: str, browser=None) -> Agent:
+        """
+        Create a new agent for a task, so tasks running at the same time don't share memory.
+        Args:
+            agent_type (str): The agent name in the plan (coder, file, web, casual).
+            browser: The browser leased for a web task.
+        Returns:
+            Agent: The new agent.
+        """
+        agent_class, agent_prompt_path = self.agents[agent_type]
+        if agent_class is BrowserAgent:
+            return agent_class(self.agent_name, agent_prompt_path, self.llm, verbose=False, browser=browser)
+        return agent_class(self.agent_name, agent_prompt_path, self.llm, verbose=False)
+
+    def request_stop(self) -> None:
+        super().request_stop()
+        for agent in self.active_agents:
+            agent.request_stop()
     
     def get_task_names(self, text: str) -> List[str]:
         """
@@ -169,9 +216,82 @@ class PlannerAgent(Agent):
         self.logger.info(f"Plan made:\n{answer}")
         return self.parse_agent_tasks(answer)
     
+    def verify_task_output(self, task: dict, agent_work: str) -> str | None:
+        """
+        Cheap local check of a task output, without LLM call.
+        Args:
+            task (dict): The task performed.
+            agent_work (str): The result of the agent work.
+        Returns:
+            str | None: The problem found, None if the output looks fine.
+        """
+        output = agent_work.replace("Agent succeeded with task.", "").strip()
+        if len(output) < 16:
+            return "the agent output is empty"
+        for marker in ERROR_MARKERS:
+            if marker in output:
+                return f"the agent output contains an error ({marker})"
+        if not re.search(ARTIFACT_VERBS, task['task'], re.IGNORECASE):
+            return None
+        work_dir = self.tools['json'].get_work_dir()
+        for artifact in set(re.findall(ARTIFACT_PATTERN, task['task'])):
+            if "://" in artifact or artifact.startswith("www."):
+                continue
+            if not os.path.exists(os.path.join(work_dir, artifact)) and os.path.basename(artifact) not in output:
+                return f"the file {artifact} mentioned in the task was not found"
+        return None
+
+    def should_review_plan(self, task: dict | None, agent_work: str, success: bool) -> str | None:
+        """
+        Decide if the LLM should review the plan after a task, according to the plan review policy.
+        Returns:
+            str | None: The reason of the review, None to skip it.
+        """
+        if not success:
+            return "The agent reported a failure."
+        if self.plan_review == "always":
+            return "Review requested after each task."
+        if self.plan_review == "verify" and task is not None:
+            problem = self.verify_task_output(task, agent_work)
+            if problem is not None:
+                return f"A local check found a problem: {problem}."
+        return None
+
+    def make_template_prompt(self, goal: str, plan: List[list]) -> str:
+        plan_json = json.dumps({"plan": [task for _, task in plan]}, indent=2)
+        return f"""
+        This plan worked for a similar goal:
+        ```json
+        {plan_json}
+        ```
+        Adapt it to the goal: {goal}
+        Keep the same agents, ids and needs, only change the tasks descriptions if needed.
+        Write the task names followed by the plan within ```json. Do not explain.
+        """
+
+    async def get_plan(self, goal: str) -> List[list]:
+        """
+        Get a plan for the goal, from the plan cache when a plan succeeded for a goal of the same form.
+        An exact template is used as is, otherwise the LLM adapts it in one short call.
+        Args:
+            goal (str): The goal to be achieved.
+        Returns:
+            List[list]: The plan, as (task name, task) pairs.
+        """
+        cached = self.plan_cache.get(goal) if self.plan_cache is not None else None
+        if cached is None:
+            return await self.make_plan(goal)
+        if cached["exact"]:
+            pretty_print("Reusing a plan that worked for a similar request.", color="info")
+            self.show_plan(cached["plan"], "")
+            return cached["plan"]
+        pretty_print("Adapting a plan that worked for a similar request...", color="status")
+        return await self.make_plan(self.make_template_prompt(goal, cached["plan"]))
+
     async def update_plan(self, goal: str, agents_tasks: List[dict], agents_work_result: dict, id: str, success: bool) -> dict:
         """
         Updates the plan with the results of the agents work.
+        The LLM is only asked when the plan review policy requires it.
         Args:
             goal (str): The goal to be achieved.
             agents_tasks (list): The tasks assigned to each agent.
@@ -183,6 +303,13 @@ class PlannerAgent(Agent):
         last_agent_work = agents_work_result[id]
         tool_success_str = "success" if success else "failure"
         pretty_print(f"Agent {id} work {tool_success_str}.", color="success" if success else "failure")
+        task = next((task for _, task in agents_tasks if task['id'] == id), None)
+        review_reason = self.should_review_plan(task, last_agent_work, success)
+        if review_reason is None:
+            self.plan_reviews_skipped += 1
+            self.logger.info(f"Task {id} verified, plan review skipped ({self.plan_reviews_skipped} LLM calls saved).")
+            return agents_tasks
+        self.logger.info(f"Reviewing plan after task {id}: {review_reason}")
         try:
             id_int = int(id)
         except Exception as e:
@@ -191,14 +318,13 @@ class PlannerAgent(Agent):
             next_task = "No task follow, this was the last step. If it failed add a task to recover."
         else:
             next_task = f"Next task is: {agents_tasks[int(id)][0]}."
-        #if success:
-        #    return agents_tasks # we only update the plan if last task failed, for now
         update_prompt = f"""
         Your goal is : {goal}
         You previously made a plan, agents are currently working on it.
         The last agent working on task: {id}, did the following work:
         {last_agent_work}
         Agent {id} work was a {tool_success_str} according to system interpreter.
+        {review_reason}
         {next_task}
         Is the work done for task {id} leading to success or failure ? Did an agent fail with a task?
         If agent work was good: answer "NO_UPDATE"
@@ -217,12 +343,13 @@ class PlannerAgent(Agent):
         self.logger.info(f"Plan updated:\n{plan}")
         return plan
     
-    async def start_agent_process(self, task: dict, required_infos: dict | None) -> str:
+    async def start_agent_process(self, task: dict, required_infos: dict | None, agent: Agent) -> str:
         """
         Starts the agent process for a given task.
         Args:
             task (dict): The task to be performed.
             required_infos (dict | None): The required information for the task.
+            agent (Agent): The agent working on the task.
         Returns:
             str: The result of the agent process.
         """
@@ -230,26 +357,88 @@ class PlannerAgent(Agent):
         agent_prompt = self.make_prompt(task['task'], required_infos)
         pretty_print(f"Agent {task['agent']} started working...", color="status")
         self.logger.info(f"Agent {task['agent']} started working on {task['task']}.")
-        answer, reasoning = await self.agents[task['agent'].lower()].process(agent_prompt, None)
+        answer, reasoning = await agent.process(agent_prompt, None)
         self.last_answer = answer
         self.last_reasoning = reasoning
-        self.blocks_result = self.agents[task['agent'].lower()].blocks_result
-        agent_answer = self.agents[task['agent'].lower()].raw_answer_blocks(answer)
-        success = self.agents[task['agent'].lower()].get_success
-        self.agents[task['agent'].lower()].show_answer()
+        self.blocks_result = agent.blocks_result
+        agent_answer = agent.raw_answer_blocks(answer)
+        success = agent.get_success
+        agent.show_answer()
         pretty_print(f"Agent {task['agent']} completed task.", color="status")
         self.logger.info(f"Agent {task['agent']} finished working on {task['task']}. Success: {success}")
         agent_answer += "\nAgent succeeded with task." if success else "\nAgent failed with task (Error detected)."
         return agent_answer, success
+
+    async def run_task(self, task: dict, required_infos: dict | None) -> Tuple[str, bool]:
+        """
+        Run a task on a new agent, web tasks lease a browser for their duration.
+        Args:
+            task (dict): The task to be performed.
+            required_infos (dict | None): The required information for the task.
+        Returns:
+            Tuple[str, bool]: The result of the agent process and its success.
+        """
+        agent_type = task['agent'].lower()
+        if agent_type != "web":
+            agent = self.create_agent(agent_type)
+            self.active_agents.append(agent)
+            try:
+                return await self.start_agent_process(task, required_infos, agent)
+            finally:
+                self.active_agents.remove(agent)
+        async with self.browser_pool.lease() as browser:
+            agent = self.create_agent(agent_type, browser)
+            self.active_agents.append(agent)
+            try:
+                return await self.start_agent_process(task, required_infos, agent)
+            finally:
+                self.active_agents.remove(agent)
     
     def get_work_result_agent(self, task_needs, agents_work_result):
         res = {k: agents_work_result[k] for k in task_needs if k in agents_work_result}
         self.logger.info(f"Next agent needs: {task_needs}.\n Match previous agent result: {res}")
         return res
 
+    def get_task_keys(self, agents_tasks: List[dict]) -> List[str]:
+        """
+        Key of each task of the plan: its id, followed by #n for the n-th repetition of an id.
+        A plan update can add a task with the id of a failed one to try it again.
+        """
+        keys = []
+        seen = {}
+        for _, task in agents_tasks:
+            task_id = str(task['id'])
+            count = seen.get(task_id, 0)
+            seen[task_id] = count + 1
+            keys.append(task_id if count == 0 else f"{task_id}#{count}")
+        return keys
+
+    def get_ready_tasks(self, agents_tasks: List[dict], agents_work_result: dict, started: set) -> List[list]:
+        """
+        Get the tasks not started yet whose needed tasks are done, in plan order.
+        A need on an id that is not in the plan is ignored.
+        Args:
+            agents_tasks (list): The plan, as (task name, task) pairs.
+            agents_work_result (dict): The results of the finished tasks by id.
+            started (set): The keys of the tasks already started (see get_task_keys).
+        Returns:
+            List[list]: The (task key, task name, task) of the tasks ready to run.
+        """
+        plan_ids = set(str(task['id']) for _, task in agents_tasks)
+        done_ids = set(str(task_id) for task_id in agents_work_result.keys())
+        ready = []
+        for key, (task_name, task) in zip(self.get_task_keys(agents_tasks), agents_tasks):
+            if key in started:
+                continue
+            needs = [str(need) for need in task.get('need', []) if str(need) in plan_ids]
+            if all(need in done_ids for need in needs):
+                ready.append([key, task_name, task])
+        return ready
+
     async def process(self, goal: str, speech_module: Speech) -> Tuple[str, str]:
         """
         Process the goal by dividing it into tasks and assigning them to agents.
+        Tasks run as soon as the tasks they need are done, independent tasks run at the same time.
         Args:
             goal (str): The goal to be achieved (user prompt).
             speech_module (Speech): The speech module for text-to-speech.
@@ -257,35 +446,58 @@ class PlannerAgent(Agent):
             Tuple[str, str]: The result of the agent process and empty reasoning string.
         """
         agents_tasks = []
-        required_infos = None
         agents_work_result = dict()
+        answer = ""
 
         self.status_message = "Making a plan..."
-        agents_tasks = await self.make_plan(goal)
+        agents_tasks = await self.get_plan(goal)
 
         if agents_tasks == []:
             return "Failed to parse the tasks.", ""
-        i = 0
-        steps = len(agents_tasks)
-        while i < steps and not self.stop:
-            task_name, task = agents_tasks[i][0], agents_tasks[i][1]
-            self.status_message = "Starting agents..."
-            pretty_print(f"I will {task_name}.", color="info")
-            self.last_answer = f"I will {task_name.lower()}."
-            pretty_print(f"Assigned agent {task['agent']} to {task_name}", color="info")
-            if speech_module: speech_module.speak(f"I will {task_name}. I assigned the {task['agent']} agent to the task.")
-
-            if agents_work_result is not None:
-                required_infos = self.get_work_result_agent(task['need'], agents_work_result)
-            try:
-                answer, success = await self.start_agent_process(task, required_infos)
-            except Exception as e:
-                raise e
-            if self.stop:
-                pretty_print(f"Requested stop.", color="failure")
-            agents_work_result[task['id']] = answer
-            agents_tasks = await self.update_plan(goal, agents_tasks, agents_work_result, task['id'], success)
-            steps = len(agents_tasks)
-            i += 1
-
-        return answer, ""
+        running = {}
+        started = set()
+        all_success = True
+        start = time.time()
+        try:
+            while not self.stop:
+                ready = self.get_ready_tasks(agents_tasks, agents_work_result, started)
+                if not ready and not running:
+                    keys = self.get_task_keys(agents_tasks)
+                    pending = next(([key, name, task] for key, (name, task) in zip(keys, agents_tasks) if key not in started), None)
+                    if pending is None:
+                        break
+                    self.logger.warning(f"No task ready, dependency cycle in plan. Starting task {pending[0]}.")
+                    ready = [pending]
+                for key, task_name, task in ready[:self.max_parallel_tasks - len(running)]:
+                    started.add(key)
+                    self.status_message = "Starting agents..."
+                    pretty_print(f"I will {task_name}.", color="info")
+                    self.last_answer = f"I will {task_name.lower()}."
+                    pretty_print(f"Assigned agent {task['agent']} to {task_name}", color="info")
+                    if speech_module: speech_module.speak(f"I will {task_name}. I assigned the {task['agent']} agent to the task.")
+                    required_infos = self.get_work_result_agent(task.get('need', []), agents_work_result)
+                    running[asyncio.ensure_future(self.run_task(task, required_infos))] = task
+                if not running:
+                    break
+                done, _ = await asyncio.wait(running.keys(), return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    task = running.pop(future)
+                    answer, success = future.result()
+                    agents_work_result[task['id']] = answer
+                    all_success = all_success and success
+                    if self.stop:
+                        pretty_print(f"Requested stop.", color="failure")
+                        break
+                    agents_tasks = await self.update_plan(goal, agents_tasks, agents_work_result, task['id'], success)
+        finally:
+            for future in running.keys():
+                future.cancel()
+            self.browser_pool.close()
+        self.logger.info(f"Plan of {len(agents_tasks)} tasks done in {time.time() - start:.1f}s.")
+        all_started = all(key in started for key in self.get_task_keys(agents_tasks))
+        if self.plan_cache is not None and all_success and not self.stop and all_started:
+            self.plan_cache.put(goal, agents_tasks)
+        if self.plan_reviews_skipped:
+            pretty_print(f"Skipped {self.plan_reviews_skipped} plan review LLM calls.", color="info")
+        last_id = agents_tasks[-1][1]['id']
+        return agents_work_result.get(last_id, answer), ""
@@ -0,0 +1,89 @@
+import os
+import sys
+import hashlib
+from collections import Counter
+from urllib.parse import urlparse
+from typing import Tuple
+
+if __name__ == "__main__": # if running as a script for individual testing
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sources.logger import Logger
+
+PAGE_MARKERS = ["[Start of page]", "[End of page]"]
+
+class BoilerplateIndex:
+    """
+    Per domain line frequency index built while browsing.
+    Lines found on most visited pages of a domain (cookie banners, menus, footers) are removed from the page text.
+    """
+    def __init__(self, min_pages: int = 3, threshold: float = 0.6, chars_per_token: int = 4):
+        """
+        Args:
+            min_pages (int): Pages of a domain to visit before removing lines.
+            threshold (float): Fraction of the domain pages a line must appear on to be removed.
+            chars_per_token (int): Characters per token used to estimate the tokens saved.
+        """
+        self.logger = Logger("boilerplate.log")
+        self.min_pages = min_pages
+        self.threshold = threshold
+        self.chars_per_token = chars_per_token
+        self.domains = {}
+        self.chars_saved = 0
+
+    def get_domain(self, url: str) -> str:
+        netloc = urlparse(url).netloc.lower()
+        return netloc[4:] if netloc.startswith("www.") else netloc
+
+    def line_key(self, line: str) -> str:
+        return hashlib.md5(' '.join(line.split()).lower().encode('utf-8')).hexdigest()
+
+    def observe(self, url: str, lines: list) -> dict:
+        """Count the lines of a page, a page is only counted once per url."""
+        domain = self.get_domain(url)
+        record = self.domains.setdefault(domain, {"urls": set(), "lines": Counter()})
+        if url not in record["urls"]:
+            record["urls"].add(url)
+            record["lines"].update(set(self.line_key(line) for line in lines))
+        return record
+
+    def filter(self, url: str, text: str) -> Tuple[str, int]:
+        """
+        Remove the lines seen on most pages of the url domain.
+        Args:
+            url (str): The page url.
+            text (str): The page text, lines separated by blank lines.
+        Returns:
+            Tuple[str, int]: The filtered text and the estimated number of tokens saved.
+        """
+        if not text or not url:
+            return text, 0
+        lines = [line for line in text.split("\n\n") if line.strip() and line.strip() not in PAGE_MARKERS]
+        record = self.observe(url, lines)
+        pages = len(record["urls"])
+        if pages < self.min_pages:
+            return text, 0
+        kept = []
+        removed = 0
+        for line in text.split("\n\n"):
+            stripped = line.strip()
+            if stripped and stripped not in PAGE_MARKERS and record["lines"][self.line_key(stripped)] / pages >= self.threshold:
+                removed += len(line) + 2
+                continue
+            kept.append(line)
+        if removed == 0:
+            return text, 0
+        self.chars_saved += removed
+        tokens = removed // self.chars_per_token
+        self.logger.info(f"Removed ~{tokens} tokens of boilerplate from {url} ({pages} pages seen on {self.get_domain(url)}).")
+        return "\n\n".join(kept), tokens
+
+    def get_tokens_saved(self) -> int:
+        return self.chars_saved // self.chars_per_token
+
+if __name__ == "__main__":
+    index = BoilerplateIndex()
+    for i in range(4):
+        page = f"[Start of page]\n\nWe use cookies to improve your experience.\n\nArticle {i} talks about something different.\n\n[End of page]"
+        print(index.filter(f"https://example.com/article/{i}", page))
+    print(index.get_tokens_saved())
@@ -8,7 +8,7 @@ from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.common.action_chains import ActionChains
 from typing import List, Tuple, Type, Dict
 from bs4 import BeautifulSoup
-from urllib.parse import urlparse
+from urllib.parse import urlparse, urljoin
 from fake_useragent import UserAgent
 from selenium_stealth import stealth
 import undetected_chromedriver as uc
@@ -21,7 +21,6 @@ import os
 import shutil
 import uuid
 import tempfile
-import markdownify
 import sys
 import re
 
@@ -29,6 +28,11 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from sources.utility import pretty_print, animate_thinking
 from sources.logger import Logger
+from sources.fast_fetch import FastFetcher
+from sources.page_extractor import extract_page_text, is_sentence, LXML_AVAILABLE
+from sources.page_cache import normalize_url
+from sources.prefetcher import Prefetcher
+from sources.screenshot_frames import ScreenshotFrames
 
 
 def get_chrome_path() -> str:
@@ -217,8 +221,58 @@ def create_undetected_chromedriver(service, chrome_options) -> webdriver.Chrome:
     driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})") 
     return driver
 
-def create_driver(headless=False, stealth_mode=True, crx_path="./crx/nopecha.crx", lang="en") -> webdriver.Chrome:
-    """Create a Chrome WebDriver with specified options."""
+IMAGE_PATTERNS = ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.bmp", "*.ico", "*.svg"]
+FONT_PATTERNS = ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"]
+MEDIA_PATTERNS = ["*.mp4", "*.webm", "*.ogg", "*.mp3", "*.wav", "*.m4a", "*.m3u8", "*.mpd"]
+TRACKER_DOMAINS = [
+    "doubleclick.net", "googlesyndication.com", "googleadservices.com", "google-analytics.com",
+    "googletagmanager.com", "googletagservices.com", "adservice.google.com", "connect.facebook.net",
+    "amazon-adsystem.com", "adnxs.com", "criteo.com", "criteo.net", "taboola.com", "outbrain.com",
+    "scorecardresearch.com", "quantserve.com", "hotjar.com", "mixpanel.com", "segment.io",
+    "newrelic.com", "nr-data.net", "pubmatic.com", "rubiconproject.com", "openx.net", "moatads.com",
+    "chartbeat.com", "clarity.ms", "bat.bing.com", "ads.linkedin.com", "analytics.tiktok.com",
+]
+
+# request blocking profiles, the agent only read text and forms
+BLOCKING_PROFILES = {
+    "none": [],
+    "trackers": ["trackers"],
+    "text": ["images", "fonts", "media", "trackers"],
+}
+
+def get_blocked_url_patterns(profile: str) -> List[str]:
+    """Get the url patterns blocked by a blocking profile (none, trackers or text)."""
+    if profile not in BLOCKING_PROFILES:
+        raise ValueError(f"Unknown resource blocking profile: {profile}. Choose from {list(BLOCKING_PROFILES.keys())}")
+    categories = {
+        "images": IMAGE_PATTERNS,
+        "fonts": FONT_PATTERNS,
+        "media": MEDIA_PATTERNS,
+        "trackers": [f"*{domain}/*" for domain in TRACKER_DOMAINS],
+    }
+    patterns = []
+    for category in BLOCKING_PROFILES[profile]:
+        patterns.extend(categories[category])
+    return patterns
+
+def apply_resource_blocking(driver, profile: str) -> bool:
+    """Block the requests of a blocking profile with the CDP Network.setBlockedURLs command."""
+    patterns = get_blocked_url_patterns(profile)
+    if not patterns:
+        return False
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    except Exception as e:
+        pretty_print(f"Could not enable resource blocking: {str(e)}", color="warning")
+        return False
+    return True
+
+def create_driver(headless=False, stealth_mode=True, crx_path="./crx/nopecha.crx", lang="en", block_resources="none") -> webdriver.Chrome:
+    """
+    Create a Chrome WebDriver with specified options.
+    block_resources is the request blocking profile applied in headless mode: none, trackers or text.
+    """
     # Warn if trying to run non-headless in Docker
     if not headless and os.path.exists('/.dockerenv'):
         print("[WARNING] Running non-headless browser in Docker may fail!")
@@ -239,18 +293,167 @@ def create_driver(headless=False, stealth_mode=True, crx_path="./crx/nopecha.crx
             renderer="Intel Iris OpenGL Engine",
             fix_hairline=True,
         )
-        return driver
     else:
-        return webdriver.Chrome(service=service, options=chrome_options)
+        driver = webdriver.Chrome(service=service, options=chrome_options)
+    if headless:
+        apply_resource_blocking(driver, block_resources)
+    return driver
+
+TIMING_PROFILES = {
+    # human-like random pauses, the original behavior
+    "stealth": {
+        "event_driven": False,
+        "human_scroll": True,
+        "pauses": {
+            "before_navigation": (0.4, 2.5),
+            "after_navigation": (0.01, 0.3),
+            "after_safety": (0.01, 0.2),
+            "scroll": (0.5, 2.0),
+            "scroll_back": (0.3, 1.0),
+            "click": (0.1, 0.1),
+            "inputs": (0.5, 0.5),
+            "scroll_bottom": (0.5, 0.5),
+            "screenshot": (0.1, 0.1),
+        }
+    },
+    # short pauses, page events are awaited
+    "balanced": {
+        "event_driven": True,
+        "human_scroll": True,
+        "pauses": {
+            "before_navigation": (0.1, 0.5),
+            "after_navigation": (0.0, 0.1),
+            "scroll": (0.2, 0.6),
+            "scroll_back": (0.1, 0.3),
+            "click": (0.05, 0.05),
+        }
+    },
+    # no pause at all, only page events are awaited
+    "fast": {
+        "event_driven": True,
+        "human_scroll": False,
+        "pauses": {}
+    },
+}
+
+class TimingPolicy:
+    """
+    Control the human-emulation pauses of the browser.
+    In event driven profiles the sleeps are replaced by waits on document.readyState, network idle or rendering.
+    The time spent sleeping and waiting is reported per navigation.
+    """
+    def __init__(self, profile: str = "stealth"):
+        if profile not in TIMING_PROFILES:
+            raise ValueError(f"Unknown timing profile: {profile}. Choose from {list(TIMING_PROFILES.keys())}")
+        self.profile = profile
+        self.event_driven = TIMING_PROFILES[profile]["event_driven"]
+        self.human_scroll = TIMING_PROFILES[profile]["human_scroll"]
+        self.pauses = TIMING_PROFILES[profile]["pauses"]
+        self.slept = 0.0
+        self.waited = 0.0
+        self.navigation_start = time.time()
+
+    def pause(self, kind: str) -> None:
+        """Sleep for a kind of action according to the profile, do nothing if the profile has no pause for it."""
+        low, high = self.pauses.get(kind, (0.0, 0.0))
+        if high <= 0:
+            return
+        duration = random.uniform(low, high)
+        time.sleep(duration)
+        self.slept += duration
+
+    def wait_ready(self, driver, timeout: float = 10) -> None:
+        """Wait for document.readyState to be complete."""
+        if not self.event_driven:
+            return
+        start = time.time()
+        try:
+            WebDriverWait(driver, timeout).until(
+                lambda d: d.execute_script("return document.readyState") == "complete"
+            )
+        except TimeoutException:
+            pass
+        finally:
+            self.waited += time.time() - start
+
+    def wait_network_idle(self, driver, idle_time: float = 0.5, timeout: float = 3.0) -> None:
+        """Wait until no new resource has been loaded by the page for idle_time seconds."""
+        if not self.event_driven:
+            return
+        start = time.time()
+        try:
+            last_count = -1
+            last_change = start
+            while time.time() - start < timeout:
+                count = driver.execute_script("return performance.getEntriesByType('resource').length")
+                if count != last_count:
+                    last_count = count
+                    last_change = time.time()
+                elif time.time() - last_change >= idle_time:
+                    break
+                time.sleep(0.05)
+        except WebDriverException:
+            pass
+        finally:
+            self.waited += time.time() - start
+
+    def wait_frame(self, driver) -> None:
+        """Wait for the page to render a new frame (eg: after a zoom change)."""
+        if not self.event_driven:
+            return
+        start = time.time()
+        try:
+            driver.execute_async_script("const done = arguments[0]; requestAnimationFrame(() => requestAnimationFrame(done));")
+        except WebDriverException:
+            pass
+        finally:
+            self.waited += time.time() - start
+
+    def start_navigation(self) -> None:
+        self.slept = 0.0
+        self.waited = 0.0
+        self.navigation_start = time.time()
+
+    def end_navigation(self) -> dict:
+        """Return the time spent sleeping and waiting since start_navigation."""
+        return {
+            "profile": self.profile,
+            "slept": round(self.slept, 3),
+            "waited": round(self.waited, 3),
+            "total": round(time.time() - self.navigation_start, 3)
+        }
 
 class Browser:
-    def __init__(self, driver, anticaptcha_manual_install=False):
-        """Initialize the browser with optional AntiCaptcha installation."""
+    def __init__(self, driver, anticaptcha_manual_install=False, fast_fetch=False, timing_profile="stealth",
+                 page_cache=None, prefetch=0, screenshot_frames=None):
+        """
+        Initialize the browser with optional AntiCaptcha installation.
+        Args:
+            driver: The Selenium webdriver.
+            anticaptcha_manual_install (bool): Open the anticaptcha extension page on startup.
+            fast_fetch (bool): Try to load pages over plain HTTP before using the driver.
+            timing_profile (str): Human-emulation timing profile: stealth, balanced or fast.
+            page_cache (PageCache, optional): Cache of the extracted pages serving revisited urls, shared by the browsers, None to disable.
+            prefetch (int): Number of search results loaded in the background while the LLM decide, need fast_fetch.
+            screenshot_frames (ScreenshotFrames, optional): Where screenshots are published, shared with the API.
+        """
         self.js_scripts_folder = "./sources/web_scripts/" if not __name__ == "__main__" else "./web_scripts/"
+        self.js_cache = {}
         self.anticaptcha = "https://chrome.google.com/webstore/detail/nopecha-captcha-solver/dknlfmjaanfblgfdfebhijalfmhmjjjo/related"
         self.logger = Logger("browser.log")
         self.screenshot_folder = os.path.join(os.getcwd(), ".screenshots")
+        self.frames = screenshot_frames or ScreenshotFrames(save_folder=self.screenshot_folder)
         self.tabs = []
+        self.fast_fetcher = FastFetcher() if fast_fetch else None
+        self.http_page = None # page served over HTTP, None when the driver hold the current page
+        self.timing = TimingPolicy(timing_profile)
+        self.last_navigation_timing = None
+        self.last_navigation_resources = None
+        self.navigation_totals = {"pages": 0, "bytes": 0, "load_time": 0}
+        self.text_engine = "lxml" if LXML_AVAILABLE else "markdownify"
+        self.page_cache = page_cache
+        self.prefetch_size = prefetch
+        self.prefetcher = Prefetcher(self.fetch_http_page, max_workers=prefetch) if prefetch > 0 and self.fast_fetcher is not None else None
         try:
             self.driver = driver
             self.wait = WebDriverWait(self.driver, 10)
@@ -291,25 +494,217 @@ class Browser:
         actions.click().perform()
 
     def human_scroll(self):
+        if not self.timing.human_scroll:
+            return
         for _ in range(random.randint(1, 3)):
             scroll_pixels = random.randint(150, 1200)
             self.driver.execute_script(f"window.scrollBy(0, {scroll_pixels});")
-            time.sleep(random.uniform(0.5, 2.0))
+            self.timing.pause("scroll")
             if random.random() < 0.4:
                 self.driver.execute_script(f"window.scrollBy(0, -{random.randint(50, 300)});")
-                time.sleep(random.uniform(0.3, 1.0))
+                self.timing.pause("scroll_back")
 
     def patch_browser_fingerprint(self) -> None:
         script = self.load_js("spoofing.js")
         self.driver.execute_script(script)
     
     def go_to(self, url:str) -> bool:
-        """Navigate to a specified URL."""
-        time.sleep(random.uniform(0.4, 2.5))
+        """Navigate to a specified URL, from the page cache or over HTTP when possible, with the driver otherwise."""
+        cached = self.get_cached_page(url)
+        if cached is not None and cached["fresh"]:
+            return self.serve_cached_page(url, cached)
+        if self.fast_fetch_page(url, cached):
+            return True
+        if self.driver_go_to(url):
+            self.cache_current_page(url)
+            return True
+        return False
+
+    def get_cached_page(self, url:str) -> dict | None:
+        """Get the cache entry of an url, None when the cache is disabled or the page not cached."""
+        if self.page_cache is None:
+            return None
+        return self.page_cache.get(normalize_url(url))
+
+    def serve_cached_page(self, url:str, cached:dict) -> bool:
+        """Use a cached page as current page, without the network or the driver."""
+        self.http_page = {
+            "url": url,
+            "final_url": cached["final_url"],
+            "status": 200,
+            "html": "",
+            "headers": {},
+            "text": cached["text"],
+            "title": cached["title"],
+            "links": cached["links"],
+            "inputs": cached["inputs"],
+            "from_cache": True,
+        }
+        self.logger.log(f"Navigated to: {url} from page cache.")
+        return True
+
+    def cache_current_page(self, url:str) -> None:
+        """Store the current page in the page cache, following the Cache-Control of the server."""
+        if self.page_cache is None:
+            return
+        headers = self.http_page["headers"] if self.http_page is not None else {}
+        cache_control = headers.get("cache-control", "").lower()
+        if "no-store" in cache_control:
+            return
+        max_age = re.search(r'max-age=(\d+)', cache_control)
+        text = self.get_text()
+        if not text:
+            return
+        if self.http_page is not None:
+            inputs = self.get_http_page_inputs()
+        else:
+            inputs = self.driver.execute_script(self.load_js("find_inputs.js")) or []
+        entry = {
+            "url": url,
+            "final_url": self.get_current_url(),
+            "title": self.get_page_title(),
+            "text": text,
+            "links": self.get_page_links(),
+            "inputs": inputs,
+            "etag": headers.get("etag"),
+            "last_modified": headers.get("last-modified"),
+        }
+        self.page_cache.put(normalize_url(url), entry, ttl=int(max_age.group(1)) if max_age else None)
+
+    def fast_fetch_page(self, url:str, cached:dict = None) -> bool:
+        """
+        Try to load the page over HTTP without the driver.
+        A stale cached page is revalidated with its ETag/Last-Modified and served from the cache when not modified.
+        Return False when the page must be escalated to the driver (needs JS, bot wall, too little text...).
+        """
+        if self.fast_fetcher is None or not self.fast_fetcher.should_try(url):
+            return False
+        validators = {}
+        if cached is not None and cached.get("etag"):
+            validators["If-None-Match"] = cached["etag"]
+        if cached is not None and cached.get("last_modified"):
+            validators["If-Modified-Since"] = cached["last_modified"]
+        prefetched = self.prefetcher.take(normalize_url(url), timeout=self.fast_fetcher.timeout) if self.prefetcher is not None else None
+        if prefetched is not None:
+            page, reason = prefetched
+        else:
+            page, reason = self.fetch_http_page(url, headers=validators or None)
+        if page is not None and page["status"] == 304:
+            if cached is not None:
+                self.page_cache.touch(normalize_url(url))
+                return self.serve_cached_page(url, cached)
+            page, reason = None, "status_304"
+        self.fast_fetcher.record(url, reason)
+        if reason is not None:
+            return False
+        self.http_page = page
+        self.logger.log(f"Navigated to: {url} over HTTP/{page['http_version']} ({page['bytes']} bytes in {page['elapsed']:.2f}s)")
+        self.cache_current_page(url)
+        return True
+
+    def fetch_http_page(self, url:str, headers:dict = None) -> Tuple[dict | None, str | None]:
+        """
+        Fetch a page over HTTP and extract its text, safe to call from the prefetch threads.
+        Returns:
+            Tuple[dict | None, str | None]: The page with its text, and the escalation reason (None if the page is usable).
+        """
+        page, reason = self.fast_fetcher.fetch(url, headers=headers)
+        if page is None or page["status"] == 304:
+            return page, reason
+        text = None
+        try:
+            text = self.html_to_text(page["html"])
+        except Exception as e:
+            self.logger.error(f"Error extracting text of {url}: {str(e)}")
+        page["text"] = text
+        return page, self.fast_fetcher.escalation_reason(page["html"], text)
+
+    def prefetch(self, urls:List[str], limit:int = None) -> None:
+        """Start loading the first urls in the background, go_to use them when one is chosen."""
+        if self.prefetcher is None:
+            return
+        limit = limit or self.prefetch_size
+        to_fetch = {}
+        for url in urls:
+            if len(to_fetch) >= limit:
+                break
+            key = normalize_url(url)
+            if not self.fast_fetcher.should_try(url) or (self.page_cache is not None and self.page_cache.is_fresh_key(key)):
+                continue
+            to_fetch[key] = url
+        self.prefetcher.prefetch(to_fetch)
+
+    def load_pages(self, urls:List[str]) -> List[Tuple[str, str | None]]:
+        """
+        Load several pages and get their text.
+        Pages are fetched in parallel by the prefetcher when enabled, pages needing the driver are loaded one by one.
+        Returns:
+            List[Tuple[str, str | None]]: The url and full text of each page, text is None when the page could not be loaded.
+        """
+        self.prefetch(urls, limit=len(urls))
+        pages = []
+        for url in urls:
+            text = self.get_text(max_chars=None) if self.go_to(url) else None
+            pages.append((url, text))
+        return pages
+
+    def cancel_prefetch(self) -> None:
+        """Drop the prefetched pages not used, log the prefetch hit rate and wasted bytes."""
+        if self.prefetcher is not None:
+            self.prefetcher.discard()
+
+    def get_navigation_resources(self) -> dict | None:
+        """Get the bytes transferred and the load time of the current page from the performance entries."""
+        try:
+            stats = self.driver.execute_script("""
+                const nav = performance.getEntriesByType('navigation')[0];
+                const resources = performance.getEntriesByType('resource');
+                let bytes = nav ? nav.transferSize : 0;
+                for (const entry of resources) { bytes += entry.transferSize || 0; }
+                return {
+                    bytes: bytes,
+                    requests: resources.length + 1,
+                    dom_content_loaded: nav ? Math.round(nav.domContentLoadedEventEnd) : null,
+                    load_time: nav ? Math.round(nav.loadEventEnd || nav.duration) : null
+                };
+            """)
+        except Exception as e:
+            self.logger.warning(f"Could not read navigation performance entries: {str(e)}")
+            return None
+        if not stats:
+            return None
+        self.navigation_totals["pages"] += 1
+        self.navigation_totals["bytes"] += stats["bytes"] or 0
+        self.navigation_totals["load_time"] += stats["load_time"] or 0
+        return stats
+
+    def get_navigation_totals(self) -> dict:
+        """Get the bytes and load time (ms) of all the pages loaded with the driver, and their average."""
+        pages = max(self.navigation_totals["pages"], 1)
+        return dict(self.navigation_totals,
+                    avg_bytes=self.navigation_totals["bytes"] // pages,
+                    avg_load_time=self.navigation_totals["load_time"] // pages)
+
+    def ensure_driver_page(self) -> None:
+        """Load the page served over HTTP in the driver, needed before any interaction with the page."""
+        if self.http_page is None:
+            return
+        url = self.http_page["final_url"]
+        self.logger.info(f"Escalating {url} to driver for page interaction.")
+        if self.fast_fetcher is not None and not self.http_page.get("from_cache"):
+            self.fast_fetcher.record(url, "interaction")
+        self.driver_go_to(url)
+
+    def driver_go_to(self, url:str) -> bool:
+        """Navigate to a specified URL with the driver."""
+        self.http_page = None
+        self.timing.start_navigation()
+        self.timing.pause("before_navigation")
         try:
             initial_handles = self.driver.window_handles
             self.driver.get(url)
-            time.sleep(random.uniform(0.01, 0.3))
+            self.timing.pause("after_navigation")
+            self.timing.wait_ready(self.driver)
             try:
                 wait = WebDriverWait(self.driver, timeout=10)
                 wait.until(
@@ -321,9 +716,12 @@ class Browser:
             except TimeoutException:
                 self.logger.warning("Timeout while waiting for page to bypass 'checking your browser'")
             self.apply_web_safety()
-            time.sleep(random.uniform(0.01, 0.2))
+            self.timing.pause("after_safety")
             self.human_scroll()
-            self.logger.log(f"Navigated to: {url}")
+            self.timing.wait_network_idle(self.driver)
+            self.last_navigation_timing = self.timing.end_navigation()
+            self.last_navigation_resources = self.get_navigation_resources()
+            self.logger.log(f"Navigated to: {url} (timing: {self.last_navigation_timing}, resources: {self.last_navigation_resources})")
             return True
         except TimeoutException as e:
             self.logger.error(f"Timeout waiting for {url} to load: {str(e)}")
@@ -337,45 +735,28 @@ class Browser:
 
     def is_sentence(self, text:str) -> bool:
         """Check if the text qualifies as a meaningful sentence or contains important error codes."""
-        text = text.strip()
+        return is_sentence(text)
 
-        if any(c.isdigit() for c in text):
-            return True
-        words = re.findall(r'\w+', text, re.UNICODE)
-        word_count = len(words)
-        has_punctuation = any(text.endswith(p) for p in ['.', '，', ',', '!', '?', '。', '！', '？', '।', '۔'])
-        is_long_enough = word_count > 4
-        return (word_count >= 5 and (has_punctuation or is_long_enough))
-
-    def get_text(self) -> str | None:
-        """Get page text as formatted Markdown"""
+    def get_text(self, max_chars: int | None = 32768) -> str | None:
+        """
+        Get page text as formatted Markdown
+        Args:
+            max_chars (int | None): Truncate the text to this size, None for the full page text.
+        """
         try:
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-            for element in soup(['script', 'style', 'noscript', 'meta', 'link']):
-                element.decompose()
-            markdown_converter = markdownify.MarkdownConverter(
-                heading_style="ATX",
-                strip=['a'],
-                autolinks=False,
-                bullets='•',
-                strong_em_symbol='*',
-                default_title=False,
-            )
-            markdown_text = markdown_converter.convert(str(soup.body))
-            lines = []
-            for line in markdown_text.splitlines():
-                stripped = line.strip()
-                if stripped and self.is_sentence(stripped):
-                    cleaned = ' '.join(stripped.split())
-                    lines.append(cleaned)
-            result = "[Start of page]\n\n" + "\n\n".join(lines) + "\n\n[End of page]"
-            result = re.sub(r'!\[(.*?)\]\(.*?\)', r'[IMAGE: \1]', result)
+            if self.http_page is not None:
+                return self.http_page["text"][:max_chars]
+            result = self.html_to_text(self.driver.page_source)
             self.logger.info(f"Extracted text: {result[:100]}...")
             self.logger.info(f"Extracted text length: {len(result)}")
-            return result[:32768]
+            return result[:max_chars]
         except Exception as e:
             self.logger.error(f"Error getting text: {str(e)}")
             return None
+
+    def html_to_text(self, html:str) -> str:
+        """Convert a page html to formatted Markdown, keeping only meaningful lines."""
+        return extract_page_text(html, engine=self.text_engine)
     
     def clean_url(self, url:str) -> str:
         """Clean URL to keep only the part needed for navigation to the page"""
@@ -412,21 +793,32 @@ class Browser:
                 return False
         return True
 
+    def get_http_page_links(self) -> List[dict]:
+        """Get the links of the page served over HTTP, visibility is unknown without rendering."""
+        if "links" in self.http_page:
+            return self.http_page["links"]
+        soup = BeautifulSoup(self.http_page["html"], 'html.parser')
+        links = []
+        for element in soup.find_all('a', href=True):
+            href = urljoin(self.http_page["final_url"], element['href'])
+            if href.startswith(("http", "https")):
+                links.append({
+                    "url": href,
+                    "text": element.get_text().strip(),
+                    "is_displayed": True
+                })
+        return links
+
+    def get_page_links(self) -> List[dict]:
+        """Get all http(s) links of the current page with their text and visibility."""
+        if self.http_page is not None:
+            return self.get_http_page_links()
+        return self.driver.execute_script(self.load_js("find_links.js")) or []
+
     def get_navigable(self) -> List[str]:
         """Get all navigable links on the current page."""
         try:
-            links = []
-            elements = self.driver.find_elements(By.TAG_NAME, "a")
-            
-            for element in elements:
-                href = element.get_attribute("href")
-                if href and href.startswith(("http", "https")):
-                    links.append({
-                        "url": href,
-                        "text": element.text.strip(),
-                        "is_displayed": element.is_displayed()
-                    })
-            
+            links = self.get_page_links()
             self.logger.info(f"Found {len(links)} navigable links")
             return [self.clean_url(link['url']) for link in links if (link['is_displayed'] == True and self.is_link_valid(link['url']))]
         except Exception as e:
@@ -435,6 +827,7 @@ class Browser:
 
     def click_element(self, xpath: str) -> bool:
         """Click an element specified by XPath."""
+        self.ensure_driver_page()
         try:
             element = self.wait.until(EC.element_to_be_clickable((By.XPATH, xpath)))
             if not element.is_displayed():
@@ -443,8 +836,9 @@ class Browser:
                 return False
             try:
                 self.logger.error(f"Scrolling to element for click_element.")
-                self.driver.execute_script("arguments[0].scrollIntoView({block: 'center', behavior: 'smooth'});", element)
-                time.sleep(0.1)
+                scroll_behavior = "instant" if self.timing.event_driven else "smooth"
+                self.driver.execute_script(f"arguments[0].scrollIntoView({{block: 'center', behavior: '{scroll_behavior}'}});", element)
+                self.timing.pause("click")
                 element.click()
                 self.logger.info(f"Clicked element at {xpath}")
                 return True
@@ -460,18 +854,40 @@ class Browser:
         
     def load_js(self, file_name: str) -> str:
         """Load javascript from script folder to inject to page."""
+        if file_name in self.js_cache:
+            return self.js_cache[file_name]
         path = os.path.join(self.js_scripts_folder, file_name)
         self.logger.info(f"Loading js at {path}")
         try:
             with open(path, 'r') as f:
-                return f.read()
+                self.js_cache[file_name] = f.read()
+                return self.js_cache[file_name]
         except FileNotFoundError as e:
             raise Exception(f"Could not find: {path}") from e
         except Exception as e:
             raise e
 
+    def get_http_page_inputs(self) -> List[dict]:
+        """Get the inputs of the page served over HTTP, in the same format as find_inputs.js."""
+        if "inputs" in self.http_page:
+            return self.http_page["inputs"]
+        soup = BeautifulSoup(self.http_page["html"], 'html.parser')
+        inputs = []
+        for element in soup.find_all('input'):
+            inputs.append({
+                "tagName": "INPUT",
+                "text": element.get("name", ""),
+                "type": element.get("type", "text"),
+                "class": ' '.join(element.get("class", [])),
+                "xpath": "",
+                "displayed": True
+            })
+        return inputs
+
     def find_all_inputs(self, timeout=3):
         """Find all inputs elements on the page."""
+        if self.http_page is not None:
+            return self.get_http_page_inputs()
         try:
             WebDriverWait(self.driver, timeout).until(
                 EC.presence_of_element_located((By.TAG_NAME, "body"))
@@ -479,7 +895,8 @@ class Browser:
         except Exception as e:
             self.logger.error(f"Error waiting for input element: {str(e)}")
             return []
-        time.sleep(0.5)
+        self.timing.pause("inputs")
+        self.timing.wait_ready(self.driver, timeout)
         script = self.load_js("find_inputs.js")
         input_elements = self.driver.execute_script(script)
         return input_elements
@@ -515,14 +932,13 @@ class Browser:
         """
         Find buttons and return their type and xpath.
         """
-        buttons = self.driver.find_elements(By.TAG_NAME, "button") + \
-                  self.driver.find_elements(By.XPATH, "//input[@type='submit']")
+        buttons = self.driver.execute_script(self.load_js("find_buttons.js")) or []
         result = []
-        for i, button in enumerate(buttons):
-            if not button.is_displayed() or not button.is_enabled():
+        for button in buttons:
+            if not button["displayed"] or not button["enabled"]:
                 continue
-            text = (button.text or button.get_attribute("value") or "").lower().replace(' ', '')
-            xpath = f"(//button | //input[@type='submit'])[{i + 1}]"
+            text = button["text"].lower().replace(' ', '')
+            xpath = f"(//button | //input[@type='submit'])[{button['index']}]"
             result.append((text, xpath))
         result.sort(key=lambda x: len(x[0]))
         return result
@@ -635,6 +1051,7 @@ class Browser:
         if not isinstance(input_list, list):
             self.logger.error("input_list must be a list")
             return False
+        self.ensure_driver_page()
         inputs = self.find_all_inputs()
         try:
             for input_str in input_list:
@@ -699,10 +1116,17 @@ class Browser:
 
     def get_current_url(self) -> str:
         """Get the current URL of the page."""
+        if self.http_page is not None:
+            return self.http_page["final_url"]
         return self.driver.current_url
 
     def get_page_title(self) -> str:
         """Get the title of the current page."""
+        if self.http_page is not None:
+            if "title" in self.http_page:
+                return self.http_page["title"]
+            match = re.search(r'<title[^>]*>(.*?)</title>', self.http_page["html"], re.IGNORECASE | re.DOTALL)
+            return match.group(1).strip() if match else ""
         return self.driver.title
 
     def scroll_bottom(self) -> bool:
@@ -712,7 +1136,8 @@ class Browser:
             self.driver.execute_script(
                 "window.scrollTo(0, document.body.scrollHeight);"
             )
-            time.sleep(0.5)
+            self.timing.pause("scroll_bottom")
+            self.timing.wait_network_idle(self.driver)
             return True
         except Exception as e:
             self.logger.error(f"Error scrolling: {str(e)}")
@@ -721,19 +1146,26 @@ class Browser:
     def get_screenshot(self) -> str:
         return self.screenshot_folder + "/updated_screen.png"
 
-    def screenshot(self, filename:str = 'updated_screen.png') -> bool:
-        """Take a screenshot of the current page, attempt to capture the full page by zooming out."""
+    def screenshot(self, filename:str = 'updated_screen.png', force:bool = False) -> bool:
+        """
+        Take a screenshot of the current page, attempt to capture the full page by zooming out.
+        Skipped when no client is watching the screenshots or the last one is too recent, unless force is True.
+        The image is published to the screenshot frames, decoded and saved off-thread.
+        """
+        if self.http_page is not None:
+            self.logger.info("Current page was served over HTTP, no rendering to screenshot.")
+            return False
+        if not force and not self.frames.should_capture():
+            return False
         self.logger.info("Taking full page screenshot...")
-        time.sleep(0.1)
+        self.timing.pause("screenshot")
         try:
             original_zoom = self.driver.execute_script("return document.body.style.zoom || 1;")
             self.driver.execute_script("document.body.style.zoom='75%'")
-            time.sleep(0.1)
-            path = os.path.join(self.screenshot_folder, filename)
-            if not os.path.exists(self.screenshot_folder):
-                os.makedirs(self.screenshot_folder)
-            self.driver.save_screenshot(path)
-            self.logger.info(f"Full page screenshot saved as {filename}")
+            self.timing.pause("screenshot")
+            self.timing.wait_frame(self.driver)
+            self.frames.submit(self.driver.get_screenshot_as_base64(), filename)
+            self.logger.info(f"Full page screenshot captured as {filename}")
         except Exception as e:
             self.logger.error(f"Error taking full page screenshot: {str(e)}")
             return False
@@ -0,0 +1,93 @@
+import os
+import sys
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Callable
+
+if __name__ == "__main__": # if running as a script for individual testing
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sources.logger import Logger
+
+class BrowserPool:
+    """
+    Lease browsers to agents working at the same time.
+    The main browser is always leased first, other browsers are created on demand up to the pool size.
+    When every browser is leased, agents wait for one to be released.
+    """
+    def __init__(self, browser, factory: Callable = None, size: int = 1):
+        """
+        Args:
+            browser: The main Browser, can be None if no agent need one.
+            factory (Callable, optional): Create a new Browser, without it only the main browser is leased.
+            size (int): Maximum number of browsers, the main one included.
+        """
+        self.logger = Logger("browser_pool.log")
+        self.factory = factory
+        self.size = max(1, size) if factory is not None else 1
+        self.main = browser
+        self.idle = [browser]
+        self.created = []
+        self.condition = None
+        self.loop = None
+
+    def get_condition(self) -> asyncio.Condition:
+        """The condition of the running event loop, asyncio primitives can't be shared between loops."""
+        loop = asyncio.get_running_loop()
+        if self.condition is None or self.loop is not loop:
+            self.condition = asyncio.Condition()
+            self.loop = loop
+        return self.condition
+
+    async def acquire(self):
+        """Lease a browser, create one if none is idle and the pool is not full."""
+        condition = self.get_condition()
+        async with condition:
+            while not self.idle and 1 + len(self.created) >= self.size:
+                await condition.wait()
+            if self.idle:
+                return self.idle.pop(0)
+            placeholder = object() # reserve the slot while the browser starts
+            self.created.append(placeholder)
+        try:
+            loop = asyncio.get_event_loop()
+            browser = await loop.run_in_executor(None, self.factory)
+        except Exception as e:
+            self.logger.error(f"Failed to create a browser: {str(e)}")
+            async with condition:
+                self.created.remove(placeholder)
+                condition.notify()
+            raise e
+        self.created[self.created.index(placeholder)] = browser
+        self.logger.info(f"Created browser {len(self.created) + 1} of {self.size}.")
+        return browser
+
+    async def release(self, browser) -> None:
+        condition = self.get_condition()
+        async with condition:
+            if browser is self.main:
+                self.idle.insert(0, browser)
+            else:
+                self.idle.append(browser)
+            condition.notify()
+
+    @asynccontextmanager
+    async def lease(self):
+        """Context manager leasing a browser for the time of a task."""
+        browser = await self.acquire()
+        try:
+            yield browser
+        finally:
+            await self.release(browser)
+
+    def close(self) -> None:
+        """Quit the browsers created by the pool, the main browser is left open."""
+        for browser in self.created:
+            if browser is None or not hasattr(browser, "driver"):
+                continue
+            try:
+                browser.driver.quit()
+            except Exception as e:
+                self.logger.error(f"Failed to close a browser: {str(e)}")
+        self.idle = [self.main]
+        self.created = []
@@ -0,0 +1,253 @@
+import os
+import re
+import sys
+import time
+import threading
+from typing import Tuple, Dict
+from urllib.parse import urlparse
+
+import httpx
+
+if __name__ == "__main__": # if running as a script for individual testing
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sources.logger import Logger
+
+try:
+    import h2 # httpx only negotiate HTTP/2 when the h2 package is installed
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# titles of the challenge pages, a bot wall can be told by its title alone
+BOT_WALL_TITLES = [
+    "just a moment", "attention required", "access denied", "are you a robot",
+    "security check", "captcha", "verify you are human", "checking your browser"
+]
+
+# markers of the challenge pages body, only trusted on pages with little text or a blocking status
+BOT_WALL_MARKERS = [
+    "checking your browser", "cf-chl-", "cf-challenge", "verify you are human",
+    "are you a robot", "unusual traffic from your computer", "g-recaptcha", "h-captcha"
+]
+
+TITLE_PATTERN = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+PASSWORD_PATTERN = re.compile(r"""<input[^>]+type\s*=\s*["']?password""", re.IGNORECASE)
+
+NEEDS_JS_MARKERS = [
+    "enable javascript", "javascript is required", "javascript is disabled",
+    "please turn on javascript", "requires javascript"
+]
+
+SPA_ROOT_MARKERS = [
+    '<div id="root"></div>', '<div id="app"></div>', '<div id="__next"></div>', "<app-root></app-root>"
+]
+
+# reasons that mean the domain will most likely always need the driver
+# a login form is not one of them, the other pages of the domain are often public
+STICKY_REASONS = ["needs_js", "bot_wall"]
+
+# statuses a bot wall is served with, a page with one of them is only a bot wall if it looks like one
+BLOCKING_STATUSES = [403, 429, 503]
+
+class FastFetcher:
+    """
+    Fetch pages over a pooled HTTP client (HTTP/2 keep-alive when available) without driving Chrome.
+    Decide if a page must be escalated to the Selenium driver and record the decisions per domain.
+    """
+    def __init__(self, user_agent: str = None,
+                       timeout: float = 8.0,
+                       min_text_chars: int = 600,
+                       max_bytes: int = 4 * 1024 * 1024,
+                       sticky_after: int = 2):
+        """
+        Args:
+            user_agent (str, optional): User agent sent with the requests.
+            timeout (float): Timeout in seconds for a single fetch.
+            min_text_chars (int): Below this amount of extracted text the page is escalated.
+            max_bytes (int): Pages bigger than this are escalated to the driver.
+            sticky_after (int): After this many JS/bot wall escalations a domain skip the fast path.
+        """
+        self.logger = Logger("fast_fetch.log")
+        self.user_agent = user_agent or "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36"
+        self.timeout = timeout
+        self.min_text_chars = min_text_chars
+        self.max_bytes = max_bytes
+        self.sticky_after = sticky_after
+        self.domains = {}
+        self.lock = threading.Lock()
+        self.client = self.create_client()
+
+    def create_client(self) -> httpx.Client:
+        """Create the pooled client, connections are kept alive between navigations."""
+        headers = {
+            "User-Agent": self.user_agent,
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "en-US,en;q=0.9",
+        }
+        limits = httpx.Limits(max_connections=32, max_keepalive_connections=16, keepalive_expiry=60)
+        self.logger.info(f"Creating HTTP client (http2={HTTP2_AVAILABLE}).")
+        return httpx.Client(http2=HTTP2_AVAILABLE,
+                            headers=headers,
+                            limits=limits,
+                            timeout=self.timeout,
+                            follow_redirects=True)
+
+    def get_domain(self, url: str) -> str:
+        netloc = urlparse(url).netloc.lower()
+        return netloc[4:] if netloc.startswith("www.") else netloc
+
+    def get_domain_record(self, domain: str) -> dict:
+        if domain not in self.domains:
+            self.domains[domain] = {"fetched": 0, "escalated": 0, "reasons": {}, "last_reason": None}
+        return self.domains[domain]
+
+    def should_try(self, url: str) -> bool:
+        """Check if the fast path is worth trying for the url domain."""
+        if not url.startswith(("http://", "https://")):
+            return False
+        with self.lock:
+            record = self.get_domain_record(self.get_domain(url))
+            sticky_count = sum(record["reasons"].get(reason, 0) for reason in STICKY_REASONS)
+            skip = record["fetched"] == 0 and sticky_count >= self.sticky_after
+            reasons = dict(record["reasons"])
+        if skip:
+            self.logger.info(f"Skipping fast path for {url}, domain always escalated: {reasons}")
+            return False
+        return True
+
+    def record(self, url: str, reason: str | None) -> None:
+        """Record a fast path outcome for the url domain, reason is None when the page was served over HTTP."""
+        domain = self.get_domain(url)
+        with self.lock:
+            record = self.get_domain_record(domain)
+            if reason is None:
+                record["fetched"] += 1
+            else:
+                record["escalated"] += 1
+                record["reasons"][reason] = record["reasons"].get(reason, 0) + 1
+            record["last_reason"] = reason
+        if reason is None:
+            self.logger.info(f"Served {url} over HTTP ({domain}: {record['fetched']} fetched, {record['escalated']} escalated).")
+        else:
+            self.logger.info(f"Escalated {url} to driver: {reason} ({domain}: {record['reasons']}).")
+
+    def get_domain_stats(self) -> Dict[str, dict]:
+        with self.lock:
+            return {domain: dict(record, reasons=dict(record["reasons"])) for domain, record in self.domains.items()}
+
+    def fetch(self, url: str, headers: dict = None) -> Tuple[dict | None, str | None]:
+        """
+        Fetch a page over HTTP.
+        Args:
+            url (str): The page url.
+            headers (dict, optional): Extra request headers.
+        Returns:
+            Tuple[dict | None, str | None]: The page (url, status, html, headers, bytes, elapsed) or None with the escalation reason.
+        """
+        start = time.time()
+        try:
+            with self.client.stream("GET", url, headers=headers) as response:
+                if response.status_code in BLOCKING_STATUSES:
+                    html = self.read_head(response)
+                    return None, "bot_wall" if self.is_bot_wall(html, blocked=True) else f"status_{response.status_code}"
+                if response.status_code == 304:
+                    return self.make_page(url, response, "", 0, start), None
+                if response.status_code != 200:
+                    return None, f"status_{response.status_code}"
+                content_type = response.headers.get("content-type", "").lower()
+                if "html" not in content_type:
+                    return None, "content_type"
+                chunks = []
+                size = 0
+                for chunk in response.iter_bytes():
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        return None, "too_large"
+                    chunks.append(chunk)
+                encoding = response.encoding or "utf-8"
+                html = b"".join(chunks).decode(encoding, errors="replace")
+                return self.make_page(url, response, html, size, start), None
+        except httpx.TimeoutException:
+            return None, "timeout"
+        except httpx.HTTPError as e:
+            self.logger.warning(f"HTTP fetch failed for {url}: {str(e)}")
+            return None, "http_error"
+
+    def read_head(self, response: httpx.Response, limit: int = 64 * 1024) -> str:
+        """Read the start of a response body, enough to recognize an error or challenge page."""
+        chunks = []
+        size = 0
+        for chunk in response.iter_bytes():
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= limit:
+                break
+        return b"".join(chunks)[:limit].decode(response.encoding or "utf-8", errors="replace")
+
+    def get_title(self, html: str) -> str:
+        match = TITLE_PATTERN.search(html[:20000])
+        return " ".join(match.group(1).split()).lower() if match else ""
+
+    def is_bot_wall(self, html: str, blocked: bool = False, text_length: int = 0) -> bool:
+        """
+        Tell if a page is a bot wall (captcha, browser check) from its title or its body markers.
+        Only pages served with a blocking status or with little text are considered, a real page may mention a captcha.
+        Args:
+            html (str): The raw html of the page.
+            blocked (bool): The page was served with a blocking status (403, 429, 503).
+            text_length (int): Length of the text extracted from the page.
+        Returns:
+            bool: True if the page is a bot wall.
+        """
+        if not blocked and text_length >= self.min_text_chars:
+            return False
+        title = self.get_title(html)
+        if any(marker in title for marker in BOT_WALL_TITLES):
+            return True
+        head = html[:20000].lower()
+        return any(marker in head for marker in BOT_WALL_MARKERS)
+
+    def make_page(self, url: str, response: httpx.Response, html: str, size: int, start: float) -> dict:
+        return {
+            "url": url,
+            "final_url": str(response.url),
+            "status": response.status_code,
+            "html": html,
+            "headers": {k.lower(): v for k, v in response.headers.items()},
+            "bytes": size,
+            "elapsed": time.time() - start,
+            "http_version": response.http_version,
+        }
+
+    def escalation_reason(self, html: str, text: str) -> str | None:
+        """
+        Decide if a fetched page can be used as is or need the driver.
+        Args:
+            html (str): The raw html of the page.
+            text (str): The text extracted from the page.
+        Returns:
+            str | None: The escalation reason, None if the page can be served without the driver.
+        """
+        html_lower = html.lower()
+        text_length = len(text) if text else 0
+        if self.is_bot_wall(html, text_length=text_length):
+            return "bot_wall"
+        if any(marker in html_lower for marker in SPA_ROOT_MARKERS):
+            return "needs_js"
+        if text_length < self.min_text_chars:
+            if PASSWORD_PATTERN.search(html):
+                return "login_form"
+            if any(marker in html_lower for marker in NEEDS_JS_MARKERS):
+                return "needs_js"
+            return "too_little_text"
+        return None
+
+    def close(self) -> None:
+        self.client.close()
+
+if __name__ == "__main__":
+    fetcher = FastFetcher()
+    page, reason = fetcher.fetch("https://example.com")
+    print(reason, page["http_version"] if page else None)
+    print(fetcher.get_domain_stats())
@@ -0,0 +1,191 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import threading
+from typing import Dict
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+if __name__ == "__main__": # if running as a script for individual testing
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sources.logger import Logger
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize an url to a cache key: lowercase scheme and host, no default port, no fragment, sorted query parameters.
+    All the query parameters are kept, two pages differing by a parameter never share an entry.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port is not None and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, parts.path or "/", query, ""))
+
+class PageCache:
+    """
+    Disk cache of extracted pages (text, links, inputs) keyed by the normalized page url.
+    Entries are fresh for a TTL, stale entries with an ETag or Last-Modified can be revalidated.
+    Entries without validators (pages rendered by the driver) can't be revalidated and get a shorter TTL.
+    The total size is capped and the least recently used entries are evicted first.
+    """
+    def __init__(self, cache_dir: str = None,
+                       ttl: int = 3600,
+                       unvalidated_ttl: int = 300,
+                       max_bytes: int = 64 * 1024 * 1024):
+        """
+        Args:
+            cache_dir (str, optional): Folder of the cache, default to .page_cache in the working directory.
+            ttl (int): Seconds an entry is served without revalidation.
+            unvalidated_ttl (int): Maximum seconds an entry without ETag or Last-Modified is served.
+            max_bytes (int): Maximum size of the cache on disk.
+        """
+        self.logger = Logger("page_cache.log")
+        self.cache_dir = cache_dir or os.path.join(os.getcwd(), ".page_cache")
+        self.index_path = os.path.join(self.cache_dir, "index.json")
+        self.ttl = ttl
+        self.unvalidated_ttl = unvalidated_ttl
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "stale": 0, "revalidated": 0, "evicted": 0}
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.index = self.load_index()
+
+    def load_index(self) -> Dict[str, dict]:
+        """Load the index of the entries, drop the entries whose file is missing."""
+        if not os.path.exists(self.index_path):
+            return {}
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            self.logger.warning(f"Could not load page cache index, starting empty: {str(e)}")
+            return {}
+        return {key: meta for key, meta in index.items() if os.path.exists(self.entry_path(key))}
+
+    def save_index(self) -> None:
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f)
+        os.replace(tmp_path, self.index_path)
+
+    def entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha256(key.encode('utf-8')).hexdigest()[:32] + ".json")
+
+    def is_fresh(self, meta: dict) -> bool:
+        return time.time() - meta["stored_at"] < meta.get("ttl", self.ttl)
+
+    def is_fresh_key(self, key: str) -> bool:
+        """Check if a page is cached and fresh, without reading the entry."""
+        with self.lock:
+            meta = self.index.get(key)
+            return meta is not None and self.is_fresh(meta)
+
+    def get(self, key: str) -> dict | None:
+        """
+        Get a cached page.
+        Args:
+            key (str): The normalized page url.
+        Returns:
+            dict | None: The entry with a "fresh" flag, None if the page is not cached.
+        """
+        with self.lock:
+            meta = self.index.get(key)
+            if meta is None:
+                self.stats["misses"] += 1
+                return None
+            try:
+                with open(self.entry_path(key), 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+            except (json.JSONDecodeError, OSError) as e:
+                self.logger.warning(f"Dropping unreadable cache entry for {key}: {str(e)}")
+                self.remove_entry(key)
+                self.stats["misses"] += 1
+                return None
+            meta["last_access"] = time.time()
+            entry["fresh"] = self.is_fresh(meta)
+            self.stats["hits" if entry["fresh"] else "stale"] += 1
+        return entry
+
+    def put(self, key: str, entry: dict, ttl: int = None) -> None:
+        """
+        Store a page.
+        Args:
+            key (str): The normalized page url.
+            entry (dict): The page (url, final_url, title, text, links, inputs, etag, last_modified).
+            ttl (int, optional): Entry TTL, default to the cache TTL, or unvalidated_ttl if the entry has no validator.
+        """
+        data = json.dumps(entry, ensure_ascii=False)
+        size = len(data.encode('utf-8'))
+        if size > self.max_bytes:
+            self.logger.warning(f"Page {key} too big to be cached ({size} bytes).")
+            return
+        with self.lock:
+            try:
+                with open(self.entry_path(key), 'w', encoding='utf-8') as f:
+                    f.write(data)
+            except OSError as e:
+                self.logger.error(f"Could not write cache entry for {key}: {str(e)}")
+                return
+            now = time.time()
+            if ttl is None:
+                has_validator = entry.get("etag") or entry.get("last_modified")
+                ttl = self.ttl if has_validator else min(self.ttl, self.unvalidated_ttl)
+            self.index[key] = {"size": size, "stored_at": now, "last_access": now, "ttl": ttl}
+            self.evict()
+            self.save_index()
+        self.logger.info(f"Cached {key} ({size} bytes, ttl {ttl}s).")
+
+    def touch(self, key: str) -> None:
+        """Mark an entry as fresh again, after the server answered 304 Not Modified."""
+        with self.lock:
+            if key not in self.index:
+                return
+            self.index[key]["stored_at"] = time.time()
+            self.stats["revalidated"] += 1
+            self.save_index()
+        self.logger.info(f"Revalidated {key}.")
+
+    def remove(self, key: str) -> None:
+        with self.lock:
+            self.remove_entry(key)
+            self.save_index()
+
+    def remove_entry(self, key: str) -> None:
+        self.index.pop(key, None)
+        try:
+            os.remove(self.entry_path(key))
+        except OSError:
+            pass
+
+    def evict(self) -> None:
+        """Evict the least recently used entries until the cache fits in max_bytes."""
+        total = sum(meta["size"] for meta in self.index.values())
+        if total <= self.max_bytes:
+            return
+        for key in sorted(self.index, key=lambda k: self.index[k]["last_access"]):
+            total -= self.index[key]["size"]
+            self.remove_entry(key)
+            self.stats["evicted"] += 1
+            self.logger.info(f"Evicted {key} from page cache.")
+            if total <= self.max_bytes:
+                break
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            return dict(self.stats,
+                        entries=len(self.index),
+                        bytes=sum(meta["size"] for meta in self.index.values()))
+
+if __name__ == "__main__":
+    cache = PageCache(cache_dir="/tmp/page_cache_test", ttl=2, max_bytes=400)
+    cache.put(normalize_url("https://example.com/a"), {"url": "https://example.com/a", "text": "a" * 100})
+    cache.put(normalize_url("https://example.com/b"), {"url": "https://example.com/b", "text": "b" * 100})
+    print(cache.get(normalize_url("https://Example.com:443/a#top"))["fresh"])
+    cache.put(normalize_url("https://example.com/c"), {"url": "https://example.com/c", "text": "c" * 200})
+    print(cache.get(normalize_url("https://example.com/b")), cache.get_stats())
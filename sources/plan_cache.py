@@ -0,0 +1,175 @@
+import os
+import re
+import sys
+import json
+import time
+import threading
+from typing import List, Tuple
+
+if __name__ == "__main__": # if running as a script for individual testing
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sources.logger import Logger
+
+# quoted text, urls, file names, numbers and capitalized names are the parameters of a goal
+SLOT_PATTERN = re.compile(r'"[^"]+"|\'[^\']+\'|https?://\S+|\b[\w\-]+\.[a-zA-Z]{1,5}\b|\b\d+(?:[.,]\d+)?\b|\b[A-Z][\w\-]*(?:\s+[A-Z][\w\-]*)*')
+SLOT_MARKER = "<<slot{}>>"
+SLOT_MARKER_PATTERN = re.compile(r'<<slot\d+>>')
+
+def extract_slots(goal: str) -> Tuple[str, List[str]]:
+    """
+    Split a goal into its signature and parameters.
+    "Find 5 AI startups in Paris and save them to startups.txt" gives
+    ("find {} {} startups in {} and save them to {}", ["5", "AI", "Paris", "startups.txt"]).
+    A capitalized word starting a sentence is not a parameter.
+    Args:
+        goal (str): The user goal.
+    Returns:
+        Tuple[str, List[str]]: The signature and the parameters in goal order.
+    """
+    values = []
+    parts = []
+    last = 0
+    for match in SLOT_PATTERN.finditer(goal):
+        value, start = match.group(0), match.start()
+        before = goal[:start].rstrip()
+        if value[0].isupper() and (before == "" or before[-1] in ".!?:\n"):
+            first_word = value.split()[0]
+            value = value[len(first_word):].lstrip()
+            if not value:
+                continue
+            start = match.end() - len(value)
+        parts.append(goal[last:start])
+        parts.append("{}")
+        values.append(value.strip("\"'"))
+        last = match.end()
+    parts.append(goal[last:])
+    signature = ' '.join(''.join(parts).lower().split()).strip(" .!?")
+    return signature, values
+
+def replace_value(text: str, value: str, replacement: str) -> str:
+    """Replace a whole word or phrase in any case, so "5" is not replaced inside "2025" but "tesla" is for "Tesla"."""
+    return re.sub(r'(?<!\w)' + re.escape(value) + r'(?!\w)', lambda _: replacement, text, flags=re.IGNORECASE)
+
+def has_value_left(text: str, values: List[str]) -> bool:
+    """Check if a templated text still has a word starting with a parameter, in any case, like "Teslas" for "Tesla"."""
+    text = SLOT_MARKER_PATTERN.sub(" ", text)
+    return any(re.search(r'(?<!\w)' + re.escape(value), text, flags=re.IGNORECASE) for value in values)
+
+class PlanCache:
+    """
+    Cache of the plans that succeeded, stored as templates keyed by the goal signature.
+    The parameters of the goal found in the plan tasks are replaced by the parameters of the new goal.
+    """
+    def __init__(self, cache_path: str = None, max_entries: int = 200):
+        """
+        Args:
+            cache_path (str, optional): JSON file of the cache, default to .plan_cache.json in the working directory.
+            max_entries (int): Maximum number of templates, the least recently used are dropped first.
+        """
+        self.logger = Logger("plan_cache.log")
+        self.cache_path = cache_path or os.path.join(os.getcwd(), ".plan_cache.json")
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "exact": 0, "misses": 0}
+        self.templates = self.load()
+
+    def load(self) -> dict:
+        if not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            self.logger.warning(f"Could not load plan cache, starting empty: {str(e)}")
+            return {}
+
+    def save(self) -> None:
+        try:
+            tmp_path = self.cache_path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.templates, f, indent=1)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            self.logger.error(f"Could not save plan cache: {str(e)}")
+
+    def put(self, goal: str, plan: List[list]) -> None:
+        """
+        Store a plan that succeeded as a template.
+        Args:
+            goal (str): The goal the plan was made for.
+            plan (List[list]): The plan, as (task name, task) pairs.
+        """
+        signature, values = extract_slots(goal)
+        found = set()
+        template = []
+        for task_name, task in plan:
+            task = dict(task)
+            for i, value in sorted(enumerate(values), key=lambda item: -len(item[1])):
+                marker = SLOT_MARKER.format(i)
+                templated_name = replace_value(task_name, value, marker)
+                templated_task = replace_value(task['task'], value, marker)
+                if templated_name != task_name or templated_task != task['task']:
+                    found.add(i)
+                task_name, task['task'] = templated_name, templated_task
+            template.append([task_name, task])
+        # a parameter left in the template would stay in the plans of other goals, they must be reviewed
+        left = any(has_value_left(task_name, values) or has_value_left(task['task'], values) for task_name, task in template)
+        with self.lock:
+            self.templates[signature] = {
+                "template": template,
+                "slots": len(values),
+                "exact": len(found) == len(values) and not left,
+                "last_used": time.time()
+            }
+            self.evict()
+            self.save()
+        self.logger.info(f"Stored plan template for: {signature}")
+
+    def get(self, goal: str) -> dict | None:
+        """
+        Get the plan of a goal from a stored template.
+        Args:
+            goal (str): The user goal.
+        Returns:
+            dict | None: {"plan": the filled plan, "exact": True if every parameter was found in the template},
+                         None if no plan was stored for this kind of goal.
+        """
+        signature, values = extract_slots(goal)
+        with self.lock:
+            entry = self.templates.get(signature)
+            if entry is None or entry["slots"] != len(values):
+                self.stats["misses"] += 1
+                return None
+            entry["last_used"] = time.time()
+            self.stats["hits"] += 1
+            if entry["exact"]:
+                self.stats["exact"] += 1
+            self.save()
+        plan = []
+        for task_name, task in entry["template"]:
+            task = dict(task)
+            for i, value in enumerate(values):
+                marker = SLOT_MARKER.format(i)
+                task_name = task_name.replace(marker, value)
+                task['task'] = task['task'].replace(marker, value)
+            plan.append([task_name, task])
+        self.logger.info(f"Plan template hit for: {signature} (exact: {entry['exact']})")
+        return {"plan": plan, "exact": entry["exact"]}
+
+    def evict(self) -> None:
+        """Drop the least recently used templates above the maximum number of entries."""
+        while len(self.templates) > self.max_entries:
+            oldest = min(self.templates, key=lambda signature: self.templates[signature]["last_used"])
+            del self.templates[oldest]
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            return dict(self.stats, templates=len(self.templates))
+
+if __name__ == "__main__":
+    cache = PlanCache(cache_path="/tmp/plan_cache_demo.json")
+    plan = [["## Task 1: search startups", {"agent": "Web", "id": "1", "need": [], "task": "Find 5 AI startups in Paris"}],
+            ["## Task 2: save them", {"agent": "File", "id": "2", "need": ["1"], "task": "Save the startups to startups.txt"}]]
+    cache.put("Find 5 AI startups in Paris and save them to startups.txt", plan)
+    print(cache.get("find 3 AI startups in Berlin and save them to berlin.txt"))
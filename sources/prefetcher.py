@@ -0,0 +1,122 @@
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future, TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, List, Tuple
+
+if __name__ == "__main__": # if running as a script for individual testing
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sources.logger import Logger
+
+class Prefetcher:
+    """
+    Fetch and extract pages in background threads before they are requested.
+    Used by the browser to load the top search results while the LLM is choosing a link.
+    """
+    def __init__(self, fetch_page: Callable[[str], Tuple[dict | None, str | None]],
+                       max_workers: int = 4):
+        """
+        Args:
+            fetch_page (Callable): Function fetching and extracting a page, return (page, escalation reason).
+            max_workers (int): Number of pages fetched at the same time.
+        """
+        self.logger = Logger("prefetch.log")
+        self.fetch_page = fetch_page
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self.futures: Dict[str, Future] = {}
+        self.lock = threading.Lock()
+        self.stats = {"submitted": 0, "hits": 0, "misses": 0, "escalated": 0, "wasted": 0, "wasted_bytes": 0}
+
+    def prefetch(self, urls: Dict[str, str]) -> None:
+        """
+        Start fetching pages in the background.
+        Args:
+            urls (Dict[str, str]): Key used to take the page later (cleaned url) mapped to the url to fetch.
+        """
+        with self.lock:
+            for key, url in urls.items():
+                if key in self.futures:
+                    continue
+                self.futures[key] = self.executor.submit(self.fetch_page, url)
+                self.stats["submitted"] += 1
+                self.logger.info(f"Prefetching {url}")
+
+    def take(self, key: str, timeout: float = 10.0) -> Tuple[dict | None, str | None] | None:
+        """
+        Take a prefetched page, wait for it if the fetch is still running.
+        Args:
+            key (str): The key given to prefetch.
+            timeout (float): Maximum wait for a running fetch.
+        Returns:
+            Tuple | None: (page, escalation reason) or None if the page was not prefetched.
+        """
+        with self.lock:
+            future = self.futures.pop(key, None)
+            if future is None:
+                self.stats["misses"] += 1
+                return None
+        try:
+            page, reason = future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            self.logger.warning(f"Prefetch of {key} still running after {timeout}s, fetching again.")
+            with self.lock:
+                self.stats["misses"] += 1
+            return None
+        except Exception as e:
+            self.logger.error(f"Prefetch of {key} failed: {str(e)}")
+            with self.lock:
+                self.stats["misses"] += 1
+            return None
+        with self.lock:
+            self.stats["hits"] += 1
+            if reason is not None:
+                self.stats["escalated"] += 1
+        self.logger.info(f"Prefetch hit for {key} (reason: {reason}), hit rate {self.hit_rate():.0%}.")
+        return page, reason
+
+    def discard(self) -> None:
+        """
+        Drop every prefetched page not taken and cancel the pending fetches, without waiting for the running ones.
+        The bytes of the running fetches are counted as wasted when they finish.
+        """
+        with self.lock:
+            futures = self.futures
+            self.futures = {}
+        for future in futures.values():
+            if not future.cancel():
+                future.add_done_callback(self.count_wasted)
+        self.logger.info(f"Prefetch stats: {self.get_stats()}")
+
+    def count_wasted(self, future: Future) -> None:
+        """Count the bytes of a prefetched page that was never taken."""
+        if future.cancelled() or future.exception() is not None:
+            return
+        page, _ = future.result()
+        with self.lock:
+            self.stats["wasted"] += 1
+            self.stats["wasted_bytes"] += page["bytes"] if page is not None else 0
+
+    def hit_rate(self) -> float:
+        requests = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / requests if requests else 0.0
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            return dict(self.stats, hit_rate=round(self.hit_rate(), 3), pending=len(self.futures))
+
+    def close(self) -> None:
+        self.discard()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+if __name__ == "__main__":
+    import time
+    def fake_fetch(url):
+        time.sleep(0.2)
+        return {"url": url, "bytes": 1000}, None
+    prefetcher = Prefetcher(fake_fetch)
+    prefetcher.prefetch({"a": "https://a.com", "b": "https://b.com"})
+    print(prefetcher.take("a"), prefetcher.take("c"))
+    prefetcher.discard()
+    print(prefetcher.get_stats())
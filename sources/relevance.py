@@ -0,0 +1,153 @@
+import re
+import math
+from collections import Counter
+from typing import List, Tuple
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have", "how", "i", "in", "is",
+    "it", "its", "me", "my", "of", "on", "or", "that", "the", "this", "to", "was", "what", "when", "where",
+    "which", "who", "why", "will", "with", "you", "your", "can", "do", "does", "find", "search", "about",
+    "please", "give", "tell", "show", "get", "best", "some"
+}
+
+PAGE_START = "[Start of page]"
+PAGE_END = "[End of page]"
+SKIPPED_MARKER = "[...]"
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase words of a text, without stopwords."""
+    return [word for word in re.findall(r'\w+', text.lower(), re.UNICODE) if word not in STOPWORDS]
+
+def split_chunks(text: str, max_chars: int = 1200) -> List[str]:
+    """
+    Split a page text into chunks of consecutive paragraphs.
+    A markdown heading always start a new chunk so sections are kept together.
+    Args:
+        text (str): The page text, paragraphs separated by blank lines.
+        max_chars (int): Maximum size of a chunk, a longer paragraph is a chunk on its own.
+    Returns:
+        List[str]: The chunks in page order.
+    """
+    chunks = []
+    current = []
+    size = 0
+    for paragraph in text.split("\n\n"):
+        paragraph = paragraph.strip()
+        if not paragraph or paragraph in (PAGE_START, PAGE_END):
+            continue
+        if current and (paragraph.startswith("#") or size + len(paragraph) > max_chars):
+            chunks.append("\n\n".join(current))
+            current = []
+            size = 0
+        current.append(paragraph)
+        size += len(paragraph) + 2
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+class BM25:
+    """
+    Okapi BM25 ranking of documents against a query.
+    """
+    def __init__(self, documents: List[List[str]], k1: float = 1.5, b: float = 0.75):
+        """
+        Args:
+            documents (List[List[str]]): The tokenized documents.
+            k1 (float): Term frequency saturation.
+            b (float): Document length normalization.
+        """
+        self.k1 = k1
+        self.b = b
+        self.frequencies = [Counter(document) for document in documents]
+        self.lengths = [len(document) for document in documents]
+        self.avg_length = sum(self.lengths) / len(documents) if documents else 0
+        document_frequency = Counter(word for document in documents for word in set(document))
+        total = len(documents)
+        self.idf = {word: math.log(1 + (total - count + 0.5) / (count + 0.5)) for word, count in document_frequency.items()}
+
+    def score(self, query: List[str], index: int) -> float:
+        frequencies = self.frequencies[index]
+        norm = self.k1 * (1 - self.b + self.b * self.lengths[index] / self.avg_length) if self.avg_length else self.k1
+        score = 0.0
+        for word in set(query):
+            tf = frequencies.get(word, 0)
+            if tf:
+                score += self.idf[word] * tf * (self.k1 + 1) / (tf + norm)
+        return score
+
+    def scores(self, query: List[str]) -> List[float]:
+        return [self.score(query, i) for i in range(len(self.frequencies))]
+
+def rank_chunks(chunks: List[str], query: str) -> List[Tuple[int, float]]:
+    """
+    Rank chunks against a query with BM25.
+    Returns:
+        List[Tuple[int, float]]: (chunk index, score) sorted by decreasing score, page order for ties.
+    """
+    bm25 = BM25([tokenize(chunk) for chunk in chunks])
+    scores = bm25.scores(tokenize(query))
+    return sorted(enumerate(scores), key=lambda item: (-item[1], item[0]))
+
+def select_relevant_text(text: str, query: str, budget: int, chunk_size: int = 1200) -> str:
+    """
+    Keep the chunks of a page the most relevant to a query within a size budget.
+    The selected chunks are returned in page order, skipped parts are marked with [...].
+    Args:
+        text (str): The page text.
+        query (str): The user query.
+        budget (int): Maximum size of the returned text in characters.
+        chunk_size (int): Size of the chunks, at most a quarter of the budget.
+    Returns:
+        str: The page text reduced to its relevant chunks, truncated page if nothing match the query.
+    """
+    if len(text) <= budget:
+        return text
+    chunks = split_chunks(text, min(chunk_size, budget // 4))
+    ranking = rank_chunks(chunks, query)
+    if not ranking or ranking[0][1] == 0:
+        return text[:budget]
+    overhead = len(PAGE_START) + len(PAGE_END) + len(SKIPPED_MARKER) + 6
+    selected = []
+    used = overhead
+    for index, score in ranking:
+        if score == 0:
+            break
+        cost = len(chunks[index]) + len(SKIPPED_MARKER) + 4
+        if used + cost > budget:
+            continue
+        selected.append(index)
+        used += cost
+    if not selected:
+        return text[:budget]
+    parts = [PAGE_START]
+    previous = -1
+    for index in sorted(selected):
+        if index != previous + 1:
+            parts.append(SKIPPED_MARKER)
+        parts.append(chunks[index])
+        previous = index
+    if previous != len(chunks) - 1:
+        parts.append(SKIPPED_MARKER)
+    parts.append(PAGE_END)
+    return "\n\n".join(parts)
+
+def reciprocal_rank_fusion(rankings: List[List[str]], k: int = 60) -> List[Tuple[str, float]]:
+    """
+    Merge several rankings of the same items with reciprocal rank fusion.
+    An item score is the sum of 1 / (k + rank) over the rankings it appears in.
+    Args:
+        rankings (List[List[str]]): The rankings, best item first, an item is counted once per ranking.
+        k (int): Smoothing constant, a higher value lowers the weight of the top ranks.
+    Returns:
+        List[Tuple[str, float]]: (item, score) sorted by decreasing score, first appearance for ties.
+    """
+    scores = {}
+    for ranking in rankings:
+        seen = set()
+        for rank, item in enumerate(ranking, start=1):
+            if item in seen:
+                continue
+            seen.add(item)
+            scores[item] = scores.get(item, 0.0) + 1.0 / (k + rank)
+    order = {item: i for i, item in enumerate(scores)}
+    return sorted(scores.items(), key=lambda entry: (-entry[1], order[entry[0]]))
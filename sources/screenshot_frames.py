@@ -0,0 +1,85 @@
+import os
+import sys
+import time
+import base64
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+if __name__ == "__main__": # if running as a script for individual testing
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sources.logger import Logger
+
+class ScreenshotFrames:
+    """
+    In memory versioned screenshots of the browser.
+    Captures are only requested while a client is polling and at most once per interval,
+    decoding, hashing and saving the image happen on a background thread.
+    """
+    def __init__(self, min_interval: float = 2.0, watch_window: float = 10.0, save_folder: str = None):
+        """
+        Args:
+            min_interval (float): Minimum seconds between two captures.
+            watch_window (float): Seconds a client is considered watching after its last request.
+            save_folder (str, optional): Also write the latest frame in this folder.
+        """
+        self.logger = Logger("screenshots.log")
+        self.min_interval = min_interval
+        self.watch_window = watch_window
+        self.save_folder = save_folder
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="screenshot")
+        self.frame = None
+        self.version = 0
+        self.last_capture = 0.0
+        self.last_watched = 0.0
+
+    def watched(self) -> None:
+        """Record that a client requested the screenshot."""
+        self.last_watched = time.time()
+
+    def is_watched(self) -> bool:
+        return time.time() - self.last_watched < self.watch_window
+
+    def should_capture(self) -> bool:
+        """Check if a capture is wanted: a client is watching and the last capture is old enough."""
+        if not self.is_watched():
+            return False
+        return time.time() - self.last_capture >= self.min_interval
+
+    def submit(self, png_base64: str, filename: str = "updated_screen.png") -> None:
+        """Publish a capture, the image is decoded and stored on the background thread."""
+        self.last_capture = time.time()
+        self.executor.submit(self.publish, png_base64, filename)
+
+    def publish(self, png_base64: str, filename: str) -> None:
+        try:
+            data = base64.b64decode(png_base64)
+        except Exception as e:
+            self.logger.error(f"Invalid screenshot data: {str(e)}")
+            return
+        etag = f'"{hashlib.sha1(data).hexdigest()}"'
+        with self.lock:
+            if self.frame is not None and self.frame["etag"] == etag:
+                return
+            self.version += 1
+            self.frame = {"version": self.version, "etag": etag, "data": data, "timestamp": time.time()}
+        self.logger.info(f"Screenshot frame {self.version} published ({len(data)} bytes).")
+        if self.save_folder is not None:
+            self.save(data, filename)
+
+    def save(self, data: bytes, filename: str) -> None:
+        try:
+            os.makedirs(self.save_folder, exist_ok=True)
+            path = os.path.join(self.save_folder, filename)
+            with open(path + ".tmp", "wb") as f:
+                f.write(data)
+            os.replace(path + ".tmp", path)
+        except OSError as e:
+            self.logger.error(f"Could not save screenshot: {str(e)}")
+
+    def latest(self) -> dict | None:
+        """Get the latest frame (version, etag, data, timestamp), None if nothing was captured."""
+        with self.lock:
+            return self.frame
@@ -1,7 +1,11 @@
 
 import os, sys
 import re
-from io import StringIO
+import time
+import queue
+import codecs
+import signal
+import threading
 import subprocess
 
 if __name__ == "__main__": # if running as a script for individual testing
@@ -10,6 +14,34 @@ if __name__ == "__main__": # if running as a script for individual testing
 from sources.tools.tools import Tools
 from sources.tools.safety import is_any_unsafe
 
+class OutputBuffer:
+    """
+    Keep the head and the tail of a command output, the middle of a huge output is dropped.
+    """
+    def __init__(self, head_chars: int = 8000, tail_chars: int = 8000):
+        self.head_chars = head_chars
+        self.tail_chars = tail_chars
+        self.head = ""
+        self.tail = ""
+        self.total = 0
+
+    def append(self, text: str) -> None:
+        self.total += len(text)
+        if len(self.head) < self.head_chars:
+            room = self.head_chars - len(self.head)
+            self.head += text[:room]
+            text = text[room:]
+        if text:
+            self.tail = (self.tail + text)[-self.tail_chars:]
+
+    def truncated(self) -> int:
+        return self.total - len(self.head) - len(self.tail)
+
+    def text(self) -> str:
+        if self.truncated() > 0:
+            return f"{self.head}\n... [{self.truncated()} characters truncated] ...\n{self.tail}"
+        return self.head + self.tail
+
 class BashInterpreter(Tools):
     """
     This class is a tool to allow agent for bash code execution.
@@ -32,6 +64,73 @@ class BashInterpreter(Tools):
                 return True
         return False
     
+    def kill_process(self, process: subprocess.Popen) -> None:
+        """Kill the command with the processes it started."""
+        try:
+            if os.name == "nt":
+                process.kill()
+            else:
+                os.killpg(process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError, OSError):
+            pass
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            pass
+
+    def run_command(self, command: str, timeout: float) -> tuple:
+        """
+        Run a command, stream its output chunks to the output listener as they arrive.
+        Args:
+            command (str): The shell command.
+            timeout (float): Seconds allowed, the command is killed after even if it is still printing.
+        Returns:
+            tuple: The return code (None if the command timed out) and the OutputBuffer of the output.
+        """
+        output = OutputBuffer()
+        process = subprocess.Popen(
+            command,
+            shell=True,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            start_new_session=(os.name != "nt")
+        )
+        chunks = queue.Queue()
+        def read_output():
+            while True:
+                try:
+                    data = process.stdout.read1(65536)
+                except (OSError, ValueError):
+                    data = b""
+                chunks.put(data)
+                if not data:
+                    break
+        threading.Thread(target=read_output, daemon=True).start()
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        deadline = time.time() + timeout
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                self.kill_process(process) # the reader thread ends when the pipe closes
+                return None, output
+            try:
+                data = chunks.get(timeout=min(remaining, 0.5))
+            except queue.Empty:
+                continue
+            if not data:
+                break
+            text = decoder.decode(data)
+            output.append(text)
+            self.emit_output(text)
+        process.stdout.close()
+        try:
+            return_code = process.wait(timeout=max(deadline - time.time(), 0.1))
+        except subprocess.TimeoutExpired:
+            self.kill_process(process)
+            return None, output
+        return return_code, output
+
     def execute(self, commands: str, safety=False, timeout=300):
         """
         Execute bash commands and display output in real-time.
@@ -49,23 +148,13 @@ class BashInterpreter(Tools):
             if self.language_bash_attempt(command) and self.allow_language_exec_bash == False:
                 continue
             try:
-                process = subprocess.Popen(
-                    command,
-                    shell=True,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    universal_newlines=True
-                )
-                command_output = ""
-                for line in process.stdout:
-                    command_output += line
-                return_code = process.wait(timeout=timeout)
+                return_code, output = self.run_command(command, timeout)
+                command_output = output.text()
+                if return_code is None:
+                    return f"Command {command} timed out after {timeout}s. Output:\n{command_output}"
                 if return_code != 0:
                     return f"Command {command} failed with return code {return_code}:\n{command_output}"
                 concat_output += f"Output of {command}:\n{command_output.strip()}\n"
-            except subprocess.TimeoutExpired:
-                process.kill()  # Kill the process if it times out
-                return f"Command {command} timed out. Output:\n{command_output}"
             except Exception as e:
                 return f"Command {command} failed:\n{str(e)}"
         return concat_output
@@ -1,12 +1,14 @@
 import subprocess
 import os, sys
-import tempfile
+import time
+import shutil
 import re
 
 if __name__ == "__main__": # if running as a script for individual testing
     sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from sources.tools.tools import Tools
+from sources.tools.build_cache import get_shared_build_cache
 
 class CInterpreter(Tools):
     """
@@ -17,6 +19,7 @@ class CInterpreter(Tools):
         self.tag = "c"
         self.name = "C Interpreter"
         self.description = "This tool allows the agent to execute C code."
+        self.build_cache = get_shared_build_cache()
 
     def execute(self, codes: str, safety=False) -> str:
         """
@@ -29,43 +32,47 @@ class CInterpreter(Tools):
             return "Code rejected by user."
 
         exec_extension = ".exe" if os.name == "nt" else ""  # Windows uses .exe, Linux/Unix does not
-        
-        with tempfile.TemporaryDirectory() as tmpdirname:
-            source_file = os.path.join(tmpdirname, "temp.c")
-            exec_file = os.path.join(tmpdirname, "temp") + exec_extension
+
+        def compile_code(build_dir: str) -> subprocess.CompletedProcess:
+            source_file = os.path.join(build_dir, "temp.c")
             with open(source_file, 'w') as f:
                 f.write(code)
+            compile_command = ["gcc", source_file, "-o", os.path.join(build_dir, "temp") + exec_extension]
+            return subprocess.run(
+                compile_command,
+                capture_output=True,
+                text=True,
+                timeout=60
+            )
 
-            try:
-                compile_command = ["gcc", source_file, "-o", exec_file]
-                compile_result = subprocess.run(
-                    compile_command,
-                    capture_output=True,
-                    text=True,
-                    timeout=60
-                )
-
-                if compile_result.returncode != 0:
+        try:
+            start = time.time()
+            key = self.build_cache.make_key("c", code, ["gcc", shutil.which("gcc")])
+            with self.build_cache.use(key, compile_code) as (build_dir, compile_result):
+                compile_time = time.time() - start
+                if build_dir is None:
                     return f"Compilation failed: {compile_result.stderr}"
 
-                run_command = [exec_file]
+                start = time.time()
+                run_command = [os.path.join(build_dir, "temp") + exec_extension]
                 run_result = subprocess.run(
                     run_command,
                     capture_output=True,
                     text=True,
                     timeout=120
                 )
+                self.build_cache.report_timings("C", compile_time, time.time() - start, compile_result is None)
 
                 if run_result.returncode != 0:
                     return f"Execution failed: {run_result.stderr}"
                 output = run_result.stdout
 
-            except subprocess.TimeoutExpired as e:
-                return f"Execution timed out: {str(e)}"
-            except FileNotFoundError:
-                return "Error: 'gcc' not found. Ensure a C compiler (e.g., gcc) is installed and in PATH."
-            except Exception as e:
-                return f"Code execution failed: {str(e)}"
+        except subprocess.TimeoutExpired as e:
+            return f"Execution timed out: {str(e)}"
+        except FileNotFoundError:
+            return "Error: 'gcc' not found. Ensure a C compiler (e.g., gcc) is installed and in PATH."
+        except Exception as e:
+            return f"Code execution failed: {str(e)}"
 
         return output
 
@@ -1,12 +1,14 @@
 import subprocess
 import os, sys
-import tempfile
+import time
+import shutil
 import re
 
 if __name__ == "__main__": # if running as a script for individual testing
     sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from sources.tools.tools import Tools
+from sources.tools.build_cache import get_shared_build_cache
 
 class GoInterpreter(Tools):
     """
@@ -17,6 +19,7 @@ class GoInterpreter(Tools):
         self.tag = "go"
         self.name = "Go Interpreter"
         self.description = "This tool allows you to execute Go code."
+        self.build_cache = get_shared_build_cache()
 
     def execute(self, codes: str, safety=False) -> str:
         """
@@ -28,45 +31,51 @@ class GoInterpreter(Tools):
         if safety and input("Execute code? y/n ") != "y":
             return "Code rejected by user."
 
-        with tempfile.TemporaryDirectory() as tmpdirname:
-            source_file = os.path.join(tmpdirname, "temp.go")
-            exec_file = os.path.join(tmpdirname, "temp")
+        env = os.environ.copy()
+        env["GO111MODULE"] = "off"
+        env["GOCACHE"] = self.build_cache.go_cache_dir()
+
+        def compile_code(build_dir: str) -> subprocess.CompletedProcess:
+            source_file = os.path.join(build_dir, "temp.go")
             with open(source_file, 'w') as f:
                 f.write(code)
-
-            try:
-                env = os.environ.copy()
-                env["GO111MODULE"] = "off"
-                compile_command = ["go", "build", "-o", exec_file, source_file]
-                compile_result = subprocess.run(
-                    compile_command,
-                    capture_output=True,
-                    text=True,
-                    timeout=10,
-                    env=env
-                )
-
-                if compile_result.returncode != 0:
+            compile_command = ["go", "build", "-o", os.path.join(build_dir, "temp"), source_file]
+            return subprocess.run(
+                compile_command,
+                capture_output=True,
+                text=True,
+                timeout=10,
+                env=env
+            )
+
+        try:
+            start = time.time()
+            key = self.build_cache.make_key("go", code, ["go", shutil.which("go")])
+            with self.build_cache.use(key, compile_code) as (build_dir, compile_result):
+                compile_time = time.time() - start
+                if build_dir is None:
                     return f"Compilation failed: {compile_result.stderr}"
 
-                run_command = [exec_file]
+                start = time.time()
+                run_command = [os.path.join(build_dir, "temp")]
                 run_result = subprocess.run(
                     run_command,
                     capture_output=True,
                     text=True,
                     timeout=10
                 )
+                self.build_cache.report_timings("Go", compile_time, time.time() - start, compile_result is None)
 
                 if run_result.returncode != 0:
                     return f"Execution failed: {run_result.stderr}"
                 output = run_result.stdout
 
-            except subprocess.TimeoutExpired as e:
-                return f"Execution timed out: {str(e)}"
-            except FileNotFoundError:
-                return "Error: 'go' not found. Ensure Go is installed and in PATH."
-            except Exception as e:
-                return f"Code execution failed: {str(e)}"
+        except subprocess.TimeoutExpired as e:
+            return f"Execution timed out: {str(e)}"
+        except FileNotFoundError:
+            return "Error: 'go' not found. Ensure Go is installed and in PATH."
+        except Exception as e:
+            return f"Code execution failed: {str(e)}"
 
         return output
 
@@ -1,12 +1,14 @@
 import subprocess
 import os, sys
-import tempfile
+import time
+import shutil
 import re
 
 if __name__ == "__main__": # if running as a script for individual testing
     sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from sources.tools.tools import Tools
+from sources.tools.build_cache import get_shared_build_cache
 
 class JavaInterpreter(Tools):
     """
@@ -17,6 +19,7 @@ class JavaInterpreter(Tools):
         self.tag = "java"
         self.name = "Java Interpreter"
         self.description = "This tool allows you to execute Java code."
+        self.build_cache = get_shared_build_cache()
 
     def execute(self, codes: str, safety=False) -> str:
         """
@@ -28,24 +31,27 @@ class JavaInterpreter(Tools):
         if safety and input("Execute code? y/n ") != "y":
             return "Code rejected by user."
 
-        with tempfile.TemporaryDirectory() as tmpdirname:
-            source_file = os.path.join(tmpdirname, "Main.java")
-            class_dir = tmpdirname
+        def compile_code(build_dir: str) -> subprocess.CompletedProcess:
+            source_file = os.path.join(build_dir, "Main.java")
             with open(source_file, 'w') as f:
                 f.write(code)
-
-            try:
-                compile_command = ["javac", "-d", class_dir, source_file]
-                compile_result = subprocess.run(
-                    compile_command,
-                    capture_output=True,
-                    text=True,
-                    timeout=10
-                )
-
-                if compile_result.returncode != 0:
+            compile_command = ["javac", "-d", build_dir, source_file]
+            return subprocess.run(
+                compile_command,
+                capture_output=True,
+                text=True,
+                timeout=10
+            )
+
+        try:
+            start = time.time()
+            key = self.build_cache.make_key("java", code, ["javac", shutil.which("javac")])
+            with self.build_cache.use(key, compile_code) as (class_dir, compile_result):
+                compile_time = time.time() - start
+                if class_dir is None:
                     return f"Compilation failed: {compile_result.stderr}"
 
+                start = time.time()
                 run_command = ["java", "-cp", class_dir, "Main"]
                 run_result = subprocess.run(
                     run_command,
@@ -53,17 +59,18 @@ class JavaInterpreter(Tools):
                     text=True,
                     timeout=10
                 )
+                self.build_cache.report_timings("Java", compile_time, time.time() - start, compile_result is None)
 
                 if run_result.returncode != 0:
                     return f"Execution failed: {run_result.stderr}"
                 output = run_result.stdout
 
-            except subprocess.TimeoutExpired as e:
-                return f"Execution timed out: {str(e)}"
-            except FileNotFoundError:
-                return "Error: 'java' or 'javac' not found. Ensure Java is installed and in PATH."
-            except Exception as e:
-                return f"Code execution failed: {str(e)}"
+        except subprocess.TimeoutExpired as e:
+            return f"Execution timed out: {str(e)}"
+        except FileNotFoundError:
+            return "Error: 'java' or 'javac' not found. Ensure Java is installed and in PATH."
+        except Exception as e:
+            return f"Code execution failed: {str(e)}"
 
         return output
 
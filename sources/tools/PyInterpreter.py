@@ -2,12 +2,12 @@
 import sys
 import os
 import re
-from io import StringIO
 
 if __name__ == "__main__": # if running as a script for individual testing
     sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from sources.tools.tools import Tools
+from sources.tools.worker_pool import get_shared_pool
 
 class PyInterpreter(Tools):
     """
@@ -18,43 +18,29 @@ class PyInterpreter(Tools):
         self.tag = "python"
         self.name = "Python Interpreter"
         self.description = "This tool allows the agent to execute python code."
+        self.pool = None # the shared worker pool, started on the first execution
 
     def execute(self, codes:str, safety = False) -> str:
         """
-        Execute python code.
+        Execute python code in a worker process, the output is streamed to the output listener.
         """
-        output = ""
         if safety and input("Execute code ? y/n") != "y":
             return "Code rejected by user."
-        stdout_buffer = StringIO()
-        sys.stdout = stdout_buffer
-        global_vars = {
-            '__builtins__': __builtins__,
-            'os': os,
-            'sys': sys,
-            '__name__': '__main__'
-        }
         code = '\n\n'.join(codes)
         self.logger.info(f"Executing code:\n{code}")
-        try:
-            try:
-                buffer = exec(code, global_vars)
-                self.logger.info(f"Code executed successfully.\noutput:{buffer}")
-                print(buffer)
-                if buffer is not None:
-                    output = buffer + '\n'
-            except SystemExit:
-                self.logger.info("SystemExit caught, code execution stopped.")
-                output = stdout_buffer.getvalue()
-                return f"[SystemExit caught] Output before exit:\n{output}"
-            except Exception as e:
-                self.logger.error(f"Code execution failed: {str(e)}")
-                return "code execution failed:" + str(e)
-            output = stdout_buffer.getvalue()
-        finally:
-            self.logger.info("Code execution finished.")
-            sys.stdout = sys.__stdout__
-        return output
+        if self.pool is None:
+            self.pool = get_shared_pool(cwd=self.work_dir)
+        result = self.pool.run(code, cwd=self.work_dir, listener=self.emit_output)
+        output = result["output"]
+        self.logger.info(f"Code execution finished: {result['status']} in {result['duration']:.2f}s.")
+        if result["status"] == "ok":
+            return output
+        if result["status"] == "exit":
+            return f"[SystemExit caught] Output before exit:\n{output}"
+        self.logger.error(f"Code execution failed: {result['error']}")
+        if output.strip():
+            return f"code execution failed:{result['error']}\nOutput before the failure:\n{output}"
+        return f"code execution failed:{result['error']}"
 
     def interpreter_feedback(self, output:str) -> str:
         """
@@ -1,5 +1,6 @@
 from .PyInterpreter import PyInterpreter
 from .BashInterpreter import BashInterpreter
 from .fileFinder import FileFinder
+from .contentSearch import ContentSearch
 
-__all__ = ["PyInterpreter", "BashInterpreter", "FileFinder", "webSearch", "FlightSearch", "GoInterpreter", "CInterpreter", "GoInterpreter"]
+__all__ = ["PyInterpreter", "BashInterpreter", "FileFinder", "ContentSearch", "webSearch", "FlightSearch", "GoInterpreter", "CInterpreter", "GoInterpreter"]
@@ -0,0 +1,132 @@
+import re
+from functools import lru_cache
+from typing import List, Tuple
+
+FENCE = "```"
+TAG_PATTERN = re.compile(r'[^\s:`]*')
+
+class Block:
+    """
+    A fenced block of an LLM answer, eg: ```python:tmp.py ... ```
+    """
+    def __init__(self, tag: str, content: str, save_path: str | None = None, complete: bool = True, start: int = 0, end: int = 0):
+        """
+        Args:
+            tag (str): The word following the opening fence (python, bash, web_search...).
+            content (str): The block content, dedented to the fence indentation, without the save path line.
+            save_path (str | None): The path written after the tag (```python:tmp.py), None if there is none.
+            complete (bool): False for a block whose closing fence never came.
+            start (int): Position of the opening fence in the text.
+            end (int): Position after the closing fence in the text.
+        """
+        self.tag = tag
+        self.content = content
+        self.save_path = save_path
+        self.complete = complete
+        self.start = start
+        self.end = end
+
+    def __repr__(self) -> str:
+        return f"Block(tag={self.tag!r}, save_path={self.save_path!r}, complete={self.complete}, content={self.content[:32]!r})"
+
+def make_block(tag: str, raw: str, leading_whitespace: str, complete: bool, start: int, end: int) -> Block:
+    """Dedent the block to its fence indentation and split the save path from its first line."""
+    content = raw
+    if leading_whitespace:
+        content = '\n'.join(line[len(leading_whitespace):] if line.startswith(leading_whitespace) else line
+                            for line in raw.split('\n'))
+    save_path = None
+    first_line = content.split('\n', 1)[0]
+    if ':' in first_line:
+        save_path = first_line.split(':')[1]
+        content = content[content.find('\n')+1:]
+    return Block(tag, content, save_path, complete, start, end)
+
+class BlockTokenizer:
+    """
+    Single pass tokenizer of the fenced blocks of an LLM answer.
+    A block opens with a fence at the start of a line (indentation allowed) directly followed by its tag.
+    Text can be fed as it is generated, a block is returned as soon as its closing fence arrives.
+    """
+    def __init__(self):
+        self.buffer = ""
+        self.position = 0
+        self.state = "text" # text, tag or block
+        self.fence_start = 0
+        self.leading_whitespace = ""
+        self.tag = None
+        self.content_start = 0
+        self.blocks = []
+
+    def feed(self, text: str) -> List[Block]:
+        """
+        Add generated text.
+        Args:
+            text (str): The next part of the answer.
+        Returns:
+            List[Block]: The blocks closed by this text.
+        """
+        self.buffer += text
+        closed = []
+        while True:
+            if self.state == "text":
+                fence = self.buffer.find(FENCE, self.position)
+                if fence == -1:
+                    self.position = max(self.position, len(self.buffer) - len(FENCE) + 1)
+                    break
+                line_start = self.buffer.rfind('\n', 0, fence) + 1
+                self.position = fence + len(FENCE)
+                if self.buffer[line_start:fence].strip():
+                    continue # a fence inside a sentence does not open a block
+                self.fence_start = fence
+                self.leading_whitespace = self.buffer[line_start:fence]
+                self.state = "tag"
+            elif self.state == "tag":
+                match = TAG_PATTERN.match(self.buffer, self.position)
+                if match.end() == len(self.buffer):
+                    break # the tag may continue in the next text
+                if not match.group(0):
+                    self.state = "text" # an opening fence is followed by its tag
+                    continue
+                self.tag = match.group(0)
+                self.content_start = match.end()
+                self.position = match.end()
+                self.state = "block"
+            else:
+                fence = self.buffer.find(FENCE, self.position)
+                if fence == -1:
+                    self.position = max(self.position, len(self.buffer) - len(FENCE) + 1)
+                    break
+                block = make_block(self.tag, self.buffer[self.content_start:fence], self.leading_whitespace,
+                                   True, self.fence_start, fence + len(FENCE))
+                self.blocks.append(block)
+                closed.append(block)
+                self.position = fence + len(FENCE)
+                self.state = "text"
+        return closed
+
+    def finish(self) -> List[Block]:
+        """
+        End the text.
+        Returns:
+            List[Block]: All the blocks, a block left open at the end is included with complete=False.
+        """
+        if self.state == "tag":
+            self.tag = self.buffer[self.position:]
+            self.content_start = len(self.buffer)
+            self.state = "block"
+        if self.state == "block":
+            self.blocks.append(make_block(self.tag, self.buffer[self.content_start:], self.leading_whitespace,
+                                          False, self.fence_start, len(self.buffer)))
+            self.state = "text"
+        return self.blocks
+
+@lru_cache(maxsize=16)
+def parse_blocks(text: str) -> Tuple[Block, ...]:
+    """
+    Parse all the fenced blocks of a complete text.
+    The result is cached so every tool of an agent looking for its blocks in the same answer share a single scan.
+    """
+    tokenizer = BlockTokenizer()
+    tokenizer.feed(text)
+    return tuple(tokenizer.finish())
@@ -0,0 +1,187 @@
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import tempfile
+import threading
+import subprocess
+from contextlib import contextmanager
+from typing import Callable, Tuple
+
+if __name__ == "__main__": # if running as a script for individual testing
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sources.logger import Logger
+
+class BuildCache:
+    """
+    Disk cache of compiled programs (binaries, class files) keyed by a hash of the language, compiler and code.
+    The agent retries often compile the same code again, a cached build is run without compiling.
+    The total size is capped and the least recently used builds are evicted first, builds still in use are never evicted.
+    """
+    def __init__(self, cache_dir: str = None, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Args:
+            cache_dir (str, optional): Folder of the cache, default to .build_cache in the working directory.
+            max_bytes (int): Maximum size of the cached builds, the Go build cache is not counted.
+        """
+        self.logger = Logger("build_cache.log")
+        self.cache_dir = cache_dir or os.path.join(os.getcwd(), ".build_cache")
+        self.builds_dir = os.path.join(self.cache_dir, "builds")
+        self.index_path = os.path.join(self.cache_dir, "index.json")
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evicted": 0}
+        self.in_use = {}
+        self.go_cache = None
+        os.makedirs(self.builds_dir, exist_ok=True)
+        self.index = self.load_index()
+
+    def load_index(self) -> dict:
+        if not os.path.exists(self.index_path):
+            return {}
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            self.logger.warning(f"Could not load build cache index, starting empty: {str(e)}")
+            return {}
+        return {key: meta for key, meta in index.items() if os.path.isdir(self.build_path(key))}
+
+    def save_index(self) -> None:
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f)
+        os.replace(tmp_path, self.index_path)
+
+    def go_cache_dir(self) -> str:
+        """
+        Persistent GOCACHE shared by the Go builds, so the standard library and unchanged packages are not compiled again.
+        The Go cache of the user is used when it is writable (it is usually warm already), else a folder of the build cache.
+        """
+        if self.go_cache is not None:
+            return self.go_cache
+        go_cache = os.environ.get("GOCACHE")
+        if not go_cache:
+            try:
+                go_cache = subprocess.run(["go", "env", "GOCACHE"], capture_output=True, text=True, timeout=10).stdout.strip()
+            except (OSError, subprocess.TimeoutExpired):
+                go_cache = None
+        if not go_cache or go_cache == "off" or not os.access(os.path.dirname(go_cache) or ".", os.W_OK):
+            go_cache = os.path.join(self.cache_dir, "gocache")
+        self.go_cache = go_cache
+        return go_cache
+
+    def make_key(self, language: str, code: str, compiler: list) -> str:
+        content = json.dumps([language, compiler, code])
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()[:32]
+
+    def build_path(self, key: str) -> str:
+        return os.path.join(self.builds_dir, key)
+
+    def get(self, key: str, acquire: bool = False) -> str | None:
+        """Get the folder of a cached build, None if the code was not built. With acquire the build is leased, see release."""
+        with self.lock:
+            meta = self.index.get(key)
+            if meta is None or not os.path.isdir(self.build_path(key)):
+                self.stats["misses"] += 1
+                return None
+            meta["last_used"] = time.time()
+            self.stats["hits"] += 1
+            if acquire:
+                self.in_use[key] = self.in_use.get(key, 0) + 1
+            self.save_index()
+        return self.build_path(key)
+
+    def release(self, key: str) -> None:
+        """End a lease taken by get or build, the build can be evicted again once no one uses it."""
+        with self.lock:
+            count = self.in_use.get(key, 0) - 1
+            if count > 0:
+                self.in_use[key] = count
+            else:
+                self.in_use.pop(key, None)
+
+    def build(self, key: str, compile_fn: Callable, acquire: bool = False) -> Tuple[str | None, object]:
+        """
+        Get a cached build or compile it.
+        Args:
+            key (str): The build key, see make_key.
+            compile_fn (Callable): Called with an empty folder, compile in it and return the subprocess result.
+            acquire (bool): Lease the returned build so it is not evicted, call release(key) once done running it.
+        Returns:
+            Tuple[str | None, object]: The build folder (None if the compilation failed) and the compile result (None on cache hit).
+        """
+        path = self.get(key, acquire=acquire)
+        if path is not None:
+            return path, None
+        tmp_dir = tempfile.mkdtemp(prefix="build-", dir=self.cache_dir)
+        try:
+            result = compile_fn(tmp_dir)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        if result.returncode != 0:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return None, result
+        return self.put(key, tmp_dir, acquire=acquire), result
+
+    @contextmanager
+    def use(self, key: str, compile_fn: Callable):
+        """Build like build and keep the build from being evicted until the block exits."""
+        path, result = self.build(key, compile_fn, acquire=True)
+        try:
+            yield path, result
+        finally:
+            if path is not None:
+                self.release(key)
+
+    def put(self, key: str, build_dir: str, acquire: bool = False) -> str:
+        """Move a finished build in the cache, with acquire the build is leased, see release."""
+        path = self.build_path(key)
+        size = sum(os.path.getsize(os.path.join(root, name)) for root, _, files in os.walk(build_dir) for name in files)
+        with self.lock:
+            try:
+                os.rename(build_dir, path)
+            except OSError: # built at the same time by another agent
+                shutil.rmtree(build_dir, ignore_errors=True)
+            self.index[key] = {"size": size, "last_used": time.time()}
+            if acquire:
+                self.in_use[key] = self.in_use.get(key, 0) + 1
+            self.evict(keep=key)
+            self.save_index()
+        return path
+
+    def evict(self, keep: str = None) -> None:
+        """Remove the least recently used builds until the cache fits in max_bytes, builds in use are kept, lock must be held."""
+        total = sum(meta["size"] for meta in self.index.values())
+        for key in sorted(self.index, key=lambda key: self.index[key]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            if key == keep or key in self.in_use:
+                continue
+            total -= self.index[key]["size"]
+            del self.index[key]
+            shutil.rmtree(self.build_path(key), ignore_errors=True)
+            self.stats["evicted"] += 1
+
+    def report_timings(self, language: str, compile_time: float, run_time: float, cached: bool) -> None:
+        """Log the compile and run time of a program, called by the C, Go and Java interpreters."""
+        self.logger.info(f"{language} compile {compile_time:.2f}s{' (cached build)' if cached else ''}, run {run_time:.2f}s.")
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            return dict(self.stats, builds=len(self.index), bytes=sum(meta["size"] for meta in self.index.values()))
+
+shared_cache = None
+shared_cache_lock = threading.Lock()
+
+def get_shared_build_cache() -> BuildCache:
+    """Get the build cache shared by the C, Go and Java interpreters."""
+    global shared_cache
+    with shared_cache_lock:
+        if shared_cache is None:
+            shared_cache = BuildCache()
+        return shared_cache
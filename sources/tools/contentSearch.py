@@ -0,0 +1,92 @@
+import os, sys
+
+if __name__ == "__main__": # if running as a script for individual testing
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sources.tools.tools import Tools
+from sources.tools.content_index import get_shared_content_index
+
+class ContentSearch(Tools):
+    """
+    A tool that finds the files whose content mentions some words, with the matching lines.
+    """
+    def __init__(self):
+        super().__init__()
+        self.tag = "content_search"
+        self.read_only = True
+        self.name = "Content Search"
+        self.description = "Finds the files whose content mentions some words and shows the matching lines."
+        self.content_index = get_shared_content_index(self.work_dir)
+
+    def execute(self, blocks: list, safety: bool = False) -> str:
+        """
+        Searches the content of the files of the work dir.
+        Args:
+            blocks (list): List of blocks with a query and optionally a limit of files
+        Returns:
+            str: The best files for each query with their matching lines
+        """
+        if not blocks or not isinstance(blocks, list):
+            return "Error: No valid query provided"
+
+        output = ""
+        notes = []
+        for block in blocks:
+            query = self.get_parameter_value(block, "query")
+            if query is None:
+                query = block.strip()
+            if not query:
+                return "Error: No query provided"
+            limit = self.get_parameter_value(block, "limit")
+            limit = int(limit) if limit is not None and limit.isdigit() else 5
+            results = self.content_index.search(query, limit=limit)
+            notes += [note for note in self.content_index.coverage_notes(query) if note not in notes]
+            if not results:
+                output += f"Query: {query} - no file mentions it\n"
+                continue
+            output += f"Query: {query} - {len(results)} files:\n"
+            for result in results:
+                output += f"{os.path.relpath(result['path'], self.work_dir)}\n"
+                for number, line in result["snippets"]:
+                    output += f"    {number}: {line}\n"
+        if notes:
+            output += f"({'; '.join(notes)}, use grep to search them)\n"
+        return output.strip()
+
+    def execution_failure_check(self, output: str) -> bool:
+        """
+        Checks if the content search failed.
+        Args:
+            output (str): The output string from execute()
+        Returns:
+            bool: True if execution failed, False if successful
+        """
+        if not output:
+            return True
+        return output.startswith("Error") or "no file mentions it" in output
+
+    def interpreter_feedback(self, output: str) -> str:
+        """
+        Provides feedback about the content search.
+        Args:
+            output (str): The output string from execute()
+        Returns:
+            str: Feedback message for the AI
+        """
+        if not output:
+            return "No output generated from content search tool"
+        if self.execution_failure_check(output):
+            return f"Content Search Results:\nFailed to find: {output}"
+        return f"Content Search Results:\n{output}"
+
+if __name__ == "__main__":
+    tool = ContentSearch()
+    result = tool.execute(["""
+query=search engine
+limit=3
+"""], False)
+    print("Execution result:")
+    print(result)
+    print("\nFailure check:", tool.execution_failure_check(result))
+    print("\nFeedback:")
+    print(tool.interpreter_feedback(result))
@@ -0,0 +1,286 @@
+import os
+import re
+import sys
+import math
+import time
+import mimetypes
+import threading
+from typing import List, Tuple
+
+if __name__ == "__main__": # if running as a script for individual testing
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sources.logger import Logger
+from sources.tools.file_index import FileIndex, get_shared_file_index
+
+TOKEN_PATTERN = re.compile(r"[^\W_]{2,64}")
+BINARY_MIME_TYPES = ("image/", "audio/", "video/", "font/", "application/octet-stream", "application/pdf", "application/zip",
+                     "application/gzip", "application/x-tar", "application/x-bzip2", "application/x-xz", "application/x-7z-compressed",
+                     "application/x-rar-compressed", "application/java-archive", "application/x-executable", "application/wasm")
+POSTING_BYTES = 100 # rough size of a posting (term of a file and its count) in the index
+TERM_BYTES = 120 # rough size of a term entry
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+class ContentIndex:
+    """
+    Incremental inverted index of the text files of a folder, for ranked full text search.
+    Files are listed from the file index of the folder, only new or modified files are read again.
+    The contents are not kept in memory, snippets are read from the files of the best results.
+    """
+    def __init__(self, root: str, file_index: FileIndex = None,
+                       memory_budget_mb: int = 64,
+                       max_file_bytes: int = 1024 * 1024,
+                       rescan_interval: float = 5.0):
+        """
+        Args:
+            root (str): The folder to index.
+            file_index (FileIndex, optional): The file index of the folder, default to the shared one.
+            memory_budget_mb (int): Approximate memory of the index, the most recently modified files are indexed first.
+            max_file_bytes (int): Bigger files are only indexed for their first max_file_bytes.
+            rescan_interval (float): Seconds after which a search first looks for modified files.
+        """
+        self.logger = Logger("content_index.log")
+        self.root = os.path.abspath(root)
+        self.file_index = file_index or get_shared_file_index(self.root)
+        self.memory_budget = memory_budget_mb * 1024 * 1024
+        self.max_file_bytes = max_file_bytes
+        self.rescan_interval = rescan_interval
+        self.postings = {} # term -> {doc id: count}
+        self.docs = {} # doc id -> {"path", "mtime", "size", "length", "terms"}
+        self.doc_ids = {} # relative path -> doc id
+        self.next_id = 0
+        self.total_length = 0
+        self.posting_count = 0
+        self.dead_postings = 0
+        self.skipped = [] # text files left out of the index by the memory budget
+        self.truncated = 0 # indexed files bigger than max_file_bytes, only their start is searched
+        self.binaries = {} # relative path -> (mtime, size) of the files that are not text
+        self.last_scan = 0.0
+        self.lock = threading.RLock()
+        self.ready = threading.Event()
+
+    def is_text_file(self, path: str) -> bool:
+        """Guess if a file is text: clearly binary mime types are not, other files are checked for NUL bytes."""
+        mime_type, encoding = mimetypes.guess_type(path)
+        if encoding is not None:
+            return False # compressed
+        if mime_type is not None and mime_type.startswith(BINARY_MIME_TYPES):
+            return False
+        try:
+            with open(path, 'rb') as f:
+                return b"\x00" not in f.read(1024)
+        except OSError:
+            return False
+
+    def memory_used(self) -> int:
+        return self.posting_count * POSTING_BYTES + len(self.postings) * TERM_BYTES
+
+    def read_text(self, path: str) -> str:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            return f.read(self.max_file_bytes)
+
+    def add_document(self, rel_path: str, mtime: int, size: int) -> bool:
+        """Index a file, return False if it can't be read."""
+        try:
+            text = self.read_text(os.path.join(self.root, rel_path))
+        except OSError:
+            return False
+        counts = {}
+        for token in tokenize(text):
+            counts[token] = counts.get(token, 0) + 1
+        doc_id = self.next_id
+        self.next_id += 1
+        for term, count in counts.items():
+            self.postings.setdefault(term, {})[doc_id] = count
+        length = sum(counts.values())
+        self.docs[doc_id] = {"path": rel_path, "mtime": mtime, "size": size, "length": length, "terms": len(counts)}
+        self.doc_ids[rel_path] = doc_id
+        self.total_length += length
+        self.posting_count += len(counts)
+        return True
+
+    def remove_document(self, rel_path: str) -> None:
+        """Forget a file, its postings are dropped at the next compaction."""
+        doc_id = self.doc_ids.pop(rel_path, None)
+        if doc_id is None:
+            return
+        doc = self.docs.pop(doc_id)
+        self.total_length -= doc["length"]
+        self.dead_postings += doc["terms"]
+
+    def compact(self) -> None:
+        """Remove the postings of forgotten files."""
+        for term in list(self.postings):
+            docs = {doc_id: count for doc_id, count in self.postings[term].items() if doc_id in self.docs}
+            if docs:
+                self.postings[term] = docs
+            else:
+                del self.postings[term]
+        self.posting_count = sum(len(docs) for docs in self.postings.values())
+        self.dead_postings = 0
+
+    def refresh(self) -> Tuple[int, int]:
+        """
+        Index the new and modified files and forget the deleted ones.
+        Returns:
+            Tuple[int, int]: The number of files indexed and removed.
+        """
+        start = time.time()
+        if self.file_index.is_stale():
+            self.file_index.scan()
+        files = []
+        for rel_path in self.file_index.list_files():
+            try:
+                stats = os.stat(os.path.join(self.root, rel_path))
+            except OSError:
+                continue
+            files.append((rel_path, stats.st_mtime_ns, stats.st_size))
+        files.sort(key=lambda file: -file[1]) # most recently modified first
+        indexed = removed = 0
+        with self.lock:
+            present = {rel_path for rel_path, _, _ in files}
+            for rel_path in [path for path in self.doc_ids if path not in present]:
+                self.remove_document(rel_path)
+                removed += 1
+            self.binaries = {path: stats for path, stats in self.binaries.items() if path in present}
+            skipped = []
+            for rel_path, mtime, size in files:
+                doc_id = self.doc_ids.get(rel_path)
+                if doc_id is not None:
+                    doc = self.docs[doc_id]
+                    if doc["mtime"] == mtime and doc["size"] == size:
+                        continue
+                    self.remove_document(rel_path)
+                    removed += 1
+                if self.binaries.get(rel_path) == (mtime, size):
+                    continue
+                if not self.is_text_file(os.path.join(self.root, rel_path)):
+                    self.binaries[rel_path] = (mtime, size)
+                    continue
+                if self.memory_used() > self.memory_budget:
+                    skipped.append(rel_path)
+                    continue
+                if self.add_document(rel_path, mtime, size):
+                    indexed += 1
+            if self.dead_postings > self.posting_count // 2:
+                self.compact()
+            self.skipped = skipped
+            self.truncated = sum(1 for doc in self.docs.values() if doc["size"] > self.max_file_bytes)
+            self.last_scan = time.time()
+        self.ready.set()
+        self.logger.info(f"Indexed {indexed} files, removed {removed}, {len(skipped)} over the memory budget, in {time.time() - start:.2f}s.")
+        return indexed, removed
+
+    def start(self) -> None:
+        """Build the index in the background."""
+        def run():
+            try:
+                self.refresh()
+            except Exception as e:
+                self.logger.error(f"Content index build failed: {str(e)}")
+                self.ready.set()
+        threading.Thread(target=run, daemon=True).start()
+
+    def snippet(self, rel_path: str, terms: List[str], max_lines: int = 2) -> Tuple[bool, List[Tuple[int, str]]]:
+        """
+        Find the lines of a file with the most query terms.
+        Returns:
+            Tuple[bool, List[Tuple[int, str]]]: If the terms appear in order as a phrase, and the (line number, line) snippets.
+        """
+        try:
+            text = self.read_text(os.path.join(self.root, rel_path))
+        except OSError:
+            return False, []
+        phrase = " ".join(terms)
+        has_phrase = f" {phrase} " in f" {' '.join(tokenize(text))} " if len(terms) > 1 else True
+        scored = []
+        for number, line in enumerate(text.split("\n"), start=1):
+            tokens = set(tokenize(line))
+            hits = sum(1 for term in terms if term in tokens)
+            if hits:
+                scored.append((hits, number, line.strip()[:200]))
+        best = max((hits for hits, _, _ in scored), default=0)
+        lines = [(number, line) for hits, number, line in scored if hits == best]
+        return has_phrase, lines[:max_lines]
+
+    def search(self, query: str, limit: int = 5, k1: float = 1.2, b: float = 0.75) -> List[dict]:
+        """
+        Search the files containing the words of the query, ranked by BM25, files with the exact phrase first.
+        Args:
+            query (str): The words to search.
+            limit (int): Maximum number of files returned.
+        Returns:
+            List[dict]: path (absolute), score and snippets (line number, line) of the best files.
+        """
+        if not self.ready.is_set() or time.time() - self.last_scan > self.rescan_interval:
+            self.refresh() # waits for the background build if it is running
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        with self.lock:
+            doc_count = len(self.docs)
+            average_length = self.total_length / doc_count if doc_count else 1
+            scores = {}
+            for term in terms:
+                docs = {doc_id: count for doc_id, count in self.postings.get(term, {}).items() if doc_id in self.docs}
+                if not docs:
+                    continue
+                idf = math.log(1 + (doc_count - len(docs) + 0.5) / (len(docs) + 0.5))
+                for doc_id, count in docs.items():
+                    length = self.docs[doc_id]["length"]
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * count * (k1 + 1) / (count + k1 * (1 - b + b * length / average_length))
+            candidates = sorted(scores, key=lambda doc_id: -scores[doc_id])[:limit * 3]
+            candidates = [(self.docs[doc_id]["path"], scores[doc_id]) for doc_id in candidates]
+        results = []
+        for rel_path, score in candidates:
+            has_phrase, snippets = self.snippet(rel_path, terms)
+            results.append({"path": os.path.join(self.root, rel_path),
+                            "score": score * (1.5 if has_phrase else 1.0),
+                            "snippets": snippets})
+        results.sort(key=lambda result: -result["score"])
+        return results[:limit]
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            return {"files": len(self.docs), "terms": len(self.postings), "postings": self.posting_count,
+                    "memory_mb": self.memory_used() / (1024 * 1024), "skipped": len(self.skipped), "truncated": self.truncated}
+
+    def coverage_notes(self, query: str) -> List[str]:
+        """Tell what the index did not search for a query: words too short to be indexed, files left out or cut."""
+        notes = []
+        short_words = [word for word in query.split() if not tokenize(word)]
+        if short_words:
+            notes.append(f"words shorter than 2 letters or without letters are not indexed: {' '.join(short_words)}")
+        with self.lock:
+            skipped, truncated = len(self.skipped), self.truncated
+        if skipped:
+            notes.append(f"{skipped} files were not searched, the index is full")
+        if truncated:
+            notes.append(f"{truncated} files are only searched in their first {self.max_file_bytes // 1024}KB")
+        return notes
+
+shared_indexes = {}
+shared_indexes_lock = threading.Lock()
+
+def get_shared_content_index(root: str) -> ContentIndex:
+    """Get the content index of a folder, shared by the content search tools of all agents, its build starts in the background."""
+    root = os.path.abspath(root)
+    with shared_indexes_lock:
+        if root not in shared_indexes:
+            shared_indexes[root] = ContentIndex(root)
+            shared_indexes[root].start()
+        return shared_indexes[root]
+
+if __name__ == "__main__":
+    index = ContentIndex(sys.argv[1] if len(sys.argv) > 1 else os.getcwd())
+    start = time.time()
+    index.refresh()
+    print(f"Built in {time.time() - start:.2f}s:", index.get_stats())
+    for query in ["memory compression", "browser screenshot", "def execute"]:
+        start = time.time()
+        results = index.search(query, limit=3)
+        print(f"{query} ({(time.time() - start) * 1000:.1f}ms)")
+        for result in results:
+            print(f"  {result['path']} {result['score']:.2f} {result['snippets'][:1]}")
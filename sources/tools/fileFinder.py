@@ -7,6 +7,8 @@ if __name__ == "__main__": # if running as a script for individual testing
     sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from sources.tools.tools import Tools
+from sources.tools.file_index import get_shared_file_index
+from sources.tools.file_reader import FileReader, parse_range
 
 class FileFinder(Tools):
     """
@@ -15,51 +17,46 @@ class FileFinder(Tools):
     def __init__(self):
         super().__init__()
         self.tag = "file_finder"
+        self.read_only = True
         self.name = "File Finder"
         self.description = "Finds files in the current directory and returns their information."
+        self.file_index = get_shared_file_index(self.work_dir)
+        self.file_reader = FileReader()
     
-    def read_file(self, file_path: str) -> str:
+    def read_arbitrary_file(self, file_path: str, file_type: str, lines: str = None, pages: str = None, byte_range: str = None) -> str:
         """
-        Reads the content of a file.
+        Reads a part of a file without loading it, the head and an outline of the file if no range is given.
         Args:
             file_path (str): The path to the file to read
+            file_type (str): The mime type of the file
+            lines (str, optional): Range of lines to read in a text file, like 200-400
+            pages (str, optional): Range of pages to read in a pdf file, like 3-5
+            byte_range (str, optional): Range of bytes to read in a text file, like 1-20000, for very long lines
         Returns:
-            str: The content of the file
-        """
-        try:
-            with open(file_path, 'r') as file:
-                return file.read()
-        except Exception as e:
-            return f"Error reading file: {e}"
-        
-    def read_arbitrary_file(self, file_path: str, file_type: str) -> str:
-        """
-        Reads the content of a file with arbitrary encoding.
-        Args:
-            file_path (str): The path to the file to read
-        Returns:
-            str: The content of the file in markdown format
+            str: The requested part of the file, with how to read the rest
         """
         mime_type, _ = mimetypes.guess_type(file_path)
         if mime_type:
             if mime_type.startswith(('image/', 'video/', 'audio/')):
                 return "can't read file type: image, video, or audio files are not supported."
-        content_raw = self.read_file(file_path)
-        if "text" in file_type:
-            content = content_raw
-        elif "pdf" in file_type:
-            from pypdf import PdfReader
-            reader = PdfReader(file_path)
-            content = '\n'.join([pt.extract_text() for pt in reader.pages])
-        elif "binary" in file_type:
-            content = content_raw.decode('utf-8', errors='replace')
-        else:
-            content = content_raw
-        return content
+        try:
+            if "pdf" in file_type:
+                if pages is not None and parse_range(pages) is None:
+                    return f"Error: invalid pages range {pages}, use pages=<start>-<end>"
+                return self.file_reader.read_pdf(file_path, parse_range(pages))
+            if byte_range is not None:
+                if parse_range(byte_range) is None:
+                    return f"Error: invalid bytes range {byte_range}, use bytes=<start>-<end>"
+                return self.file_reader.read_bytes(file_path, parse_range(byte_range))
+            if lines is not None and parse_range(lines) is None:
+                return f"Error: invalid lines range {lines}, use lines=<start>-<end>"
+            return self.file_reader.read_text(file_path, parse_range(lines))
+        except Exception as e:
+            return f"Error reading file: {e}"
     
     def get_file_info(self, file_path: str) -> str:
         """
-        Gets information about a file, including its name, path, type, content, and permissions.
+        Gets information about a file, including its name, path, type, size, and permissions.
         Args:
             file_path (str): The path to the file
         Returns:
@@ -70,13 +67,12 @@ class FileFinder(Tools):
             permissions = oct(stat.S_IMODE(stats.st_mode))
             file_type, _ = mimetypes.guess_type(file_path)
             file_type = file_type if file_type else "Unknown"
-            content = self.read_arbitrary_file(file_path, file_type)
             
             result = {
                 "filename": os.path.basename(file_path),
                 "path": file_path,
                 "type": file_type,
-                "read": content,
+                "size": stats.st_size,
                 "permissions": permissions
             }
             return result
@@ -85,26 +81,26 @@ class FileFinder(Tools):
     
     def recursive_search(self, directory_path: str, filename: str) -> str:
         """
-        Recursively searches for files in a directory and its subdirectories.
+        Searches for a file in a directory and its subdirectories, using the file index of the directory.
+        Exact names come first, then names starting with the filename, then names containing it.
         Args:
             directory_path (str): The directory to search in
             filename (str): The filename to search for
         Returns:
             str | None: The path to the file if found, None otherwise
         """
-        file_path = None
-        excluded_files = [".pyc", ".o", ".so", ".a", ".lib", ".dll", ".dylib", ".so", ".git"]
-        for root, dirs, files in os.walk(directory_path):
-            for f in files:
-                if f is None:
-                    continue
-                if any(excluded_file in f for excluded_file in excluded_files):
-                    continue
-                if filename.strip() in f.strip():
-                    file_path = os.path.join(root, f)
-                    return file_path
-        return None
-        
+        index = self.file_index if os.path.abspath(directory_path) == self.file_index.root else get_shared_file_index(directory_path)
+        matches = index.search(filename, limit=1)
+        return matches[0] if matches else None
+
+    def suggest_files(self, filename: str) -> str:
+        """
+        Suggest files with a close name, for typos in the filename.
+        """
+        suggestions = self.file_index.fuzzy_search(filename, limit=3)
+        if not suggestions:
+            return ""
+        return " Similar files: " + ", ".join(os.path.relpath(path, self.work_dir) for path in suggestions)
 
     def execute(self, blocks: list, safety:bool = False) -> str:
         """
@@ -126,17 +122,20 @@ class FileFinder(Tools):
                 return output
             if action is None:
                 action = "info"
-            print("File finder: recursive search started...")
             file_path = self.recursive_search(self.work_dir, filename)
             if file_path is None:
-                output = f"File: {filename} - not found\n"
+                output = f"File: {filename} - not found.{self.suggest_files(filename)}\n"
                 continue
             result = self.get_file_info(file_path)
             if "error" in result:
                 output += f"File: {result['filename']} - {result['error']}\n"
             else:
                 if action == "read":
-                    output += "Content:\n" + result['read'] + "\n"
+                    content = self.read_arbitrary_file(file_path, result['type'],
+                                                       lines=self.get_parameter_value(block, "lines"),
+                                                       pages=self.get_parameter_value(block, "pages"),
+                                                       byte_range=self.get_parameter_value(block, "bytes"))
+                    output += "Content:\n" + content + "\n"
                 else:
                     output += (f"File: {result['filename']}, "
                               f"found at {result['path']}, "
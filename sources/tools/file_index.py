@@ -0,0 +1,287 @@
+import os
+import sys
+import json
+import time
+import bisect
+import difflib
+import hashlib
+import threading
+from typing import List, Tuple
+
+if __name__ == "__main__": # if running as a script for individual testing
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sources.logger import Logger
+
+EXCLUDED_FILES = [".pyc", ".o", ".so", ".a", ".lib", ".dll", ".dylib", ".git"]
+EXCLUDED_DIRS = {".git", "__pycache__"}
+
+def fuzzy_score(query: str, name: str) -> float:
+    """
+    Score how well the letters of the query appear in order in the name, 0 if they don't.
+    Consecutive letters and letters at the start of the name score higher.
+    """
+    score = 0.0
+    position = 0
+    previous = -2
+    for char in query:
+        found = name.find(char, position)
+        if found == -1:
+            return 0.0
+        score += 1.0 if found == previous + 1 else 0.5
+        if found == 0:
+            score += 0.5
+        previous = found
+        position = found + 1
+    return score / (len(query) + 0.1 * (len(name) - len(query)))
+
+def find_all(text: str, offsets: List[int], needle: str) -> List[int]:
+    """Indexes of the lines of text (starting at offsets) containing the needle."""
+    found = []
+    position = text.find(needle)
+    while position != -1:
+        line = bisect.bisect_right(offsets, position) - 1
+        found.append(line)
+        position = text.find(needle, offsets[line + 1] if line + 1 < len(offsets) else len(text))
+    return found
+
+class FileIndex:
+    """
+    Index of the file names under a folder, saved to disk and updated with mtime scans.
+    A folder is listed again only when its mtime changed, the other folders are only stat'ed.
+    """
+    def __init__(self, root: str, index_path: str = None, rescan_interval: float = 5.0):
+        """
+        Args:
+            root (str): The folder to index.
+            index_path (str, optional): Where the index is saved, default to .file_index in the working directory.
+            rescan_interval (float): Seconds after which a lookup refreshes the index in the background, a miss always rescans.
+        """
+        self.logger = Logger("file_index.log")
+        self.root = os.path.abspath(root)
+        if index_path is None:
+            name = hashlib.sha256(self.root.encode('utf-8')).hexdigest()[:16] + ".json"
+            index_path = os.path.join(os.getcwd(), ".file_index", name)
+        self.index_path = index_path
+        self.rescan_interval = rescan_interval
+        self.dirs = {} # relative folder -> {"mtime": ..., "files": [...], "dirs": [...]}
+        self.names = [] # sorted (lowercase name, relative path) for prefix lookups
+        self.texts = self.build_texts([]) # names and paths joined by lines for substring lookups
+        self.last_scan = 0.0
+        self.lock = threading.Lock()
+        self.scan_lock = threading.Lock()
+        self.ready = threading.Event()
+        self.refreshing = False
+        self.load()
+
+    def load(self) -> None:
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            self.logger.warning(f"Could not load file index, rebuilding it: {str(e)}")
+            return
+        if data.get("root") != self.root:
+            return
+        self.dirs = data.get("dirs", {})
+        self.names = self.build_names(self.dirs)
+        self.texts = self.build_texts(self.names)
+        self.ready.set()
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"root": self.root, "dirs": self.dirs}, f)
+        os.replace(tmp_path, self.index_path)
+
+    def build_names(self, dirs: dict) -> List[Tuple[str, str]]:
+        names = []
+        for rel_dir, entry in dirs.items():
+            for name in entry["files"]:
+                names.append((name.lower(), os.path.join(rel_dir, name) if rel_dir else name))
+        names.sort()
+        return names
+
+    def build_texts(self, names: List[Tuple[str, str]]) -> dict:
+        texts = {}
+        for key, values in (("name", [name for name, _ in names]), ("path", [path.lower() for _, path in names])):
+            offsets = []
+            position = 0
+            for value in values:
+                offsets.append(position)
+                position += len(value) + 1
+            texts[key] = ("\n".join(values), offsets)
+        return texts
+
+    def scan(self) -> int:
+        """
+        Update the index from the disk, only the folders whose mtime changed are listed.
+        Returns:
+            int: The number of folders listed.
+        """
+        with self.scan_lock:
+            start = time.time()
+            old_dirs = self.dirs
+            dirs = {}
+            listed = 0
+            stack = [""]
+            while stack:
+                rel_dir = stack.pop()
+                path = os.path.join(self.root, rel_dir) if rel_dir else self.root
+                try:
+                    mtime = os.stat(path).st_mtime_ns
+                except OSError:
+                    continue
+                entry = old_dirs.get(rel_dir)
+                if entry is None or entry["mtime"] != mtime:
+                    entry = {"mtime": mtime, "files": [], "dirs": []}
+                    listed += 1
+                    try:
+                        with os.scandir(path) as it:
+                            for item in it:
+                                try:
+                                    if item.is_dir(follow_symlinks=False):
+                                        if item.name not in EXCLUDED_DIRS:
+                                            entry["dirs"].append(item.name)
+                                    elif not any(excluded in item.name for excluded in EXCLUDED_FILES):
+                                        entry["files"].append(item.name)
+                                except OSError:
+                                    continue
+                    except OSError:
+                        continue
+                dirs[rel_dir] = entry
+                stack.extend(os.path.join(rel_dir, name) if rel_dir else name for name in entry["dirs"])
+            changed = listed or len(dirs) != len(old_dirs)
+            names = self.build_names(dirs) if changed else self.names
+            texts = self.build_texts(names) if changed else self.texts
+            with self.lock:
+                self.dirs = dirs
+                self.names = names
+                self.texts = texts
+                self.last_scan = time.time()
+            if changed:
+                try:
+                    self.save()
+                except OSError as e:
+                    self.logger.warning(f"Could not save file index: {str(e)}")
+            self.ready.set()
+            self.logger.info(f"Scanned {len(dirs)} folders ({listed} listed) in {time.time() - start:.2f}s, {len(names)} files.")
+            return listed
+
+    def start(self) -> None:
+        """Build or refresh the index in the background."""
+        with self.lock:
+            if self.refreshing:
+                return
+            self.refreshing = True
+        def run():
+            try:
+                self.scan()
+            except Exception as e:
+                self.logger.error(f"File index scan failed: {str(e)}")
+            finally:
+                self.refreshing = False
+                self.ready.set()
+        threading.Thread(target=run, daemon=True).start()
+
+    def is_stale(self) -> bool:
+        return time.time() - self.last_scan > self.rescan_interval
+
+    def match(self, query: str, limit: int) -> List[str]:
+        """Exact, prefix then substring matches of the query on the file names (or paths if the query has a folder)."""
+        query = query.strip()
+        lowered = query.lower()
+        with self.lock:
+            names, texts = self.names, self.texts
+        if os.sep in query or "/" in query:
+            lowered = lowered.replace("/", os.sep)
+            text, offsets = texts["path"]
+            matches = [(0 if names[i][1].lower().endswith(lowered) else 2, names[i][1]) for i in set(find_all(text, offsets, lowered))]
+        else:
+            matches = []
+            start = bisect.bisect_left(names, (lowered, ""))
+            for name, path in names[start:]:
+                if not name.startswith(lowered):
+                    break
+                matches.append((0 if name == lowered else 1, path))
+            text, offsets = texts["name"]
+            matches += [(2, names[i][1]) for i in set(find_all(text, offsets, lowered)) if not names[i][0].startswith(lowered)]
+        matches.sort(key=lambda match: (match[0], os.path.basename(match[1]) != query, match[1].count(os.sep), match[1]))
+        return [path for _, path in matches[:limit]]
+
+    def wait_ready(self) -> None:
+        if not self.ready.is_set():
+            self.scan() # waits for the background build if it is running
+
+    def search(self, query: str, limit: int = 10) -> List[str]:
+        """
+        Find files by name, best matches first.
+        Args:
+            query (str): A file name, a part of it or a path ending.
+            limit (int): Maximum number of results.
+        Returns:
+            List[str]: Absolute paths of the matching files.
+        """
+        self.wait_ready()
+        matches = self.match(query, limit)
+        if not matches:
+            self.scan() # the file may be new, an incremental scan is cheap
+            matches = self.match(query, limit)
+        elif self.is_stale():
+            self.start()
+        return [os.path.join(self.root, path) for path in matches]
+
+    def fuzzy_search(self, query: str, limit: int = 5) -> List[str]:
+        """Find files with a name close to the query: abbreviations (letters in order) and typos."""
+        self.wait_ready()
+        lowered = query.strip().lower()
+        with self.lock:
+            names = self.names
+        scored = {}
+        for name, path in names:
+            score = fuzzy_score(lowered, name)
+            if score >= 0.5:
+                scored[path] = score
+        paths_by_name = {}
+        for name, path in names:
+            paths_by_name.setdefault(name, []).append(path)
+        for name in difflib.get_close_matches(lowered, paths_by_name.keys(), n=limit, cutoff=0.75):
+            ratio = difflib.SequenceMatcher(None, lowered, name).ratio()
+            for path in paths_by_name[name]:
+                scored[path] = max(scored.get(path, 0.0), ratio)
+        ranked = sorted(scored, key=lambda path: (-scored[path], path))
+        return [os.path.join(self.root, path) for path in ranked[:limit]]
+
+    def list_files(self) -> List[str]:
+        """Relative paths of all the indexed files."""
+        self.wait_ready()
+        with self.lock:
+            return [path for _, path in self.names]
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            return {"folders": len(self.dirs), "files": len(self.names), "last_scan": self.last_scan}
+
+shared_indexes = {}
+shared_indexes_lock = threading.Lock()
+
+def get_shared_file_index(root: str) -> FileIndex:
+    """Get the file index of a folder, shared by the file finders of all agents, its build starts in the background."""
+    root = os.path.abspath(root)
+    with shared_indexes_lock:
+        if root not in shared_indexes:
+            shared_indexes[root] = FileIndex(root)
+            shared_indexes[root].start()
+        return shared_indexes[root]
+
+if __name__ == "__main__":
+    index = FileIndex(sys.argv[1] if len(sys.argv) > 1 else os.getcwd())
+    start = time.time()
+    index.scan()
+    print(f"Built in {time.time() - start:.2f}s:", index.get_stats())
+    for query in ["tools.py", "agent", "src/agents/agent.py", "brwsr"]:
+        start = time.time()
+        print(query, index.search(query, limit=3) or index.fuzzy_search(query, limit=3), f"{(time.time() - start) * 1000:.1f}ms")
@@ -0,0 +1,245 @@
+import os
+import re
+import sys
+from typing import List, Tuple
+
+if __name__ == "__main__": # if running as a script for individual testing
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+CHUNK_BYTES = 1024 * 1024
+OUTLINE_LINE_BYTES = 1024 # only the start of a line is matched against the outline pattern
+OUTLINE_PATTERN = re.compile(r"^ {0,4}(#{1,6} |(async )?def |class |function |func |fn |struct |interface |impl |public |export |<h[1-6])")
+
+def parse_range(value: str) -> Tuple[int, int | None] | None:
+    """
+    Parse a 1-based inclusive range like 10-50, 10- or 10.
+    Returns:
+        Tuple[int, int | None] | None: The start and end (None for the end of the file), None if invalid.
+    """
+    if value is None:
+        return None
+    match = re.fullmatch(r"\s*(\d+)\s*(-\s*(\d*)\s*)?", value)
+    if match is None:
+        return None
+    start = max(int(match.group(1)), 1)
+    if match.group(2) is None:
+        return start, start
+    end = int(match.group(3)) if match.group(3) else None
+    if end is not None and end < start:
+        return None
+    return start, end
+
+def iter_line_heads(f, limit: int):
+    """
+    Yield the first limit bytes of each line of a binary file, the rest of a longer line is skipped by chunks.
+    A file of a single huge line is never loaded at once.
+    """
+    while head := f.readline(limit):
+        rest = head
+        while rest and not rest.endswith(b"\n"):
+            rest = f.readline(CHUNK_BYTES)
+        yield head
+
+class FileReader:
+    """
+    Read large files by range without loading them: text by lines (or bytes for very long lines), PDF by pages.
+    A first read returns the head of the file and an outline, the other ranges are asked for after.
+    """
+    def __init__(self, head_lines: int = 100, head_pages: int = 2, max_lines: int = 400, max_pages: int = 10, max_chars: int = 20000):
+        """
+        Args:
+            head_lines (int): Lines returned by a read without range.
+            head_pages (int): PDF pages returned by a read without range.
+            max_lines (int): Maximum lines returned at once.
+            max_pages (int): Maximum PDF pages returned at once.
+            max_chars (int): Maximum characters returned at once, whatever the range.
+        """
+        self.head_lines = head_lines
+        self.head_pages = head_pages
+        self.max_lines = max_lines
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+
+    def count_lines(self, path: str) -> int:
+        """Count the lines of a file by chunks."""
+        lines = 0
+        last = b"\n"
+        with open(path, 'rb') as f:
+            while chunk := f.read(CHUNK_BYTES):
+                lines += chunk.count(b"\n")
+                last = chunk[-1:]
+        return lines + (0 if last == b"\n" else 1)
+
+    def line_offset(self, path: str, line: int) -> int | None:
+        """Byte offset of the start of a 1-based line, found by chunks, None if the file is shorter."""
+        if line <= 1:
+            return 0
+        remaining = line - 1
+        offset = 0
+        with open(path, 'rb') as f:
+            while chunk := f.read(CHUNK_BYTES):
+                count = chunk.count(b"\n")
+                if count < remaining:
+                    remaining -= count
+                    offset += len(chunk)
+                    continue
+                position = -1
+                for _ in range(remaining):
+                    position = chunk.index(b"\n", position + 1)
+                return offset + position + 1
+        return None
+
+    def read_lines(self, path: str, start: int, end: int) -> Tuple[List[str], int | None]:
+        """
+        Read the lines start to end (1-based, inclusive) of a text file, a line is read up to the max_chars left.
+        Returns:
+            Tuple[List[str], int | None]: The lines and the byte offset where they were cut by max_chars, None if not cut.
+        """
+        offset = self.line_offset(path, start)
+        if offset is None:
+            return [], None
+        lines = []
+        size = 0
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            while len(lines) < end - start + 1:
+                budget = max(self.max_chars - size, 0)
+                raw = f.readline(budget + 1)
+                if not raw:
+                    break
+                if len(raw) > budget and not raw.endswith(b"\n"):
+                    lines.append(raw[:budget].decode('utf-8', errors='replace'))
+                    return lines, f.tell() - len(raw) + budget
+                line = raw.decode('utf-8', errors='replace').rstrip("\r\n")
+                size += len(line) + 1
+                lines.append(line)
+        return lines, None
+
+    def text_outline(self, path: str, max_entries: int = 40) -> List[Tuple[int, str]]:
+        """Headings and definitions of a text file with their line number."""
+        outline = []
+        with open(path, 'rb') as f:
+            for number, head in enumerate(iter_line_heads(f, OUTLINE_LINE_BYTES), start=1):
+                line = head.decode('utf-8', errors='replace')
+                if OUTLINE_PATTERN.match(line):
+                    outline.append((number, line.strip()[:100]))
+                    if len(outline) >= max_entries:
+                        break
+        return outline
+
+    def read_bytes(self, path: str, byte_range: Tuple[int, int | None]) -> str:
+        """
+        Read a range of bytes of a text file, for lines too long to be read by lines.
+        Args:
+            path (str): The file.
+            byte_range (Tuple[int, int | None]): The 1-based inclusive range of bytes.
+        Returns:
+            str: The text with a header telling which part of the file it is.
+        """
+        total = os.path.getsize(path)
+        name = os.path.basename(path)
+        if total == 0:
+            return f"Content of {name}: the file is empty."
+        start, end = byte_range
+        end = min(end or total, start + self.max_chars - 1, total)
+        if start > total:
+            return f"Error: {name} has only {total} bytes."
+        with open(path, 'rb') as f:
+            f.seek(start - 1)
+            content = f.read(end - start + 1).decode('utf-8', errors='replace')
+        output = f"Content of {name} (bytes {start}-{end} of {total}):\n" + content + "\n"
+        if end < total:
+            output += f"\n[The file continues, to read more use action=read with bytes=<start>-<end>, at most {self.max_chars} bytes at once.]"
+        return output
+
+    def read_text(self, path: str, lines: Tuple[int, int | None] = None) -> str:
+        """
+        Read a range of lines of a text file, the head and the outline if no range is given.
+        Args:
+            path (str): The file.
+            lines (Tuple[int, int | None], optional): The 1-based inclusive range of lines.
+        Returns:
+            str: The lines with a header telling which part of the file it is.
+        """
+        total = self.count_lines(path)
+        name = os.path.basename(path)
+        if total == 0:
+            return f"Content of {name}: the file is empty."
+        start, end = lines if lines else (1, self.head_lines)
+        end = min(end or total, start + self.max_lines - 1, total)
+        if start > total:
+            return f"Error: {name} has only {total} lines."
+        content, cut = self.read_lines(path, start, end)
+        end = start + len(content) - 1
+        output = f"Content of {name} (lines {start}-{end} of {total}):\n" + "\n".join(content) + "\n"
+        if lines is None and end < total:
+            outline = self.text_outline(path)
+            if outline:
+                output += "\nOutline:\n" + "\n".join(f"  line {number}: {title}" for number, title in outline) + "\n"
+        if cut is not None:
+            output += f"\n[Line {end} is too long and was cut, to read the rest use action=read with bytes={cut + 1}-{cut + self.max_chars}.]"
+        if cut is not None or end < total:
+            output += f"\n[The file continues, to read more use action=read with lines=<start>-<end>, at most {self.max_lines} lines at once.]"
+        return output
+
+    def pdf_outline(self, reader, max_entries: int = 40) -> List[Tuple[int, str]]:
+        """Bookmarks of a PDF with their 1-based page."""
+        outline = []
+        def walk(items):
+            for item in items:
+                if len(outline) >= max_entries:
+                    return
+                if isinstance(item, list):
+                    walk(item)
+                    continue
+                try:
+                    outline.append((reader.get_destination_page_number(item) + 1, str(item.title)[:100]))
+                except Exception:
+                    continue
+        try:
+            walk(reader.outline)
+        except Exception:
+            pass
+        return outline
+
+    def read_pdf(self, path: str, pages: Tuple[int, int | None] = None) -> str:
+        """
+        Extract the text of a range of pages of a PDF, only these pages are parsed.
+        Args:
+            path (str): The PDF file.
+            pages (Tuple[int, int | None], optional): The 1-based inclusive range of pages, the head and outline if None.
+        Returns:
+            str: The text of the pages with a header telling which part of the file it is.
+        """
+        from pypdf import PdfReader
+        reader = PdfReader(path)
+        total = len(reader.pages)
+        name = os.path.basename(path)
+        start, end = pages if pages else (1, self.head_pages)
+        end = min(end or total, start + self.max_pages - 1, total)
+        if start > total:
+            return f"Error: {name} has only {total} pages."
+        texts = []
+        size = 0
+        cut = False
+        for number in range(start, end + 1):
+            text = reader.pages[number - 1].extract_text() or ""
+            if size + len(text) > self.max_chars:
+                texts.append(f"--- page {number} ---\n" + text[:max(self.max_chars - size, 0)])
+                end, cut = number, True
+                break
+            size += len(text)
+            texts.append(f"--- page {number} ---\n" + text)
+        output = f"Content of {name} (pages {start}-{end} of {total}):\n" + "\n".join(texts) + "\n"
+        if pages is None and end < total:
+            outline = self.pdf_outline(reader)
+            if outline:
+                output += "\nOutline:\n" + "\n".join(f"  page {number}: {title}" for number, title in outline) + "\n"
+        if cut or end < total:
+            output += f"\n[The document continues, to read more use action=read with pages=<start>-<end>, at most {self.max_pages} pages at once.]"
+        return output
+
+if __name__ == "__main__":
+    reader = FileReader(head_lines=10)
+    print(reader.read_text(os.path.abspath(__file__)))
+    print(reader.read_text(os.path.abspath(__file__), parse_range("120-125")))
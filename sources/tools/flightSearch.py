@@ -16,6 +16,7 @@ class FlightSearch(Tools):
         """
         super().__init__()
         self.tag = "flight_search"
+        self.read_only = True
         self.name = "Flight Search"
         self.description = "Search for flight information using a flight number via SerpApi."
         self.api_key = api_key or os.getenv("SERPAPI_API_KEY")
@@ -15,6 +15,7 @@ class MCP_finder(Tools):
     def __init__(self, api_key: str = None):
         super().__init__()
         self.tag = "mcp_finder"
+        self.read_only = True
         self.name = "MCP Finder"
         self.description = "Find MCP servers and their tools"
         self.base_url = "https://registry.smithery.ai"
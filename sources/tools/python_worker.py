@@ -0,0 +1,92 @@
+"""
+Python worker process of the PythonWorkerPool, started as a script.
+
+The first line on stdin configures the worker (warm imports, memory limit), each next line is a
+JSON request to run code. The code output goes to stdout as it is printed, followed by a line
+starting with the request marker and the JSON status of the run, with the number of threads
+the code left running.
+Only use the standard library: the worker runs in the work dir, outside of the project.
+"""
+
+import os
+import sys
+import json
+import importlib
+import threading
+import traceback
+
+try:
+    import resource
+except ImportError: # not available on Windows, only the wall time limit is enforced there
+    resource = None
+
+def set_memory_limit(memory_mb: int) -> None:
+    if resource is None or not memory_mb:
+        return
+    limit = memory_mb * 1024 * 1024
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ValueError, OSError):
+        pass
+
+def set_cpu_limit(seconds: int) -> None:
+    """Limit the CPU time of the next run, the limit of a process is cumulative so it is set above the time used."""
+    if resource is None or not seconds:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    soft = int(usage.ru_utime + usage.ru_stime) + 1 + seconds
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    try:
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+    except (ValueError, OSError):
+        pass
+
+def run(request: dict) -> dict:
+    try:
+        os.chdir(request.get("cwd") or os.getcwd())
+    except OSError:
+        pass
+    set_cpu_limit(request.get("cpu_time"))
+    global_vars = {
+        '__builtins__': __builtins__,
+        'os': os,
+        'sys': sys,
+        '__name__': '__main__'
+    }
+    status, error = "ok", None
+    try:
+        exec(request["code"], global_vars)
+    except SystemExit:
+        status = "exit"
+    except MemoryError:
+        status, error = "memory", "MemoryError: memory limit exceeded"
+    except BaseException as e:
+        status, error = "error", ''.join(traceback.format_exception_only(type(e), e)).strip()
+    sys.stdout, sys.stderr = sys.__stdout__, sys.__stderr__ # the code may have replaced them
+    sys.stderr.flush()
+    threads = sum(1 for thread in threading.enumerate() if thread is not threading.main_thread() and thread.is_alive())
+    return {"status": status, "error": error, "threads": threads}
+
+def main() -> None:
+    requests_stream = os.fdopen(os.dup(0), "r", encoding="utf-8")
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0) # code reading stdin must not consume the requests
+    sys.stdin = open(os.devnull, "r")
+    sys.path[0] = "" # import from the work dir, not from the tools folder
+    config = json.loads(requests_stream.readline() or "{}")
+    for module in config.get("warm_imports", []):
+        try:
+            importlib.import_module(module)
+        except Exception:
+            pass
+    set_memory_limit(config.get("memory_mb"))
+    for line in requests_stream:
+        request = json.loads(line)
+        result = run(request)
+        sys.stdout.write(request["marker"] + json.dumps(result) + "\n")
+        sys.stdout.flush()
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,14 @@
 import requests
 from bs4 import BeautifulSoup
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from contextlib import contextmanager
+import threading
+import time
+from typing import Tuple
 import os
+import sys
 
 if __name__ == "__main__": # if running as a script for individual testing
     sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
@@ -14,48 +22,130 @@ class searxSearch(Tools):
         """
         super().__init__()
         self.tag = "web_search"
+        self.read_only = True
         self.name = "searxSearch"
         self.description = "A tool for searching a SearxNG for web search"
-        self.base_url = os.getenv("SEARXNG_BASE_URL")  # Requires a SearxNG base URL
+        self.base_url = base_url or os.getenv("SEARXNG_BASE_URL")  # Requires a SearxNG base URL
         self.user_agent = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36"
         self.paywall_keywords = [
             "Member-only", "access denied", "restricted content", "404", "this page is not working"
         ]
         if not self.base_url:
             raise ValueError("SearxNG base URL must be provided either as an argument or via the SEARXNG_BASE_URL environment variable.")
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=32, pool_maxsize=32)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.link_check_workers = 16
+        self.per_host_limit = 2
+        self.link_check_bytes = 4096
+        self.link_status_ttl = 300
+        self.link_status_max_entries = 2048
+        self.link_status_cache = OrderedDict()
+        self.host_semaphores = {} # host -> [semaphore, number of checks using it], dropped when unused
+        self.link_lock = threading.Lock()
+        self.search_cache_ttl = 600
+        self.search_cache_max_entries = 256
+        self.search_cache = OrderedDict()
+        self.search_lock = threading.Lock()
+        self.json_format = None # unknown until the first search
+        self.json_retry_interval = 600
+        self.json_retry_at = 0.0 # when the JSON format is tried again after being refused
+
+    @contextmanager
+    def host_slot(self, link: str):
+        """Hold one of the per_host_limit slots of the link host while checking it."""
+        host = urlparse(link).netloc.lower()
+        with self.link_lock:
+            slot = self.host_semaphores.setdefault(host, [threading.Semaphore(self.per_host_limit), 0])
+            slot[1] += 1
+        try:
+            with slot[0]:
+                yield
+        finally:
+            with self.link_lock:
+                slot[1] -= 1
+                if slot[1] == 0:
+                    del self.host_semaphores[host]
+
+    def get_cached(self, cache: OrderedDict, key: str, ttl: float):
+        """Get a value of a (value, timestamp) cache, None if missing or expired. Call with the cache lock held."""
+        cached = cache.get(key)
+        if cached is None:
+            return None
+        if time.time() - cached[1] >= ttl:
+            del cache[key]
+            return None
+        cache.move_to_end(key)
+        return cached[0]
+
+    def put_cached(self, cache: OrderedDict, key: str, value, max_entries: int) -> None:
+        """Store a value in a (value, timestamp) cache, the least recently used entries are dropped above max_entries."""
+        cache[key] = (value, time.time())
+        cache.move_to_end(key)
+        while len(cache) > max_entries:
+            cache.popitem(last=False)
+
+    def ranged_get(self, link: str, headers: dict) -> Tuple[requests.Response, str]:
+        """GET the first bytes of a page, the body is not read further even if the server ignore the Range header."""
+        ranged_headers = dict(headers, Range=f"bytes=0-{self.link_check_bytes - 1}")
+        response = self.session.get(link, headers=ranged_headers, timeout=5, stream=True)
+        content = b""
+        try:
+            for chunk in response.iter_content(chunk_size=1024):
+                content += chunk
+                if len(content) >= self.link_check_bytes:
+                    break
+        finally:
+            response.close()
+        return response, content[:self.link_check_bytes].decode(response.encoding or "utf-8", errors="ignore")
 
     def link_valid(self, link):
-        """check if a link is valid."""
-        # TODO find a better way
+        """
+        Check if a link is valid with a HEAD request, then a ranged GET of the first KB to detect paywalls.
+        Status are cached for a few minutes.
+        """
         if not link.startswith("http"):
             return "Status: Invalid URL"
-        
+        with self.link_lock:
+            cached = self.get_cached(self.link_status_cache, link, self.link_status_ttl)
+        if cached is not None:
+            return cached
+
         headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
         try:
-            response = requests.get(link, headers=headers, timeout=5)
-            status = response.status_code
+            content = ""
+            with self.host_slot(link):
+                response = self.session.head(link, headers=headers, timeout=5, allow_redirects=True)
+                if response.status_code in [200, 405, 501] or response.status_code >= 500:
+                    response, content = self.ranged_get(link, headers)
+            status = 200 if response.status_code == 206 else response.status_code
             if status == 200:
-                content = response.text.lower()
-                if any(keyword in content for keyword in self.paywall_keywords):
-                    return "Status: Possible Paywall"
-                return "Status: OK"
+                content = content.lower()
+                if any(keyword.lower() in content for keyword in self.paywall_keywords):
+                    result = "Status: Possible Paywall"
+                else:
+                    result = "Status: OK"
             elif status == 404:
-                return "Status: 404 Not Found"
+                result = "Status: 404 Not Found"
             elif status == 403:
-                return "Status: 403 Forbidden"
+                result = "Status: 403 Forbidden"
             else:
-                return f"Status: {status} {response.reason}"
+                result = f"Status: {status} {response.reason}"
         except requests.exceptions.RequestException as e:
             return f"Error: {str(e)}"
+        with self.link_lock:
+            self.put_cached(self.link_status_cache, link, result, self.link_status_max_entries)
+        return result
 
     def check_all_links(self, links):
-        """Check all links, one by one."""
-        # TODO Make it asyncromous or smth
-        statuses = []
-        for i, link in enumerate(links):
-            status = self.link_valid(link)
-            statuses.append(status)
-        return statuses
+        """Check all links concurrently, at most per_host_limit requests at a time on a same host."""
+        unique_links = list(dict.fromkeys(links))
+        if not unique_links:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.link_check_workers, len(unique_links))) as executor:
+            statuses = dict(zip(unique_links, executor.map(self.link_valid, unique_links)))
+        return [statuses[link] for link in links]
     
     def execute(self, blocks: list, safety: bool = False) -> str:
         """Executes a search query against a SearxNG instance using POST and extracts URLs and titles."""
@@ -65,10 +155,92 @@ class searxSearch(Tools):
         query = blocks[0].strip()
         if not query:
             return "Error: Empty search query provided."
+        return self.search(query)
+
+    def normalize_query(self, query: str, categories: str) -> str:
+        return f"{' '.join(query.lower().split())}|{categories}"
+
+    def search(self, query: str, categories: str = "general") -> str:
+        """
+        Search a query, results are cached for a few minutes by normalized query and categories.
+        Use the SearxNG JSON format when the instance allows it, the HTML page otherwise.
+        Args:
+            query (str): The search query.
+            categories (str): SearxNG categories.
+        Returns:
+            str: The results as "Title:...\nSnippet:...\nLink:..." blocks separated by blank lines.
+        """
+        key = self.normalize_query(query, categories)
+        with self.search_lock:
+            cached = self.get_cached(self.search_cache, key, self.search_cache_ttl)
+        if cached is not None:
+            self.logger.info(f"Search cache hit for: {query}")
+            return cached
 
         search_url = f"{self.base_url}/search"
-        headers = {
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
+        data = {
+            "q": query,
+            "categories": categories,
+            "language": "auto",
+            "time_range": "",
+            "safesearch": "0",
+            "theme": "simple",
+        }
+        try:
+            results = None
+            if self.json_format is not False or time.time() >= self.json_retry_at:
+                results = self.search_json(search_url, data)
+            if results is None:
+                results = self.search_html(search_url, data)
+        except requests.exceptions.RequestException as e:
+            raise Exception("\nSearxng search failed. did you run start_services.sh? is docker still running?") from e
+        if len(results) == 0:
+            return "No search results, web search failed."
+        output = "\n\n".join(results)  # Return results as a single string, separated by newlines
+        with self.search_lock:
+            self.put_cached(self.search_cache, key, output, self.search_cache_max_entries)
+        return output
+
+    def search_json(self, search_url: str, data: dict) -> list | None:
+        """
+        Search with format=json, return None when the instance does not allow the JSON format.
+        A refused JSON format is not tried again before json_retry_interval, the refusal may be temporary.
+        """
+        response = self.session.post(search_url, headers=self.search_headers("application/json"),
+                                     data=dict(data, format="json"), verify=False)
+        if response.status_code in [403, 406] or "json" not in response.headers.get("content-type", ""):
+            self.logger.info(f"SearxNG JSON format unavailable (status {response.status_code}), using HTML results.")
+            self.json_format = False
+            self.json_retry_at = time.time() + self.json_retry_interval
+            return None
+        response.raise_for_status()
+        self.json_format = True
+        results = []
+        for result in response.json().get("results", []):
+            if not result.get("url"):
+                continue
+            title = (result.get("title") or "No Title").strip()
+            description = (result.get("content") or "No Description").strip()
+            results.append(f"Title:{title}\nSnippet:{description}\nLink:{result['url']}")
+        return results
+
+    def search_html(self, search_url: str, data: dict) -> list:
+        response = self.session.post(search_url, headers=self.search_headers(), data=data, verify=False)
+        response.raise_for_status()
+        soup = BeautifulSoup(response.text, 'html.parser')
+        results = []
+        for article in soup.find_all('article', class_='result'):
+            url_header = article.find('a', class_='url_header')
+            if url_header:
+                url = url_header['href']
+                title = article.find('h3').text.strip() if article.find('h3') else "No Title"
+                description = article.find('p', class_='content').text.strip() if article.find('p', class_='content') else "No Description"
+                results.append(f"Title:{title}\nSnippet:{description}\nLink:{url}")
+        return results
+
+    def search_headers(self, accept: str = None) -> dict:
+        return {
+            'Accept': accept or 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
             'Accept-Language': 'en-US,en;q=0.9',
             'Cache-Control': 'no-cache',
             'Connection': 'keep-alive',
@@ -77,25 +249,6 @@ class searxSearch(Tools):
             'Upgrade-Insecure-Requests': '1',
             'User-Agent': self.user_agent
         }
-        data = f"q={query}&categories=general&language=auto&time_range=&safesearch=0&theme=simple".encode('utf-8')
-        try:
-            response = requests.post(search_url, headers=headers, data=data, verify=False)
-            response.raise_for_status()
-            html_content = response.text
-            soup = BeautifulSoup(html_content, 'html.parser')
-            results = []
-            for article in soup.find_all('article', class_='result'):
-                url_header = article.find('a', class_='url_header')
-                if url_header:
-                    url = url_header['href']
-                    title = article.find('h3').text.strip() if article.find('h3') else "No Title"
-                    description = article.find('p', class_='content').text.strip() if article.find('p', class_='content') else "No Description"
-                    results.append(f"Title:{title}\nSnippet:{description}\nLink:{url}")
-            if len(results) == 0:
-                return "No search results, web search failed."
-            return "\n\n".join(results)  # Return results as a single string, separated by newlines
-        except requests.exceptions.RequestException as e:
-            raise Exception("\nSearxng search failed. did you run start_services.sh? is docker still running?") from e
 
     def execution_failure_check(self, output: str) -> bool:
         """
@@ -26,6 +26,7 @@ if __name__ == "__main__": # if running as a script for individual testing
     sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from sources.logger import Logger
+from sources.tools.block_parser import parse_blocks
 
 class Tools():
     """
@@ -43,6 +44,8 @@ class Tools():
         self.excutable_blocks_found = False
         self.safe_mode = False
         self.allow_language_exec_bash = False
+        self.output_listener = None
+        self.read_only = False # read only tools run at the same time as the other blocks of an answer
     
     def get_work_dir(self):
         return self.work_dir
@@ -50,6 +53,14 @@ class Tools():
     def set_allow_language_exec_bash(self, value: bool) -> None:
         self.allow_language_exec_bash = value 
 
+    def set_output_listener(self, listener) -> None:
+        """Set a function called with the output of the tool as it is produced, None to remove it."""
+        self.output_listener = listener
+
+    def emit_output(self, chunk: str) -> None:
+        if self.output_listener is not None and chunk:
+            self.output_listener(chunk)
+
     def safe_get_work_dir_path(self):
         path = None
         path = os.getenv('WORK_DIR', path)
@@ -138,9 +149,9 @@ class Tools():
             str: The value of the parameter
         """
         for param_line in block.split('\n'):
-            if parameter_name in param_line:
-                param_value = param_line.split('=')[1].strip()
-                return param_value
+            key, separator, value = param_line.partition('=')
+            if separator and key.strip() == parameter_name:
+                return value.strip()
         return None
     
     def found_executable_blocks(self):
@@ -155,6 +166,7 @@ class Tools():
         """
         Extract code/query blocks from LLM-generated text and process them for execution.
         This method parses the text looking for code blocks marked with the tool's tag (e.g. ```python).
+        The text is tokenized once and shared by all the tools looking for their blocks in it.
         Args:
             llm_text (str): The raw text containing code blocks from the LLM
         Returns:
@@ -163,43 +175,18 @@ class Tools():
                 - The path the code blocks was saved to
         """
         assert self.tag != "undefined", "Tag not defined"
-        start_tag = f'```{self.tag}' 
-        end_tag = '```'
+        blocks = [block for block in parse_blocks(llm_text) if block.tag == self.tag]
+        if not blocks:
+            return None, None
         code_blocks = []
-        start_index = 0
         save_path = None
-
-        if start_tag not in llm_text:
-            return None, None
-
-        while True:
-            start_pos = llm_text.find(start_tag, start_index)
-            if start_pos == -1:
-                break
-
-            line_start = llm_text.rfind('\n', 0, start_pos)+1
-            leading_whitespace = llm_text[line_start:start_pos]
-
-            end_pos = llm_text.find(end_tag, start_pos + len(start_tag))
-            if end_pos == -1:
-                break
-            content = llm_text[start_pos + len(start_tag):end_pos]
-            lines = content.split('\n')
-            if leading_whitespace:
-                processed_lines = []
-                for line in lines:
-                    if line.startswith(leading_whitespace):
-                        processed_lines.append(line[len(leading_whitespace):])
-                    else:
-                        processed_lines.append(line)
-                content = '\n'.join(processed_lines)
-
-            if ':' in content.split('\n')[0]:
-                save_path = content.split('\n')[0].split(':')[1]
-                content = content[content.find('\n')+1:]
+        for block in blocks:
+            if not block.complete:
+                continue
+            if block.save_path is not None:
+                save_path = block.save_path
             self.excutable_blocks_found = True
-            code_blocks.append(content)
-            start_index = end_pos + len(end_tag)
+            code_blocks.append(block.content)
         self.logger.info(f"Found {len(code_blocks)} blocks to execute")
         return code_blocks, save_path
     
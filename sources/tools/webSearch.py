@@ -20,6 +20,7 @@ class webSearch(Tools):
         """
         super().__init__()
         self.tag = "web_search"
+        self.read_only = True
         self.api_key = api_key or os.getenv("SERPAPI_KEY")  # Requires a SerpApi key
         self.paywall_keywords = [
             "subscribe", "login to continue", "access denied", "restricted content", "404", "this page is not working"
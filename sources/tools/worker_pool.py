@@ -0,0 +1,258 @@
+import os
+import sys
+import json
+import uuid
+import time
+import queue
+import codecs
+import signal
+import atexit
+import threading
+import subprocess
+from typing import Callable, List
+
+if __name__ == "__main__": # if running as a script for individual testing
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sources.logger import Logger
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "python_worker.py")
+DEFAULT_WARM_IMPORTS = ["json", "math", "re", "random", "datetime", "collections", "itertools", "csv", "urllib.request"]
+SIGXCPU = getattr(signal, "SIGXCPU", None)
+
+class PythonWorker:
+    """
+    A Python process started ahead of time, running code sent over its stdin.
+    """
+    def __init__(self, cwd: str, warm_imports: List[str], memory_mb: int):
+        self.process = subprocess.Popen(
+            [sys.executable, "-u", WORKER_SCRIPT],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            cwd=cwd,
+            bufsize=0
+        )
+        self.send({"warm_imports": warm_imports, "memory_mb": memory_mb})
+        self.chunks = queue.Queue()
+        self.runs = 0
+        self.reader = threading.Thread(target=self.read_output, daemon=True)
+        self.reader.start()
+
+    def send(self, message: dict) -> None:
+        self.process.stdin.write((json.dumps(message) + "\n").encode("utf-8"))
+        self.process.stdin.flush()
+
+    def read_output(self) -> None:
+        """Read the worker output as it arrives, an empty chunk signals the worker exited."""
+        fd = self.process.stdout.fileno()
+        while True:
+            try:
+                data = os.read(fd, 65536)
+            except OSError:
+                data = b""
+            self.chunks.put(data)
+            if not data:
+                break
+
+    def is_alive(self) -> bool:
+        return self.process.poll() is None
+
+    def kill(self) -> None:
+        if self.is_alive():
+            self.process.kill()
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            pass
+
+    def drain(self) -> None:
+        """Drop the output printed since the last run (eg: by a process the code started), it belongs to no run."""
+        while True:
+            try:
+                data = self.chunks.get_nowait()
+            except queue.Empty:
+                return
+            if not data:
+                self.chunks.put(data) # the worker exited, the run will report it
+                return
+
+    def run(self, code: str, cwd: str, cpu_time: int, wall_time: float, listener: Callable = None) -> dict:
+        """
+        Run code in the worker.
+        Args:
+            code (str): The python code.
+            cwd (str): Working directory of the run.
+            cpu_time (int): CPU seconds allowed, enforced by the worker.
+            wall_time (float): Seconds allowed, the worker is killed after.
+            listener (Callable, optional): Called with the output chunks as they arrive.
+        Returns:
+            dict: status (ok, exit, error, memory, timeout, cpu, crashed), output, error and threads left running.
+        """
+        self.runs += 1
+        self.drain()
+        marker = f"\x1e{uuid.uuid4().hex}:"
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        buffer = ""
+        emitted = 0
+        deadline = time.time() + wall_time
+        self.send({"code": code, "cwd": cwd, "cpu_time": cpu_time, "marker": marker})
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                self.kill()
+                return {"status": "timeout", "output": buffer, "error": f"wall time limit of {wall_time}s exceeded", "threads": 0}
+            try:
+                data = self.chunks.get(timeout=min(remaining, 0.5))
+            except queue.Empty:
+                continue
+            if not data:
+                self.process.wait()
+                if SIGXCPU is not None and self.process.returncode == -SIGXCPU:
+                    return {"status": "cpu", "output": buffer, "error": f"CPU time limit of {cpu_time}s exceeded", "threads": 0}
+                return {"status": "crashed", "output": buffer, "error": f"the Python worker exited with code {self.process.returncode}", "threads": 0}
+            buffer += decoder.decode(data)
+            index = buffer.find(marker)
+            if index != -1 and "\n" in buffer[index:]:
+                end = buffer.index("\n", index)
+                result = json.loads(buffer[index + len(marker):end])
+                if listener is not None and index > emitted:
+                    listener(buffer[emitted:index])
+                return {"status": result["status"], "output": buffer[:index], "error": result["error"], "threads": result.get("threads", 0)}
+            safe = index if index != -1 else max(0, len(buffer) - len(marker))
+            if listener is not None and safe > emitted:
+                listener(buffer[emitted:safe])
+                emitted = safe
+
+class PythonWorkerPool:
+    """
+    Pool of Python worker processes started ahead of time with warm imports.
+    Code runs isolated from the agent process with CPU time, wall time and memory limits,
+    a worker is replaced in the background after a limit is hit, when the code left threads running or after a number of runs.
+    """
+    def __init__(self, size: int = 2,
+                       cwd: str = None,
+                       warm_imports: List[str] = None,
+                       memory_mb: int = 2048,
+                       cpu_time: int = 120,
+                       wall_time: float = 300,
+                       max_runs: int = 20):
+        """
+        Args:
+            size (int): Number of workers, the maximum number of codes running at the same time.
+            cwd (str, optional): Working directory of the workers.
+            warm_imports (List[str], optional): Modules imported by the workers when they start.
+            memory_mb (int): Address space limit of a worker, not enforced on Windows.
+            cpu_time (int): CPU seconds allowed per run, not enforced on Windows.
+            wall_time (float): Seconds allowed per run.
+            max_runs (int): Runs before a worker is replaced, as imported modules and their state persist.
+        """
+        self.logger = Logger("python_workers.log")
+        self.size = size
+        self.cwd = cwd if cwd and os.path.isdir(cwd) else os.getcwd()
+        self.warm_imports = DEFAULT_WARM_IMPORTS if warm_imports is None else warm_imports
+        self.memory_mb = memory_mb
+        self.cpu_time = cpu_time
+        self.wall_time = wall_time
+        self.max_runs = max_runs
+        self.idle = queue.Queue()
+        self.slots = threading.Semaphore(size)
+        self.workers = []
+        self.lock = threading.Lock()
+        self.closed = False
+        self.stats = {"runs": 0, "recycled": 0, "timeouts": 0}
+        for _ in range(size):
+            self.idle.put(self.create_worker())
+
+    def create_worker(self) -> PythonWorker:
+        worker = PythonWorker(self.cwd, self.warm_imports, self.memory_mb)
+        with self.lock:
+            self.workers.append(worker)
+        return worker
+
+    def replace_worker(self, worker: PythonWorker) -> None:
+        """Kill a worker and start its replacement in the background."""
+        worker.kill()
+        with self.lock:
+            if worker in self.workers:
+                self.workers.remove(worker)
+            self.stats["recycled"] += 1
+        if self.closed:
+            return
+        def start():
+            with self.lock:
+                if len(self.workers) >= self.size: # a worker was already started for a waiting run
+                    return
+            try:
+                self.idle.put(self.create_worker())
+            except Exception as e:
+                self.logger.error(f"Failed to start a Python worker: {str(e)}")
+        threading.Thread(target=start, daemon=True).start()
+
+    def acquire(self) -> PythonWorker:
+        try:
+            worker = self.idle.get_nowait()
+        except queue.Empty:
+            worker = self.create_worker() # replacement not ready yet
+        if not worker.is_alive():
+            self.replace_worker(worker)
+            worker = self.create_worker()
+        return worker
+
+    def run(self, code: str, cwd: str = None, listener: Callable = None) -> dict:
+        """
+        Run code on a free worker, wait for a worker if they are all busy.
+        Args:
+            code (str): The python code.
+            cwd (str, optional): Working directory of the run, default to the pool one.
+            listener (Callable, optional): Called with the output chunks as they arrive.
+        Returns:
+            dict: status (ok, exit, error, memory, timeout, cpu, crashed), output, error and duration.
+        """
+        with self.slots:
+            worker = self.acquire()
+            start = time.time()
+            cwd = cwd if cwd and os.path.isdir(cwd) else self.cwd
+            result = worker.run(code, cwd, self.cpu_time, self.wall_time, listener)
+            result["duration"] = time.time() - start
+            self.stats["runs"] += 1
+            if result["status"] == "timeout":
+                self.stats["timeouts"] += 1
+            if result["threads"]:
+                self.logger.info(f"Run left {result['threads']} threads running, replacing the worker so their output can't reach the next runs.")
+            if result["status"] in ("ok", "exit", "error") and not result["threads"] and worker.runs < self.max_runs and worker.is_alive():
+                self.idle.put(worker)
+            else:
+                self.replace_worker(worker)
+        self.logger.info(f"Run {result['status']} in {result['duration']:.2f}s, {len(result['output'])} characters of output.")
+        return result
+
+    def close(self) -> None:
+        self.closed = True
+        with self.lock:
+            workers = list(self.workers)
+            self.workers = []
+        for worker in workers:
+            worker.kill()
+
+    def get_stats(self) -> dict:
+        return dict(self.stats)
+
+shared_pool = None
+shared_pool_lock = threading.Lock()
+
+def get_shared_pool(**kwargs) -> PythonWorkerPool:
+    """Get the pool shared by the Python interpreters of all agents, started on first use."""
+    global shared_pool
+    with shared_pool_lock:
+        if shared_pool is None:
+            shared_pool = PythonWorkerPool(**kwargs)
+            atexit.register(shared_pool.close)
+        return shared_pool
+
+if __name__ == "__main__":
+    pool = PythonWorkerPool(size=1, wall_time=2)
+    print(pool.run("print('hello from a worker')", listener=lambda chunk: print("chunk:", repr(chunk))))
+    print(pool.run("while True: pass"))
+    print(pool.run("import os\nprint(os.getpid())"))
+    pool.close()
@@ -0,0 +1,29 @@
+// Collect the buttons and submit inputs with their text, visibility and state in a single call
+// The index match the position in the (//button | //input[@type='submit']) xpath
+function findButtons() {
+    const result = [];
+    const snapshot = document.evaluate("(//button | //input[@type='submit'])", document, null,
+                                       XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    for (let i = 0; i < snapshot.snapshotLength; i++) {
+        const button = snapshot.snapshotItem(i);
+        result.push({
+            index: i + 1,
+            text: (button.innerText || '').trim() || button.value || '',
+            displayed: isElementDisplayed(button),
+            enabled: !button.disabled
+        });
+    }
+    return result;
+}
+
+function isElementDisplayed(element) {
+    if (element.getClientRects().length === 0) {
+        return false;
+    }
+    const style = window.getComputedStyle(element);
+    if (style.display === 'none' || style.visibility === 'hidden' || style.opacity === '0') {
+        return false;
+    }
+    return true;
+}
+return findButtons();
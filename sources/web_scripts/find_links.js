@@ -0,0 +1,30 @@
+// Collect every http(s) link of the page with its text and visibility in a single call
+function findLinks() {
+    const result = [];
+    const anchors = document.getElementsByTagName('a');
+    for (let i = 0; i < anchors.length; i++) {
+        const anchor = anchors[i];
+        const href = anchor.href;
+        if (typeof href !== 'string' || !href.startsWith('http')) {
+            continue;
+        }
+        result.push({
+            url: href,
+            text: (anchor.innerText || '').trim(),
+            is_displayed: isElementDisplayed(anchor)
+        });
+    }
+    return result;
+}
+
+function isElementDisplayed(element) {
+    if (element.getClientRects().length === 0) {
+        return false;
+    }
+    const style = window.getComputedStyle(element);
+    if (style.display === 'none' || style.visibility === 'hidden' || style.opacity === '0') {
+        return false;
+    }
+    return true;
+}
+return findLinks();
@@ -0,0 +1,129 @@
+"""
+Local stub of a SearxNG instance for offline tests.
+
+Answer POST/GET /search with fixed results, as JSON when format=json is requested
+and allowed, as the HTML result page of the simple theme otherwise.
+Also serve the pages used by the link checks: /ok, /paywall, /nohead (refuse HEAD),
+any other path is a 404.
+
+Run it standalone with:
+    python tests/searxng_stub.py --port 8080 [--no-json]
+"""
+
+import json
+import argparse
+import threading
+from urllib.parse import parse_qs, urlparse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+STUB_PAGES = {
+    "/ok": "<html><body>A normal article.</body></html>",
+    "/paywall": "<html><body>Member-only story</body></html>" + " " * 10000,
+    "/nohead": "<html><body>Fine page.</body></html>",
+}
+
+STUB_RESULTS = [
+    {"url": "https://example.com/article", "title": "Example article", "content": "An article about the query."},
+    {"url": "https://example.org/guide", "title": "Example guide", "content": "A guide explaining the topic."},
+    {"url": "https://example.net/forum", "title": "Forum thread", "content": "People discussing the topic."},
+]
+
+class SearxStubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1" # keep-alive, so the client session reuse its connection
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_HEAD(self):
+        self.handle_page(with_body=False)
+
+    def do_GET(self):
+        if urlparse(self.path).path != "/search":
+            return self.handle_page(with_body=True)
+        self.handle_search(parse_qs(urlparse(self.path).query))
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.handle_search(parse_qs(self.rfile.read(length).decode("utf-8")))
+
+    def handle_search(self, params: dict):
+        server = self.server
+        if urlparse(self.path).path != "/search":
+            return self.reply(404, "text/plain", b"not found")
+        query = params.get("q", [""])[0]
+        with server.lock:
+            server.queries.append(query)
+            server.connections.add(self.client_address)
+        results = [] if "nothing" in query else STUB_RESULTS
+        if params.get("format", ["html"])[0] == "json":
+            if not server.allow_json:
+                return self.reply(403, "text/html", b"<html><body>403 Forbidden</body></html>")
+            body = json.dumps({"query": query, "results": results}).encode("utf-8")
+            return self.reply(200, "application/json", body)
+        articles = "".join(
+            f'<article class="result"><a class="url_header" href="{r["url"]}">{r["url"]}</a>'
+            f'<h3><a href="{r["url"]}">{r["title"]}</a></h3><p class="content">{r["content"]}</p></article>'
+            for r in results
+        )
+        return self.reply(200, "text/html; charset=utf-8", f"<html><body><main>{articles}</main></body></html>".encode("utf-8"))
+
+    def handle_page(self, with_body: bool):
+        with self.server.lock:
+            self.server.page_requests += 1
+        if self.path == "/nohead" and not with_body:
+            return self.reply(405, "text/html", b"", with_body=False)
+        if self.path not in STUB_PAGES:
+            return self.reply(404, "text/html", b"not found", with_body=with_body)
+        return self.reply(200, "text/html; charset=utf-8", STUB_PAGES[self.path].encode("utf-8"), with_body=with_body)
+
+    def reply(self, status: int, content_type: str, body: bytes, with_body: bool = True):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if with_body:
+            self.wfile.write(body)
+
+class SearxStub:
+    """Run the stub in a background thread."""
+    def __init__(self, allow_json: bool = True, port: int = 0):
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), SearxStubHandler)
+        self.server.allow_json = allow_json
+        self.server.queries = []
+        self.server.connections = set()
+        self.server.page_requests = 0
+        self.server.lock = threading.Lock()
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    @property
+    def queries(self) -> list:
+        return self.server.queries
+
+    @property
+    def connections(self) -> set:
+        return self.server.connections
+
+    @property
+    def page_requests(self) -> int:
+        return self.server.page_requests
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stub SearxNG server for offline tests.")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--no-json", action="store_true", help="Refuse the JSON format like a default SearxNG.")
+    args = parser.parse_args()
+    stub = SearxStub(allow_json=not args.no_json, port=args.port)
+    print(f"SearxNG stub listening on {stub.url}")
+    stub.server.serve_forever()
@@ -0,0 +1,86 @@
+import unittest
+import os
+import sys
+import time
+import asyncio
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sources.agents.agent import Agent
+from sources.tools.tools import Tools
+
+class FakeMemory:
+    def __init__(self):
+        self.pushed = []
+
+    def push(self, role: str, content: str) -> None:
+        self.pushed.append((role, content))
+
+class FakeTool(Tools):
+    """Tool taking some time per block, failing the blocks containing fail and recording when they ran."""
+    def __init__(self, tag: str, read_only: bool, log: list):
+        super().__init__()
+        self.tag = tag
+        self.read_only = read_only
+        self.log = log
+
+    def execute(self, blocks: list, safety=False) -> str:
+        block = blocks[0].strip()
+        self.log.append(("start", block))
+        self.emit_output(f"{block} running\n")
+        time.sleep(0.05)
+        self.log.append(("end", block))
+        return f"error in {block}" if "fail" in block else f"ok {block}"
+
+    def execution_failure_check(self, output: str) -> bool:
+        return output.startswith("error")
+
+    def interpreter_feedback(self, output: str) -> str:
+        return output
+
+class FakeAgent(Agent):
+    async def process(self, prompt, speech_module) -> str:
+        return ""
+
+class TestExecuteModules(unittest.TestCase):
+    """
+    Test suite for the scheduling of the blocks of an answer on the tool executor.
+    """
+
+    def setUp(self):
+        self.log = []
+        self.agent = FakeAgent("Agent", "prompt.txt", None)
+        self.agent.memory = FakeMemory()
+        # bash comes first in the tools, the blocks must still run in the order of the answer
+        self.agent.tools = {"bash": FakeTool("bash", False, self.log), "file_finder": FakeTool("file_finder", True, self.log)}
+
+    def tearDown(self):
+        self.agent.tool_executor.shutdown(wait=True)
+
+    def execute(self, answer: str) -> tuple:
+        return asyncio.run(self.agent.execute_modules(answer))
+
+    def test_change_waits_for_earlier_reads(self):
+        """Test that a block changing things waits for the reads before it, and reads after it wait for it."""
+        answer = "Run:\n```file_finder\nread notes\n```\n```file_finder\nread todo\n```\n```bash\nrm notes\n```\n```file_finder\nread log\n```"
+        self.assertEqual(self.execute(answer), (True, "ok read log"))
+        self.assertEqual(set(self.log[:2]), {("start", "read notes"), ("start", "read todo")})
+        self.assertGreater(self.log.index(("start", "rm notes")), self.log.index(("end", "read todo")))
+        self.assertGreater(self.log.index(("start", "read log")), self.log.index(("end", "rm notes")))
+        self.assertEqual([result.block.strip() for result in self.agent.blocks_result], ["read notes", "read todo", "rm notes", "read log"])
+
+    def test_change_skipped_after_failed_read(self):
+        """Test that a block changing things does not run when a read before it failed."""
+        answer = "Run:\n```file_finder\nfail notes\n```\n```bash\nrm notes\n```"
+        self.assertEqual(self.execute(answer), (False, "error in fail notes"))
+        self.assertNotIn(("start", "rm notes"), self.log)
+        self.assertFalse(self.agent.get_success)
+
+    def test_outputs_are_kept_per_block(self):
+        """Test that the output of blocks running at the same time is not mixed."""
+        answer = "Run:\n```file_finder\nread a\n```\n```file_finder\nread b\n```"
+        self.execute(answer)
+        self.assertEqual(self.agent.tool_outputs, {"file_finder block 1": "read a running\n", "file_finder block 2": "read b running\n"})
+        self.assertIn("[file_finder block 2]\nread b running", self.agent.tool_output)
+
+if __name__ == '__main__':
+    unittest.main()
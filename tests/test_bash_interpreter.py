@@ -0,0 +1,60 @@
+import unittest
+import os
+import sys
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sources.tools.BashInterpreter import BashInterpreter, OutputBuffer
+
+class TestOutputBuffer(unittest.TestCase):
+    """
+    Test suite for the head and tail truncation of command outputs.
+    """
+
+    def test_small_output_is_kept(self):
+        buffer = OutputBuffer(head_chars=10, tail_chars=10)
+        buffer.append("hello ")
+        buffer.append("world")
+        self.assertEqual(buffer.text(), "hello world")
+
+    def test_middle_of_large_output_is_dropped(self):
+        buffer = OutputBuffer(head_chars=5, tail_chars=5)
+        for i in range(10):
+            buffer.append(f"{i}" * 10)
+        self.assertEqual(buffer.truncated(), 90)
+        self.assertEqual(buffer.text(), "00000\n... [90 characters truncated] ...\n99999")
+
+@unittest.skipIf(os.name == "nt", "commands use a POSIX shell")
+class TestBashInterpreter(unittest.TestCase):
+    """
+    Test suite for the streamed execution of bash commands.
+    """
+
+    def setUp(self):
+        self.bash = BashInterpreter()
+        self.chunks = []
+        self.bash.set_output_listener(self.chunks.append)
+
+    def test_output_is_streamed(self):
+        """Test that the listener receives the output before the command ends."""
+        result = self.bash.execute(["echo first; sleep 1; echo second"])
+        self.assertEqual(''.join(self.chunks), "first\nsecond\n")
+        self.assertGreaterEqual(len(self.chunks), 2)
+        self.assertIn("first\nsecond", result)
+
+    def test_timeout_while_printing(self):
+        """Test that the timeout stops a command that keeps printing, with bounded output."""
+        start = time.time()
+        result = self.bash.execute(["while true; do echo spam; done"], timeout=1)
+        self.assertLess(time.time() - start, 5)
+        self.assertIn("timed out after 1s", result)
+        self.assertIn("characters truncated", result)
+        self.assertLess(len(result), 20000)
+
+    def test_failed_command(self):
+        result = self.bash.execute(["echo oops; exit 3"])
+        self.assertIn("failed with return code 3", result)
+        self.assertIn("oops", result)
+
+if __name__ == '__main__':
+    unittest.main()
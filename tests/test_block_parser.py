@@ -0,0 +1,66 @@
+import unittest
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sources.tools.block_parser import BlockTokenizer, parse_blocks
+
+class TestBlockParser(unittest.TestCase):
+    """
+    Test suite for the single pass tokenizer of the fenced blocks of LLM answers.
+    """
+
+    def setUp(self):
+        self.answer = """I will list the files then run the script:
+```bash
+ls -la
+```
+    ```python:tmp.py
+    for i in range(3):
+        print(i)
+    ```
+Done."""
+
+    def test_parse_blocks_tags_and_save_path(self):
+        """Test that all blocks are found in one scan with their tag, save path and dedented content."""
+        blocks = parse_blocks(self.answer)
+        self.assertEqual([block.tag for block in blocks], ["bash", "python"])
+        self.assertEqual(blocks[0].content, "\nls -la\n")
+        self.assertIsNone(blocks[0].save_path)
+        self.assertEqual(blocks[1].save_path, "tmp.py")
+        self.assertEqual(blocks[1].content, "for i in range(3):\n    print(i)\n")
+        self.assertTrue(all(block.complete for block in blocks))
+        self.assertIs(parse_blocks(self.answer), blocks)
+
+    def test_feed_returns_block_when_closing_fence_arrives(self):
+        """Test that a streamed block is returned as soon as its closing fence is fed, even split across chunks."""
+        tokenizer = BlockTokenizer()
+        self.assertEqual(tokenizer.feed("Run:\n``"), [])
+        self.assertEqual(tokenizer.feed("`ba"), [])
+        self.assertEqual(tokenizer.feed("sh\nls\n`"), [])
+        closed = tokenizer.feed("``\nmore text")
+        self.assertEqual(len(closed), 1)
+        self.assertEqual(closed[0].tag, "bash")
+        self.assertEqual(closed[0].content, "\nls\n")
+
+    def test_incomplete_block_and_exact_tag(self):
+        """Test that an unclosed block is reported incomplete and tags are matched as whole words."""
+        blocks = parse_blocks("```cpp\nint x;\n```\n```c\nint main() {")
+        self.assertEqual([block.tag for block in blocks], ["cpp", "c"])
+        self.assertTrue(blocks[0].complete)
+        self.assertFalse(blocks[1].complete)
+        self.assertEqual(blocks[1].content, "\nint main() {")
+
+    def test_stray_fence_in_prose(self):
+        """Test that a fence inside a sentence or without tag does not swallow the next block."""
+        text = "Use ``` to fence code.\n```python\nprint(1)\n```\n"
+        self.assertEqual([(block.tag, block.content) for block in parse_blocks(text)], [("python", "\nprint(1)\n")])
+        blocks = parse_blocks("```\nplain\n```\n```bash\nls\n```")
+        self.assertEqual([(block.tag, block.content) for block in blocks], [("bash", "\nls\n")])
+        tokenizer = BlockTokenizer()
+        self.assertEqual(tokenizer.feed("Wrap it in ``"), [])
+        self.assertEqual(tokenizer.feed("` fences.\n```py"), [])
+        self.assertEqual([block.tag for block in tokenizer.feed("thon\nx = 1\n```")], ["python"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sources.boilerplate import BoilerplateIndex
+
+def make_page(body: str) -> str:
+    return f"[Start of page]\n\nWe use cookies to improve your experience.\n\nHome  |  About\n\n{body}\n\n[End of page]"
+
+class TestBoilerplateIndex(unittest.TestCase):
+    """
+    Test suite for the removal of lines repeated across the pages of a domain.
+    """
+
+    def setUp(self):
+        self.index = BoilerplateIndex(min_pages=3, threshold=0.6, chars_per_token=4)
+
+    def test_nothing_removed_before_min_pages(self):
+        for i in range(2):
+            page = make_page(f"Article {i}")
+            self.assertEqual(self.index.filter(f"https://example.com/{i}", page), (page, 0))
+
+    def test_repeated_lines_are_removed(self):
+        """Test that lines on most pages of the domain are removed, whitespace and case aside, and markers kept."""
+        for i in range(2):
+            self.index.filter(f"https://example.com/{i}", make_page(f"Article {i}"))
+        page = make_page("Article 2").replace("Home  |  About", "home | about")
+        text, tokens = self.index.filter("https://www.example.com/2", page)
+        self.assertEqual(text, "[Start of page]\n\nArticle 2\n\n[End of page]")
+        self.assertGreater(tokens, 0)
+        self.assertEqual(self.index.get_tokens_saved(), tokens)
+
+    def test_pages_are_counted_once_per_url(self):
+        """Test that reloading the same url does not make its lines look repeated."""
+        for _ in range(5):
+            text, tokens = self.index.filter("https://example.com/a", make_page("Article a"))
+        self.assertEqual(tokens, 0)
+        self.assertEqual(len(self.index.domains["example.com"]["urls"]), 1)
+
+    def test_domains_are_separate(self):
+        for i in range(3):
+            self.index.filter(f"https://example.com/{i}", make_page(f"Article {i}"))
+        page = make_page("Other site")
+        self.assertEqual(self.index.filter("https://other.org/a", page), (page, 0))
+
+if __name__ == '__main__':
+    unittest.main()
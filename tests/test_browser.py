@@ -0,0 +1,159 @@
+import unittest
+import os
+import sys
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sources.browser import Browser, TimingPolicy, TIMING_PROFILES, get_blocked_url_patterns, apply_resource_blocking
+from sources.page_cache import PageCache
+
+class FakeDriver:
+    """Driver answering the performance entries count with a scripted sequence."""
+    def __init__(self, counts: list):
+        self.counts = counts
+        self.calls = 0
+
+    def execute_script(self, script: str):
+        count = self.counts[min(self.calls, len(self.counts) - 1)]
+        self.calls += 1
+        return count
+
+class ScriptedDriver:
+    """Driver returning the next payload to the injected scripts."""
+    def __init__(self):
+        self.window_handles = ["main"]
+        self.payload = None
+
+    def get(self, url: str) -> None:
+        pass
+
+    def execute_script(self, script: str, *args):
+        return self.payload
+
+class TestTimingPolicy(unittest.TestCase):
+    """
+    Test suite for the human-emulation timing profiles of the browser.
+    """
+
+    def test_unknown_profile(self):
+        with self.assertRaises(ValueError):
+            TimingPolicy("turbo")
+
+    def test_pauses_are_accounted(self):
+        """Test that only the pauses of the profile are slept and counted in the navigation report."""
+        policy = TimingPolicy("balanced")
+        policy.pauses = {"click": (0.01, 0.01)}
+        policy.start_navigation()
+        policy.pause("click")
+        policy.pause("scroll")
+        report = policy.end_navigation()
+        self.assertEqual(report["profile"], "balanced")
+        self.assertAlmostEqual(report["slept"], 0.01, places=3)
+        self.assertGreaterEqual(report["total"], report["slept"])
+        policy.start_navigation()
+        self.assertEqual(policy.end_navigation()["slept"], 0.0)
+
+    def test_fast_profile_never_sleeps(self):
+        policy = TimingPolicy("fast")
+        for kind in TIMING_PROFILES["stealth"]["pauses"]:
+            policy.pause(kind)
+        self.assertEqual(policy.slept, 0.0)
+        self.assertFalse(policy.human_scroll)
+
+    def test_waits_only_in_event_driven_profiles(self):
+        """Test that the stealth profile never queries the page and network idle stops once the count is stable."""
+        driver = FakeDriver([1, 2, 3, 3])
+        TimingPolicy("stealth").wait_network_idle(driver)
+        self.assertEqual(driver.calls, 0)
+        policy = TimingPolicy("fast")
+        policy.wait_network_idle(driver, idle_time=0.1, timeout=2.0)
+        self.assertGreater(driver.calls, 3)
+        self.assertLess(policy.waited, 1.0)
+
+class CdpDriver:
+    """Driver recording the CDP commands sent to it."""
+    def __init__(self, fail: bool = False):
+        self.commands = []
+        self.fail = fail
+
+    def execute_cdp_cmd(self, command: str, params: dict) -> dict:
+        if self.fail:
+            raise RuntimeError("CDP not available")
+        self.commands.append((command, params))
+        return {}
+
+class TestResourceBlocking(unittest.TestCase):
+    """
+    Test suite for the request blocking profiles of headless Chrome.
+    """
+
+    def test_profiles(self):
+        """Test that each profile blocks its categories only."""
+        self.assertEqual(get_blocked_url_patterns("none"), [])
+        trackers = get_blocked_url_patterns("trackers")
+        self.assertIn("*doubleclick.net/*", trackers)
+        self.assertNotIn("*.png", trackers)
+        text = get_blocked_url_patterns("text")
+        for pattern in ["*.png", "*.woff2", "*.mp4", "*doubleclick.net/*"]:
+            self.assertIn(pattern, text)
+        with self.assertRaises(ValueError):
+            get_blocked_url_patterns("everything")
+
+    def test_apply(self):
+        driver = CdpDriver()
+        self.assertFalse(apply_resource_blocking(driver, "none"))
+        self.assertEqual(driver.commands, [])
+        self.assertTrue(apply_resource_blocking(driver, "text"))
+        self.assertEqual(driver.commands[-1], ("Network.setBlockedURLs", {"urls": get_blocked_url_patterns("text")}))
+        self.assertFalse(apply_resource_blocking(CdpDriver(fail=True), "trackers"))
+
+class TestPageElements(unittest.TestCase):
+    """
+    Test suite for the links and buttons collected by the injected scripts.
+    """
+
+    def setUp(self):
+        self.driver = ScriptedDriver()
+        self.browser = Browser(self.driver, timing_profile="fast")
+
+    def test_buttons_xpath(self):
+        """Test that hidden or disabled buttons are dropped and the xpath index is the one of the script."""
+        self.driver.payload = [
+            {"text": "Submit order", "displayed": True, "enabled": True, "index": 1},
+            {"text": "Hidden", "displayed": False, "enabled": True, "index": 2},
+            {"text": "Disabled", "displayed": True, "enabled": False, "index": 3},
+            {"text": "Go", "displayed": True, "enabled": True, "index": 4},
+        ]
+        self.assertEqual(self.browser.get_buttons_xpath(), [
+            ("go", "(//button | //input[@type='submit'])[4]"),
+            ("submitorder", "(//button | //input[@type='submit'])[1]"),
+        ])
+
+    def test_navigable_links(self):
+        """Test that only visible page links are navigable."""
+        self.driver.payload = [
+            {"url": "https://example.com/about", "text": "About", "is_displayed": True},
+            {"url": "https://example.com/team", "text": "Team", "is_displayed": False},
+            {"url": "https://example.com/logo.png", "text": "", "is_displayed": True},
+        ]
+        self.assertEqual(self.browser.get_navigable(), ["https://example.com/about"])
+        self.driver.payload = None
+        self.assertEqual(self.browser.get_navigable(), [])
+
+class TestSharedPageCache(unittest.TestCase):
+    """
+    Test suite for the page cache shared by the browsers of the pool.
+    """
+
+    def test_browsers_share_the_cache(self):
+        """Test that a page cached by a browser is served to the others, from a single index."""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = PageCache(cache_dir=cache_dir)
+            first, second = Browser(ScriptedDriver(), page_cache=cache), Browser(ScriptedDriver(), page_cache=cache)
+            first.page_cache.put("https://example.com/", {"url": "https://example.com", "text": "Example"})
+            self.assertIs(second.page_cache, cache)
+            self.assertEqual(second.get_cached_page("https://EXAMPLE.com")["text"], "Example")
+            self.assertIsNone(Browser(ScriptedDriver()).page_cache)
+
+if __name__ == '__main__':
+    unittest.main()
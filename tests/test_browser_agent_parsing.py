@@ -1,6 +1,8 @@
 import unittest
 import os
 import sys
+import asyncio
+import threading
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  # Add project root to Python path
 from sources.agents.browser_agent import BrowserAgent
 
@@ -66,5 +68,36 @@ class TestBrowserAgentParsing(unittest.TestCase):
         self.agent.parse_answer(test_text)
         self.assertEqual(self.agent.notes[0], "Note: This is important. We are doing test it's very cool.")
 
+    def test_extract_search_queries(self):
+        # Test that only lines starting with "search:" are queries, not words ending with it like research:
+        self.agent.search_variants = 3
+        test_text = """
+        My research: the user wants recent figures.
+        search: solar panel efficiency 2025
+        - search: "perovskite cells record"
+        2. SEARCH: solar panel efficiency 2025
+        """
+        self.assertEqual(self.agent.extract_search_queries(test_text), ["solar panel efficiency 2025", "perovskite cells record"])
+        self.assertEqual(self.agent.extract_search_queries("best laptops"), ["best laptops"])
+
+    def test_select_fanout_links(self):
+        # Test that fan-out keeps up to fanout new links, without the current page, visited or duplicate links
+        self.agent.fanout = 2
+        self.agent.current_page = "https://current.com"
+        self.agent.search_history = ["https://visited.com"]
+        links = ["https://current.com", "https://a.com", "https://visited.com", "https://a.com", "https://b.com", "https://c.com"]
+        self.assertEqual(self.agent.select_fanout_links(links), ["https://a.com", "https://b.com"])
+        self.assertIn("up to 2 links", self.agent.fanout_instruction())
+        self.agent.fanout = 0
+        self.assertEqual(self.agent.fanout_instruction(), "")
+
+    def test_run_browser_off_event_loop(self):
+        # Test that blocking browser actions run on the agent executor, not on the event loop thread
+        async def run():
+            return threading.get_ident(), await self.agent.run_browser(lambda x, y=0: (threading.get_ident(), x + y), 1, y=2)
+        loop_thread, (action_thread, result) = asyncio.run(run())
+        self.assertNotEqual(loop_thread, action_thread)
+        self.assertEqual(result, 3)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
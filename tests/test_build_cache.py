@@ -0,0 +1,78 @@
+import unittest
+import os
+import sys
+import tempfile
+import subprocess
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sources.tools.build_cache import BuildCache
+
+class TestBuildCache(unittest.TestCase):
+    """
+    Test suite for the content hash cache of compiled programs.
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = BuildCache(cache_dir=self.temp_dir.name, max_bytes=1000)
+        self.compiles = 0
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def fake_compile(self, size: int, returncode: int = 0):
+        def compile_code(build_dir: str) -> subprocess.CompletedProcess:
+            self.compiles += 1
+            with open(os.path.join(build_dir, "temp"), 'wb') as f:
+                f.write(b"x" * size)
+            return subprocess.CompletedProcess(["fake"], returncode, "", "error" if returncode else "")
+        return compile_code
+
+    def test_same_code_is_compiled_once(self):
+        """Test that the second build of the same code is a cache hit, also after reloading the index."""
+        key = self.cache.make_key("c", "int main() {}", ["gcc"])
+        path, result = self.cache.build(key, self.fake_compile(10))
+        self.assertIsNotNone(result)
+        self.assertTrue(os.path.isfile(os.path.join(path, "temp")))
+        self.assertEqual(self.cache.build(key, self.fake_compile(10)), (path, None))
+        reloaded = BuildCache(cache_dir=self.temp_dir.name)
+        self.assertEqual(reloaded.get(key), path)
+        self.assertEqual(self.compiles, 1)
+        self.assertNotEqual(key, self.cache.make_key("c", "int main() {}", ["clang"]))
+
+    def test_failed_build_is_not_cached(self):
+        """Test that a failed compilation returns its result and leaves no build behind."""
+        key = self.cache.make_key("c", "int main( {", ["gcc"])
+        path, result = self.cache.build(key, self.fake_compile(10, returncode=1))
+        self.assertIsNone(path)
+        self.assertEqual(result.stderr, "error")
+        self.assertEqual(os.listdir(self.temp_dir.name), ["builds"])
+        self.assertEqual(self.cache.get_stats()["builds"], 0)
+
+    def test_least_recently_used_build_is_evicted(self):
+        """Test that the cache size stays under max_bytes by removing the least recently used builds."""
+        keys = [self.cache.make_key("go", str(i), ["go"]) for i in range(3)]
+        first, _ = self.cache.build(keys[0], self.fake_compile(400))
+        self.cache.build(keys[1], self.fake_compile(400))
+        self.cache.get(keys[0])
+        self.cache.build(keys[2], self.fake_compile(400))
+        self.assertIsNone(self.cache.get(keys[1]))
+        self.assertEqual(self.cache.get(keys[0]), first)
+        stats = self.cache.get_stats()
+        self.assertEqual(stats["evicted"], 1)
+        self.assertEqual(stats["bytes"], 800)
+
+    def test_build_in_use_is_not_evicted(self):
+        """Test that a build running in another block is kept until its lease ends, then evicted."""
+        keys = [self.cache.make_key("c", str(i), ["gcc"]) for i in range(3)]
+        with self.cache.use(keys[0], self.fake_compile(400)) as (running, _):
+            self.cache.build(keys[1], self.fake_compile(400))
+            self.cache.build(keys[2], self.fake_compile(400))
+            self.assertTrue(os.path.isfile(os.path.join(running, "temp")))
+            self.assertIsNone(self.cache.get(keys[1]))
+        self.assertEqual(self.cache.in_use, {})
+        self.cache.build(keys[1], self.fake_compile(400))
+        self.assertIsNone(self.cache.get(keys[0]))
+
+if __name__ == '__main__':
+    unittest.main()
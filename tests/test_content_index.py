@@ -0,0 +1,87 @@
+import unittest
+import os
+import sys
+import time
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sources.tools.file_index import FileIndex
+from sources.tools.content_index import ContentIndex, tokenize
+
+class TestContentIndex(unittest.TestCase):
+    """
+    Test suite for the inverted index of the content search tool.
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.temp_dir.name, "work")
+        self.write("notes.txt", "Meeting notes\nThe database password must be rotated.\nLunch at noon.")
+        self.write("src/db.py", "def connect():\n    # database connection\n    return open_database(user=None, password=None)\n")
+        self.write("docs/readme.md", "A project about password managers and nothing else.\n")
+        self.write("image.png", "\x89PNG database password")
+        self.write("data.bin", "database\x00password")
+        file_index = FileIndex(self.root, index_path=os.path.join(self.temp_dir.name, "index.json"), rescan_interval=0)
+        self.index = ContentIndex(self.root, file_index=file_index, rescan_interval=0)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, path: str, content: str) -> None:
+        full_path = os.path.join(self.root, path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, 'w') as f:
+            f.write(content)
+
+    def names(self, results: list) -> list:
+        return [os.path.relpath(result["path"], self.root).replace(os.sep, "/") for result in results]
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("open_database(password=None) a"), ["open", "database", "password", "none"])
+
+    def test_ranked_results_with_snippets(self):
+        """Test that the exact phrase ranks first, binaries are ignored and snippets point at the matching lines."""
+        results = self.index.search("database password")
+        self.assertEqual(self.names(results)[0], "notes.txt")
+        self.assertEqual(set(self.names(results)), {"notes.txt", "src/db.py", "docs/readme.md"})
+        self.assertEqual(results[0]["snippets"], [(2, "The database password must be rotated.")])
+        self.assertEqual(self.index.search("unicorn"), [])
+
+    def test_incremental_update(self):
+        """Test that modified, new and deleted files are reflected without indexing unchanged files again."""
+        self.index.search("password")
+        self.write("notes.txt", "Nothing secret anymore, just a unicorn.")
+        self.write("new.txt", "another unicorn")
+        os.remove(os.path.join(self.root, "docs", "readme.md"))
+        os.utime(os.path.join(self.root, "notes.txt"), ns=(time.time_ns(), time.time_ns() + 10**9))
+        self.assertEqual(self.index.refresh(), (2, 2))
+        self.assertEqual(sorted(self.names(self.index.search("unicorn"))), ["new.txt", "notes.txt"])
+        self.assertEqual(self.names(self.index.search("password")), ["src/db.py"])
+
+    def test_source_files_are_text(self):
+        """Test that files of any type but the clearly binary ones are indexed when they have no NUL byte."""
+        self.write("src/lib.rs", "fn unicorn() {}")
+        self.write("app.rb", "def unicorn; end")
+        self.write("build.zip", "unicorn")
+        self.assertEqual(sorted(self.names(self.index.search("unicorn"))), ["app.rb", "src/lib.rs"])
+
+    def test_coverage_notes(self):
+        """Test that the words and files the index can't search are reported."""
+        self.assertEqual(self.index.coverage_notes("database password"), [])
+        self.index.max_file_bytes = 1024
+        self.write("big.log", "password\n" * 200)
+        self.index.refresh()
+        self.assertEqual(self.index.coverage_notes("x password"), ["words shorter than 2 letters or without letters are not indexed: x",
+                                                                  "1 files are only searched in their first 1KB"])
+
+    def test_memory_budget(self):
+        """Test that files are left out once the index is over its memory budget."""
+        self.index.memory_budget = 1
+        self.index.refresh()
+        stats = self.index.get_stats()
+        self.assertEqual(stats["files"], 1)
+        self.assertEqual(stats["skipped"], 2)
+        self.assertEqual(self.index.coverage_notes("password"), ["2 files were not searched, the index is full"])
+
+if __name__ == '__main__':
+    unittest.main()
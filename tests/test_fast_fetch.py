@@ -0,0 +1,78 @@
+import unittest
+import os
+import sys
+import httpx
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sources.fast_fetch import FastFetcher
+
+ARTICLE = "<html><head><title>How captchas work</title></head><body><p>" + "A long article about captcha and access denied errors. " * 30 + "</p></body></html>"
+ARTICLE_TEXT = "A long article about captcha and access denied errors. " * 30
+CHALLENGE = "<html><head><title>Just a moment...</title></head><body><div id='cf-chl-widget'></div></body></html>"
+LOGIN = "<html><head><title>Sign in</title></head><body><form><input type='password' name='pw'></form></body></html>"
+
+class TestFastFetcher(unittest.TestCase):
+    """
+    Test suite for the decision to serve a page over HTTP or escalate it to the driver.
+    """
+
+    def setUp(self):
+        self.fetcher = FastFetcher(min_text_chars=100, sticky_after=2)
+        self.pages = {
+            "/article": (200, ARTICLE),
+            "/challenge": (403, CHALLENGE),
+            "/forbidden": (403, "<html><head><title>403 Forbidden</title></head><body>nginx</body></html>"),
+            "/busy": (503, "<html><body>Service temporarily unavailable</body></html>"),
+            "/file": (200, None),
+        }
+        def handler(request: httpx.Request) -> httpx.Response:
+            status, html = self.pages[request.url.path]
+            if html is None:
+                return httpx.Response(status, content=b"%PDF-1.4", headers={"content-type": "application/pdf"})
+            return httpx.Response(status, text=html, headers={"content-type": "text/html; charset=utf-8"})
+        self.fetcher.client.close()
+        self.fetcher.client = httpx.Client(transport=httpx.MockTransport(handler))
+
+    def tearDown(self):
+        self.fetcher.close()
+
+    def test_fetch_statuses(self):
+        """Test that a blocking status is a bot wall only when the page looks like a challenge."""
+        page, reason = self.fetcher.fetch("https://example.com/article")
+        self.assertIsNone(reason)
+        self.assertEqual(page["html"], ARTICLE)
+        self.assertEqual(self.fetcher.fetch("https://example.com/challenge"), (None, "bot_wall"))
+        self.assertEqual(self.fetcher.fetch("https://example.com/forbidden"), (None, "status_403"))
+        self.assertEqual(self.fetcher.fetch("https://example.com/busy"), (None, "status_503"))
+        self.assertEqual(self.fetcher.fetch("https://example.com/file"), (None, "content_type"))
+
+    def test_escalation_reason(self):
+        """Test that pages mentioning a captcha or with a password field are not escalated when they have text."""
+        self.assertIsNone(self.fetcher.escalation_reason(ARTICLE, ARTICLE_TEXT))
+        self.assertEqual(self.fetcher.escalation_reason(CHALLENGE, ""), "bot_wall")
+        self.assertEqual(self.fetcher.escalation_reason(LOGIN, "Sign in"), "login_form")
+        self.assertIsNone(self.fetcher.escalation_reason(LOGIN.replace("</form>", "</form>" + ARTICLE), ARTICLE_TEXT))
+        self.assertEqual(self.fetcher.escalation_reason('<div id="root"></div>', ARTICLE_TEXT), "needs_js")
+        self.assertEqual(self.fetcher.escalation_reason("<p>Please enable JavaScript</p>", "Please enable JavaScript"), "needs_js")
+        self.assertEqual(self.fetcher.escalation_reason("<p>Short</p>", "Short"), "too_little_text")
+
+    def test_sticky_domains(self):
+        """Test that a domain skips the fast path after repeated bot walls, unless a page was ever served over HTTP."""
+        self.assertFalse(self.fetcher.should_try("file:///tmp/page.html"))
+        self.fetcher.record("https://blocked.com/a", "bot_wall")
+        self.assertTrue(self.fetcher.should_try("https://blocked.com/b"))
+        self.fetcher.record("https://www.blocked.com/b", "bot_wall")
+        self.assertFalse(self.fetcher.should_try("https://blocked.com/c"))
+        for _ in range(3):
+            self.fetcher.record("https://forum.com/login", "login_form")
+            self.fetcher.record("https://slow.com/page", "timeout")
+        self.assertTrue(self.fetcher.should_try("https://forum.com/thread"))
+        self.assertTrue(self.fetcher.should_try("https://slow.com/page"))
+        self.fetcher.record("https://mixed.com/a", None)
+        self.fetcher.record("https://mixed.com/b", "needs_js")
+        self.fetcher.record("https://mixed.com/c", "needs_js")
+        self.assertTrue(self.fetcher.should_try("https://mixed.com/d"))
+        self.assertEqual(self.fetcher.get_domain_stats()["mixed.com"]["escalated"], 2)
+
+if __name__ == '__main__':
+    unittest.main()
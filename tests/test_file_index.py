@@ -0,0 +1,70 @@
+import unittest
+import os
+import sys
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sources.tools.file_index import FileIndex, fuzzy_score
+
+class TestFileIndex(unittest.TestCase):
+    """
+    Test suite for the persistent index of file names used by the file finder.
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.temp_dir.name, "work")
+        self.index_path = os.path.join(self.temp_dir.name, "index.json")
+        for path in ["report.txt", "docs/report_2024.md", "docs/old/annual_report.txt", "src/main.py", "src/main.pyc", ".git/config"]:
+            self.touch(path)
+        self.index = FileIndex(self.root, index_path=self.index_path, rescan_interval=0)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def touch(self, path: str) -> None:
+        full_path = os.path.join(self.root, path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, 'w') as f:
+            f.write("content")
+
+    def relative(self, paths: list) -> list:
+        return [os.path.relpath(path, self.root).replace(os.sep, "/") for path in paths]
+
+    def test_exact_prefix_then_substring(self):
+        """Test that exact names rank before prefixes and substrings, and excluded files are not indexed."""
+        self.assertEqual(self.relative(self.index.search("report")), ["report.txt", "docs/report_2024.md", "docs/old/annual_report.txt"])
+        self.assertEqual(self.relative(self.index.search("report.txt")), ["report.txt", "docs/old/annual_report.txt"])
+        self.assertEqual(self.relative(self.index.search("main")), ["src/main.py"])
+        self.assertEqual(self.index.search("config"), [])
+
+    def test_path_query(self):
+        self.assertEqual(self.relative(self.index.search("old/annual_report.txt")), ["docs/old/annual_report.txt"])
+
+    def test_new_file_is_found_and_index_is_saved(self):
+        """Test that a file created after the build is found by a rescan, and the saved index is reloaded."""
+        self.index.search("report")
+        self.touch("src/utils/helpers.py")
+        self.assertEqual(self.relative(self.index.search("helpers.py")), ["src/utils/helpers.py"])
+        reloaded = FileIndex(self.root, index_path=self.index_path)
+        self.assertTrue(reloaded.ready.is_set())
+        self.assertEqual(reloaded.match("helpers", 10), [os.path.join("src", "utils", "helpers.py")])
+        self.assertEqual(reloaded.scan(), 0)
+
+    def test_new_file_is_found_before_rescan_interval(self):
+        """Test that a miss rescans at once with the default interval, the file was just created by the agent."""
+        index = FileIndex(self.root, index_path=self.index_path)
+        index.scan()
+        self.touch("notes/todo.md")
+        self.assertFalse(index.is_stale())
+        self.assertEqual(self.relative(index.search("todo.md")), ["notes/todo.md"])
+
+    def test_fuzzy_search(self):
+        self.assertGreater(fuzzy_score("rprt", "report.txt"), 0)
+        self.assertEqual(fuzzy_score("xyz", "report.txt"), 0)
+        self.assertEqual(self.relative(self.index.fuzzy_search("mn.py"))[0], "src/main.py")
+        self.assertEqual(self.relative(self.index.fuzzy_search("mian.py"))[0], "src/main.py")
+        self.assertEqual(self.index.fuzzy_search("zzz"), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+import os
+import sys
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sources.tools.file_reader import FileReader, parse_range
+
+try:
+    import pypdf
+except ImportError:
+    pypdf = None
+
+def write_pdf(path: str, texts: list) -> None:
+    """Write a minimal PDF with one line of text per page."""
+    count = len(texts)
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>",
+               f"<< /Type /Pages /Kids [{' '.join(f'{4 + 2 * i} 0 R' for i in range(count))}] /Count {count} >>",
+               "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    for i, text in enumerate(texts):
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {5 + 2 * i} 0 R /Resources << /Font << /F1 3 0 R >> >> >>")
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+    content = "%PDF-1.4\n"
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(content))
+        content += f"{number} 0 obj\n{obj}\nendobj\n"
+    xref = len(content)
+    content += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n" + "".join(f"{offset:010d} 00000 n \n" for offset in offsets)
+    content += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+    with open(path, 'w') as f:
+        f.write(content)
+
+class TestFileReader(unittest.TestCase):
+    """
+    Test suite for the ranged reading of large files by the file finder.
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.reader = FileReader(head_lines=5, max_lines=10, max_chars=1000)
+        self.text_path = os.path.join(self.temp_dir.name, "notes.md")
+        with open(self.text_path, 'w') as f:
+            for i in range(1, 1001):
+                f.write(f"## Part {i}\n" if i % 250 == 1 else f"line {i}\n")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_parse_range(self):
+        self.assertEqual(parse_range("10-50"), (10, 50))
+        self.assertEqual(parse_range(" 7 "), (7, 7))
+        self.assertEqual(parse_range("900-"), (900, None))
+        self.assertIsNone(parse_range("50-10"))
+        self.assertIsNone(parse_range("abc"))
+
+    def test_head_and_outline(self):
+        """Test that a read without range returns the head, the outline and how to read more."""
+        output = self.reader.read_text(self.text_path)
+        self.assertTrue(output.startswith("Content of notes.md (lines 1-5 of 1000):\n## Part 1\nline 2\n"))
+        self.assertNotIn("line 6\n", output)
+        self.assertIn("line 751: ## Part 751", output)
+        self.assertIn("lines=<start>-<end>", output)
+
+    def test_ranges_are_bounded(self):
+        """Test that a range is read from its offset and capped to max_lines and max_chars."""
+        output = self.reader.read_text(self.text_path, (500, 502))
+        self.assertEqual(output.split("\n")[:4], ["Content of notes.md (lines 500-502 of 1000):", "line 500", "## Part 501", "line 502"])
+        self.assertIn("(lines 995-1000 of 1000)", self.reader.read_text(self.text_path, (995, None)))
+        self.assertIn("(lines 100-109 of 1000)", self.reader.read_text(self.text_path, (100, 900)))
+        self.reader.max_chars = 20
+        self.assertIn("(lines 100-102 of 1000)", self.reader.read_text(self.text_path, (100, 109)))
+        self.assertTrue(self.reader.read_text(self.text_path, (2000, None)).startswith("Error"))
+
+    def test_long_line_is_read_by_bytes(self):
+        """Test that a huge single line is cut at max_chars with the byte range of the rest, and read by bytes."""
+        path = os.path.join(self.temp_dir.name, "bundle.min.js")
+        with open(path, 'w') as f:
+            f.write("function a(){}" + "x" * 5000 + "\nlast")
+        output = self.reader.read_text(path)
+        self.assertIn("(lines 1-1 of 2)", output)
+        self.assertIn("function a(){}" + "x" * 986 + "\n", output)
+        self.assertIn("use action=read with bytes=1001-2000", output)
+        self.assertEqual(self.reader.text_outline(path), [(1, "function a(){}" + "x" * 86)])
+        self.assertEqual(self.reader.read_bytes(path, (1001, 1003)), "Content of bundle.min.js (bytes 1001-1003 of 5019):\nxxx\n"
+                         "\n[The file continues, to read more use action=read with bytes=<start>-<end>, at most 1000 bytes at once.]")
+        self.assertTrue(self.reader.read_bytes(path, (5010, None)).startswith("Content of bundle.min.js (bytes 5010-5019 of 5019):\nxxxxx\nlast\n"))
+
+    @unittest.skipIf(pypdf is None, "reading PDF needs pypdf")
+    def test_pdf_pages(self):
+        """Test that only the requested pages of a PDF are returned."""
+        pdf_path = os.path.join(self.temp_dir.name, "report.pdf")
+        write_pdf(pdf_path, [f"Text of page {i}" for i in range(1, 8)])
+        self.reader.head_pages = 2
+        head = self.reader.read_pdf(pdf_path)
+        self.assertIn("(pages 1-2 of 7)", head)
+        self.assertIn("Text of page 2", head)
+        self.assertNotIn("Text of page 3", head)
+        pages = self.reader.read_pdf(pdf_path, (6, None))
+        self.assertIn("(pages 6-7 of 7)", pages)
+        self.assertIn("Text of page 7", pages)
+        self.assertNotIn("Text of page 5", pages)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+import os
+import sys
+import time
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sources.page_cache import PageCache, normalize_url
+
+class TestPageCache(unittest.TestCase):
+    """
+    Test suite for the disk cache of visited pages.
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = PageCache(cache_dir=self.temp_dir.name, ttl=3600, unvalidated_ttl=300)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def page(self, url: str, text: str = "Some text", etag: str = None) -> dict:
+        return {"url": url, "final_url": url, "title": "Title", "text": text, "links": [], "inputs": [], "etag": etag, "last_modified": None}
+
+    def test_normalize_url(self):
+        """Test that every query parameter is part of the key, and equivalent urls share it."""
+        self.assertNotEqual(normalize_url("https://shop.com/item?id=1"), normalize_url("https://shop.com/item?id=2"))
+        self.assertNotEqual(normalize_url("https://shop.com/list?page=2"), normalize_url("https://shop.com/list"))
+        self.assertEqual(normalize_url("HTTPS://Shop.com:443/item?b=2&a=1#reviews"), "https://shop.com/item?a=1&b=2")
+        self.assertEqual(normalize_url("http://shop.com"), "http://shop.com/")
+        self.assertEqual(normalize_url("http://shop.com:8080/a"), "http://shop.com:8080/a")
+
+    def test_pages_with_other_parameters_are_not_served(self):
+        self.cache.put(normalize_url("https://shop.com/item?id=1"), self.page("https://shop.com/item?id=1", "Item 1"))
+        self.assertIsNone(self.cache.get(normalize_url("https://shop.com/item?id=2")))
+        self.assertEqual(self.cache.get(normalize_url("https://shop.com/item?id=1#top"))["text"], "Item 1")
+
+    def test_ttl_depends_on_validators(self):
+        """Test that pages without validators, like driver rendered pages, are not kept for the full TTL."""
+        self.cache.put("https://a.com/", self.page("https://a.com/", etag='"v1"'))
+        self.cache.put("https://b.com/", self.page("https://b.com/"))
+        self.cache.put("https://c.com/", self.page("https://c.com/"), ttl=60)
+        self.assertEqual(self.cache.index["https://a.com/"]["ttl"], 3600)
+        self.assertEqual(self.cache.index["https://b.com/"]["ttl"], 300)
+        self.assertEqual(self.cache.index["https://c.com/"]["ttl"], 60)
+
+    def test_stale_entry_is_revalidated(self):
+        self.cache.put("https://a.com/", self.page("https://a.com/", etag='"v1"'), ttl=0)
+        entry = self.cache.get("https://a.com/")
+        self.assertFalse(entry["fresh"])
+        self.assertEqual(entry["etag"], '"v1"')
+        self.cache.index["https://a.com/"]["ttl"] = 60
+        self.cache.touch("https://a.com/")
+        self.assertTrue(self.cache.is_fresh_key("https://a.com/"))
+        self.assertEqual(self.cache.get_stats()["revalidated"], 1)
+
+    def test_lru_eviction_and_reload(self):
+        """Test that the least recently used page is evicted first and the index survives a restart."""
+        self.cache.max_bytes = 500
+        self.cache.put("https://a.com/", self.page("https://a.com/", "a" * 100))
+        time.sleep(0.01)
+        self.cache.put("https://b.com/", self.page("https://b.com/", "b" * 100))
+        time.sleep(0.01)
+        self.cache.get("https://a.com/")
+        self.cache.put("https://c.com/", self.page("https://c.com/", "c" * 100))
+        self.assertIsNone(self.cache.get("https://b.com/"))
+        self.assertEqual(self.cache.get_stats()["evicted"], 1)
+        reloaded = PageCache(cache_dir=self.temp_dir.name)
+        self.assertEqual(sorted(reloaded.index), ["https://a.com/", "https://c.com/"])
+
+if __name__ == '__main__':
+    unittest.main()
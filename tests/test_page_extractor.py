@@ -0,0 +1,63 @@
+import unittest
+import os
+import sys
+import glob
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sources.page_extractor import extract_page_text, is_sentence, LXML_AVAILABLE
+
+CORPUS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmarks', 'html_corpus'))
+
+class TestPageExtractor(unittest.TestCase):
+    """
+    Test suite for the page text extraction, the lxml engine must give the same text as the markdownify engine.
+    """
+
+    def test_is_sentence(self):
+        """Test the meaningful line filter."""
+        self.assertTrue(is_sentence("This is a complete sentence."))
+        self.assertTrue(is_sentence("Error 404"))
+        self.assertFalse(is_sentence("Home"))
+        self.assertFalse(is_sentence("About us"))
+
+    def test_page_markers_and_images(self):
+        """Test the page markers and the image placeholder."""
+        html = '<html><body><p>The quick brown fox jumps over the lazy dog.</p><img src="a.png" alt="a fox jumping over the dog"></body></html>'
+        for engine in ["markdownify", "lxml"]:
+            text = extract_page_text(html, engine=engine)
+            self.assertTrue(text.startswith("[Start of page]"))
+            self.assertTrue(text.endswith("[End of page]"))
+            self.assertIn("The quick brown fox jumps over the lazy dog.", text)
+            self.assertIn("[IMAGE: a fox jumping over the dog]", text)
+
+    def test_scripts_and_styles_removed(self):
+        """Test that script and style content never reach the text."""
+        html = '<body><script>var secret = "do not show this text to the agent";</script><style>p { color: red; }</style><p>Visible text of the page for the agent.</p></body>'
+        for engine in ["markdownify", "lxml"]:
+            text = extract_page_text(html, engine=engine)
+            self.assertNotIn("secret", text)
+            self.assertNotIn("color", text)
+            self.assertIn("Visible text of the page for the agent.", text)
+
+    def test_xml_declaration_and_empty_documents(self):
+        """Test that pages lxml can't parse as is give the same text as markdownify."""
+        pages = ['<?xml version="1.0" encoding="UTF-8"?>\n<html><body><p>An XHTML page declaring its encoding first.</p></body></html>',
+                 '<!-- only a comment -->']
+        for html in pages:
+            self.assertEqual(extract_page_text(html, engine="lxml"), extract_page_text(html, engine="markdownify"))
+        self.assertIn("An XHTML page declaring its encoding first.", extract_page_text(pages[0]))
+
+    @unittest.skipUnless(LXML_AVAILABLE, "lxml is not installed")
+    def test_engines_identical_on_corpus(self):
+        """Test that both engines give the same output on the saved pages."""
+        files = glob.glob(os.path.join(CORPUS_DIR, "*.html"))
+        self.assertTrue(files)
+        for path in files:
+            with open(path, "r", encoding="utf-8") as f:
+                html = f.read()
+            with self.subTest(page=os.path.basename(path)):
+                self.assertEqual(extract_page_text(html, engine="markdownify"),
+                                 extract_page_text(html, engine="lxml"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import os
+import sys
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sources.plan_cache import PlanCache, extract_slots
+
+class TestPlanCache(unittest.TestCase):
+    """
+    Test suite for the plan templates reused for goals of the same form.
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.temp_dir.name, "plans.json")
+        self.cache = PlanCache(cache_path=self.cache_path, max_entries=2)
+        self.goal = "Find 5 AI startups in Paris and save them to startups.txt"
+        self.plan = [
+            ["## Task 1: search AI startups in Paris", {"agent": "Web", "id": "1", "need": [], "task": "Find 5 AI startups in Paris"}],
+            ["## Task 2: save the list", {"agent": "File", "id": "2", "need": ["1"], "task": "Save the 5 startups to startups.txt"}]
+        ]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_extract_slots(self):
+        """Test that names, numbers and file names are parameters, not the first word."""
+        signature, values = extract_slots(self.goal)
+        self.assertEqual(signature, "find {} {} startups in {} and save them to {}")
+        self.assertEqual(values, ["5", "AI", "Paris", "startups.txt"])
+        self.assertEqual(extract_slots("find 3 AI startups in New York and save them to ny.txt.")[0], signature)
+
+    def test_exact_template_hit(self):
+        """Test that a goal of the same form gets the plan with its own parameters."""
+        self.cache.put(self.goal, self.plan)
+        cached = self.cache.get("find 12 AI startups in New York and save them to ny.txt")
+        self.assertIsNotNone(cached)
+        self.assertTrue(cached["exact"])
+        self.assertEqual(cached["plan"][0][0], "## Task 1: search AI startups in New York")
+        self.assertEqual(cached["plan"][0][1]["task"], "Find 12 AI startups in New York")
+        self.assertEqual(cached["plan"][1][1]["task"], "Save the 12 startups to ny.txt")
+        self.assertEqual(cached["plan"][1][1]["need"], ["1"])
+
+    def test_inexact_template_and_miss(self):
+        """Test that a parameter missing from the plan is reported and other goals miss."""
+        plan = [["## Task 1", {"agent": "Web", "id": "1", "need": [], "task": "Find french AI companies"}]]
+        self.cache.put("find AI startups in Paris", plan)
+        self.assertFalse(self.cache.get("find AI startups in Rome")["exact"])
+        self.assertIsNone(self.cache.get("write a poem about Paris"))
+        self.assertEqual(self.cache.get_stats()["misses"], 1)
+
+    def test_parameter_in_other_case(self):
+        """Test that a parameter is templated in any case, and a plan keeping a form of it is not exact."""
+        plan = [["## Task 1: find the CEO", {"agent": "Web", "id": "1", "need": [], "task": "Search who is the CEO of tesla (Tesla Inc)"}],
+                ["## Task 2: find the age", {"agent": "Web", "id": "2", "need": ["1"], "task": "Find the age of the CEO"}]]
+        self.cache.put("Find the CEO of Tesla and then find their age", plan)
+        cached = self.cache.get("Find the CEO of Apple and then find their age")
+        self.assertTrue(cached["exact"])
+        self.assertEqual(cached["plan"][0][1]["task"], "Search who is the CEO of Apple (Apple Inc)")
+        plan[0][1]["task"] = "Search who runs Teslas company"
+        self.cache.put("Find the CEO of Tesla and then find their age", plan)
+        self.assertFalse(self.cache.get("Find the CEO of Apple and then find their age")["exact"])
+
+    def test_persistence_and_eviction(self):
+        """Test that templates are saved to disk and the least recently used is evicted."""
+        self.cache.put(self.goal, self.plan)
+        self.cache.put("make a weather app in python", self.plan)
+        self.cache.get(self.goal)
+        self.cache.put("write a poem about Paris", self.plan)
+        reloaded = PlanCache(cache_path=self.cache_path)
+        self.assertEqual(reloaded.get_stats()["templates"], 2)
+        self.assertIsNotNone(reloaded.get(self.goal))
+        self.assertIsNone(reloaded.get("make a weather app in python"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+import unittest
+import os
+import sys
+import asyncio
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sources.agents.planner_agent import PlannerAgent
+from sources.browser_pool import BrowserPool
+
+PROMPT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'prompts', 'base', 'planner_agent.txt')
+
+class FakeProvider:
+    def get_model_name(self) -> str:
+        return "fake-model"
+
+class FakeAgent:
+    """Agent answering a task after a delay, recording when it started and finished."""
+    def __init__(self, planner, task_id: str, browser=None):
+        self.planner = planner
+        self.task_id = task_id
+        self.browser = browser
+        self.blocks_result = []
+        self.get_success = task_id not in planner.failing
+
+    async def process(self, prompt: str, speech_module) -> tuple:
+        self.planner.events.append(("start", self.task_id))
+        self.planner.prompts[self.task_id] = prompt
+        await asyncio.sleep(self.planner.durations.get(self.task_id, 0.01))
+        self.planner.events.append(("end", self.task_id))
+        return f"Result of task {self.task_id}, done with care.", ""
+
+    def raw_answer_blocks(self, answer: str) -> str:
+        return answer
+
+    def show_answer(self) -> None:
+        pass
+
+    def request_stop(self) -> None:
+        pass
+
+def make_task(task_id: str, need: list, agent: str = "casual") -> list:
+    return [f"Task {task_id}", {"id": task_id, "agent": agent, "task": f"do step {task_id}", "need": need}]
+
+class TestPlannerAgent(unittest.TestCase):
+    """
+    Test suite for the concurrent execution of the plan tasks, with fake agents.
+    """
+
+    def setUp(self):
+        self.planner = PlannerAgent("Planner", PROMPT_PATH, FakeProvider(), plan_review="on_failure")
+        self.planner.events = []
+        self.planner.prompts = {}
+        self.planner.durations = {}
+        self.planner.failing = set()
+        self.planner.reviews = []
+        self.current_task = None
+        def create_agent(agent_type, browser=None):
+            return FakeAgent(self.planner, self.current_task["id"], browser)
+        async def run_task(task, required_infos):
+            self.current_task = task
+            return await PlannerAgent.run_task(self.planner, task, required_infos)
+        self.planner.create_agent = create_agent
+        self.planner.run_task = run_task
+
+    def run_plan(self, plan: list) -> str:
+        async def get_plan(goal):
+            return plan
+        async def update_plan(goal, agents_tasks, agents_work_result, id, success):
+            self.planner.reviews.append((id, success))
+            return agents_tasks
+        self.planner.get_plan = get_plan
+        self.planner.update_plan = update_plan
+        answer, _ = asyncio.run(self.planner.process("goal", None))
+        return answer
+
+    def test_get_ready_tasks(self):
+        """Test that tasks are ready when their needs are done, and needs missing from the plan are ignored."""
+        plan = [make_task("1", []), make_task("2", ["1"]), make_task("3", ["1", "2"]), make_task("4", ["9"])]
+        ready = self.planner.get_ready_tasks(plan, {}, set())
+        self.assertEqual([key for key, _, _ in ready], ["1", "4"])
+        ready = self.planner.get_ready_tasks(plan, {"1": "done"}, {"1", "4"})
+        self.assertEqual([key for key, _, _ in ready], ["2"])
+        self.assertEqual(self.planner.get_ready_tasks(plan, {"1": "done", "2": "done"}, {"1", "2", "4"})[0][2]["id"], "3")
+
+    def test_repeated_ids_have_their_own_key(self):
+        plan = [make_task("1", []), make_task("2", ["1"]), make_task("2", ["1"])]
+        self.assertEqual(self.planner.get_task_keys(plan), ["1", "2", "2#1"])
+        ready = self.planner.get_ready_tasks(plan, {"1": "done", "2": "failed"}, {"1", "2"})
+        self.assertEqual([key for key, _, _ in ready], ["2#1"])
+
+    def test_dag_order(self):
+        """Test that independent tasks run at the same time and a task starts only after the tasks it needs."""
+        self.planner.durations = {"1": 0.05, "2": 0.01}
+        answer = self.run_plan([make_task("1", []), make_task("2", []), make_task("3", ["1", "2"])])
+        events = self.planner.events
+        self.assertEqual(events[:2], [("start", "1"), ("start", "2")])
+        self.assertGreater(events.index(("start", "3")), events.index(("end", "1")))
+        self.assertIn("Result of task 1", self.planner.prompts["3"])
+        self.assertTrue(answer.startswith("Result of task 3, done with care."))
+
+    def test_failure_is_reported(self):
+        """Test that a failed task is reviewed as a failure and its output reaches the tasks needing it."""
+        self.planner.failing = {"1"}
+        self.run_plan([make_task("1", []), make_task("2", ["1"])])
+        self.assertEqual(self.planner.reviews, [("1", False), ("2", True)])
+        self.assertIn("Agent failed with task", self.planner.prompts["2"])
+
+    def test_cycle_and_repeated_ids(self):
+        """Test that a dependency cycle and a repeated id don't stop the plan, every task runs once."""
+        self.run_plan([make_task("1", ["2"]), make_task("2", ["1"]), make_task("2", ["1"])])
+        self.assertEqual([event for event in self.planner.events if event[0] == "start"], [("start", "1"), ("start", "2"), ("start", "2")])
+
+class TestBrowserPool(unittest.TestCase):
+    """
+    Test suite for the leases of browsers by the web tasks.
+    """
+
+    def test_main_browser_then_created(self):
+        """Test that the main browser is leased first, others are created up to the size and leases wait after."""
+        created = []
+        def factory():
+            created.append(f"browser {len(created) + 2}")
+            return created[-1]
+        pool = BrowserPool("main", factory=factory, size=2)
+        order = []
+        async def task(name, duration):
+            async with pool.lease() as browser:
+                order.append((name, browser))
+                await asyncio.sleep(duration)
+        async def main():
+            await asyncio.gather(task("a", 0.05), task("b", 0.05), task("c", 0.01))
+        asyncio.run(main())
+        self.assertEqual(order[:2], [("a", "main"), ("b", "browser 2")])
+        self.assertEqual(order[2][0], "c")
+        self.assertEqual(created, ["browser 2"])
+        self.assertEqual(pool.idle[0], "main")
+
+    def test_factory_failure_frees_the_slot(self):
+        def factory():
+            raise RuntimeError("chrome crashed")
+        pool = BrowserPool("main", factory=factory, size=2)
+        async def main():
+            first = await pool.acquire()
+            with self.assertRaises(RuntimeError):
+                await pool.acquire()
+            self.assertEqual(pool.created, [])
+            await pool.release(first)
+            return await pool.acquire()
+        self.assertEqual(asyncio.run(main()), "main")
+
+    def test_reused_across_event_loops(self):
+        pool = BrowserPool("main")
+        async def lease():
+            async with pool.lease() as browser:
+                return browser
+        self.assertEqual(asyncio.run(lease()), "main")
+        self.assertEqual(asyncio.run(lease()), "main")
+
+if __name__ == '__main__':
+    unittest.main()
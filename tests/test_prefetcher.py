@@ -0,0 +1,64 @@
+import unittest
+import os
+import sys
+import time
+import threading
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sources.prefetcher import Prefetcher
+
+class TestPrefetcher(unittest.TestCase):
+    """
+    Test suite for the background loading of search results.
+    """
+
+    def setUp(self):
+        self.release = threading.Event()
+        self.fetched = []
+        def fetch_page(url):
+            self.fetched.append(url)
+            if "slow" in url:
+                self.release.wait(5)
+            if "broken" in url:
+                raise ConnectionError("connection reset")
+            return {"url": url, "bytes": 1000}, "needs_js" if "app" in url else None
+        self.prefetcher = Prefetcher(fetch_page, max_workers=2)
+
+    def tearDown(self):
+        self.release.set()
+        self.prefetcher.close()
+
+    def test_take(self):
+        """Test that prefetched pages are taken once, with their escalation reason, and failures are misses."""
+        self.prefetcher.prefetch({"a": "https://a.com", "app": "https://app.com", "broken": "https://broken.com"})
+        self.prefetcher.prefetch({"a": "https://a.com"})
+        self.assertEqual(self.prefetcher.take("a"), ({"url": "https://a.com", "bytes": 1000}, None))
+        self.assertEqual(self.prefetcher.take("app")[1], "needs_js")
+        self.assertIsNone(self.prefetcher.take("a"))
+        self.assertIsNone(self.prefetcher.take("broken"))
+        stats = self.prefetcher.get_stats()
+        self.assertEqual(self.fetched.count("https://a.com"), 1)
+        self.assertEqual((stats["hits"], stats["misses"], stats["escalated"]), (2, 2, 1))
+
+    def test_take_timeout(self):
+        self.prefetcher.prefetch({"slow": "https://slow.com"})
+        self.assertIsNone(self.prefetcher.take("slow", timeout=0.05))
+        self.assertEqual(self.prefetcher.get_stats()["misses"], 1)
+
+    def test_discard_does_not_wait(self):
+        """Test that discard returns while fetches run, and counts their bytes as wasted once they finish."""
+        self.prefetcher.prefetch({"slow1": "https://slow1.com", "slow2": "https://slow2.com", "queued": "https://queued.com"})
+        time.sleep(0.05)
+        start = time.time()
+        self.prefetcher.discard()
+        self.assertLess(time.time() - start, 0.5)
+        self.assertEqual(self.prefetcher.get_stats()["pending"], 0)
+        self.release.set()
+        deadline = time.time() + 5
+        while self.prefetcher.get_stats()["wasted"] < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.prefetcher.get_stats()["wasted_bytes"], 2000)
+        self.assertNotIn("https://queued.com", self.fetched)
+
+if __name__ == '__main__':
+    unittest.main()
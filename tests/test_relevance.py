@@ -0,0 +1,56 @@
+import unittest
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sources.relevance import split_chunks, rank_chunks, select_relevant_text, reciprocal_rank_fusion
+
+class TestRelevance(unittest.TestCase):
+    """
+    Test suite for the page chunking and BM25 ranking used to fit page text in the prompt.
+    """
+
+    def setUp(self):
+        self.filler = "\n\n".join(f"Navigation menu entry number {i} of the website header." for i in range(40))
+        self.answer = "## Opening hours\n\nThe museum is open from 9am to 6pm every day except Monday."
+        self.page = f"[Start of page]\n\n{self.filler}\n\n{self.answer}\n\n{self.filler}\n\n[End of page]"
+
+    def test_split_chunks_heading_starts_chunk(self):
+        """Test that chunks respect the size and headings start a new chunk."""
+        chunks = split_chunks(self.page, max_chars=500)
+        self.assertTrue(all(len(chunk) <= 500 for chunk in chunks))
+        self.assertTrue(any(chunk.startswith("## Opening hours") for chunk in chunks))
+        self.assertNotIn("[Start of page]", chunks[0])
+
+    def test_rank_chunks(self):
+        """Test that the chunk answering the query is ranked first."""
+        chunks = split_chunks(self.page, max_chars=500)
+        best_index, best_score = rank_chunks(chunks, "museum opening hours")[0]
+        self.assertGreater(best_score, 0)
+        self.assertIn("9am to 6pm", chunks[best_index])
+
+    def test_select_relevant_text(self):
+        """Test that relevant content deep in the page is kept within the budget."""
+        text = select_relevant_text(self.page, "when is the museum open", budget=800)
+        self.assertLessEqual(len(text), 800)
+        self.assertIn("9am to 6pm", text)
+        self.assertTrue(text.startswith("[Start of page]"))
+        self.assertTrue(text.endswith("[End of page]"))
+        self.assertIn("[...]", text)
+
+    def test_select_relevant_text_fallbacks(self):
+        """Test that short pages are unchanged and unrelated queries keep the page beginning."""
+        self.assertEqual(select_relevant_text(self.page, "museum", budget=len(self.page)), self.page)
+        self.assertEqual(select_relevant_text(self.page, "quantum chromodynamics", budget=300), self.page[:300])
+
+    def test_reciprocal_rank_fusion(self):
+        """Test that items found by several rankings come first and duplicates count once per ranking."""
+        fused = reciprocal_rank_fusion([["a", "b", "c"], ["c", "d", "c"], ["e", "c"]], k=60)
+        items = [item for item, _ in fused]
+        self.assertEqual(items[0], "c")
+        self.assertEqual(sorted(items), ["a", "b", "c", "d", "e"])
+        self.assertAlmostEqual(dict(fused)["c"], 1 / 63 + 1 / 61 + 1 / 62)
+        self.assertEqual(items[1:], ["a", "e", "b", "d"])
+
+if __name__ == '__main__':
+    unittest.main()
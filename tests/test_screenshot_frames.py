@@ -0,0 +1,56 @@
+import unittest
+import os
+import sys
+import base64
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sources.screenshot_frames import ScreenshotFrames
+
+def encode(data: bytes) -> str:
+    return base64.b64encode(data).decode()
+
+class TestScreenshotFrames(unittest.TestCase):
+    """
+    Test suite for the versioned screenshots served by the API.
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.frames = ScreenshotFrames(min_interval=60, watch_window=60, save_folder=self.temp_dir.name)
+
+    def tearDown(self):
+        self.frames.executor.shutdown(wait=True)
+        self.temp_dir.cleanup()
+
+    def test_capture_only_when_watched(self):
+        """Test that captures are only wanted while a client polls, and at most once per interval."""
+        self.assertFalse(self.frames.should_capture())
+        self.frames.watched()
+        self.assertTrue(self.frames.should_capture())
+        self.frames.submit(encode(b"frame"))
+        self.assertFalse(self.frames.should_capture())
+
+    def test_identical_frames_keep_their_version(self):
+        """Test that a new version and etag are published only when the image changed."""
+        self.assertIsNone(self.frames.latest())
+        self.frames.publish(encode(b"frame one"), "screen.png")
+        first = self.frames.latest()
+        self.frames.publish(encode(b"frame one"), "screen.png")
+        self.assertIs(self.frames.latest(), first)
+        self.frames.publish(encode(b"frame two"), "screen.png")
+        second = self.frames.latest()
+        self.assertEqual((first["version"], second["version"]), (1, 2))
+        self.assertNotEqual(first["etag"], second["etag"])
+        self.assertEqual(second["data"], b"frame two")
+        with open(os.path.join(self.temp_dir.name, "screen.png"), 'rb') as f:
+            self.assertEqual(f.read(), b"frame two")
+
+    def test_submit_publishes_in_background(self):
+        self.frames.submit("not base64!")
+        self.frames.submit(encode(b"frame"), "screen.png")
+        self.frames.executor.shutdown(wait=True)
+        self.assertEqual(self.frames.latest()["version"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
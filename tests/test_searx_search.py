@@ -3,6 +3,8 @@ import os
 import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  # Add project root to Python path
 from sources.tools.searxSearch import searxSearch
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from searxng_stub import SearxStub
 from dotenv import load_dotenv
 import requests  # Import the requests module
 
@@ -83,5 +85,99 @@ class TestSearxSearch(unittest.TestCase):
         output = "Search completed successfully"
         self.assertFalse(self.search_tool.execution_failure_check(output))
 
+class TestSearxLinkCheck(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.stub = SearxStub().start()
+        cls.url = cls.stub.url
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.stub.stop()
+
+    def setUp(self):
+        self.search_tool = searxSearch(base_url="http://127.0.0.1:8080")
+
+    def test_check_all_links(self):
+        # Statuses are returned in the links order, duplicates included
+        links = [f"{self.url}/ok", f"{self.url}/paywall", f"{self.url}/missing", f"{self.url}/nohead", "ftp://x", f"{self.url}/ok"]
+        statuses = self.search_tool.check_all_links(links)
+        self.assertEqual(statuses, ["Status: OK", "Status: Possible Paywall", "Status: 404 Not Found",
+                                    "Status: OK", "Status: Invalid URL", "Status: OK"])
+
+    def test_link_status_cache(self):
+        # A link checked recently does not hit the network again
+        self.search_tool.link_valid(f"{self.url}/missing")
+        count = self.stub.page_requests
+        self.assertEqual(self.search_tool.link_valid(f"{self.url}/missing"), "Status: 404 Not Found")
+        self.assertEqual(self.stub.page_requests, count)
+
+    def test_link_caches_are_bounded(self):
+        # Only the most recent statuses are kept, and host slots are dropped once the checks are done
+        self.search_tool.link_status_max_entries = 2
+        for path in ["/ok", "/missing", "/paywall"]:
+            self.search_tool.link_valid(f"{self.url}{path}")
+        self.assertEqual(list(self.search_tool.link_status_cache), [f"{self.url}/missing", f"{self.url}/paywall"])
+        self.search_tool.check_all_links([f"{self.url}/ok", f"{self.url}/nohead", f"{self.url}/ok"])
+        self.assertEqual(self.search_tool.host_semaphores, {})
+
+class TestSearxStubSearch(unittest.TestCase):
+
+    def make_tool(self, allow_json):
+        stub = SearxStub(allow_json=allow_json).start()
+        self.addCleanup(stub.stop)
+        return stub, searxSearch(base_url=stub.url)
+
+    def test_json_results(self):
+        # JSON results are used when the instance allows the format
+        stub, search_tool = self.make_tool(allow_json=True)
+        result = search_tool.execute(["test query"])
+        self.assertIn("Title:Example article\nSnippet:An article about the query.\nLink:https://example.com/article", result)
+        self.assertTrue(search_tool.json_format)
+
+    def test_html_fallback(self):
+        # HTML results are parsed when JSON is refused, JSON is not tried again
+        stub, search_tool = self.make_tool(allow_json=False)
+        result = search_tool.execute(["test query"])
+        self.assertIn("Link:https://example.org/guide", result)
+        self.assertFalse(search_tool.json_format)
+        search_tool.execute(["another query"])
+        self.assertEqual(stub.queries, ["test query", "test query", "another query"])
+
+    def test_json_retried_after_refusal(self):
+        # A refused JSON format is tried again after json_retry_interval
+        stub, search_tool = self.make_tool(allow_json=False)
+        search_tool.execute(["test query"])
+        stub.server.allow_json = True
+        search_tool.json_retry_at = 0.0
+        self.assertIn("Link:https://example.com/article", search_tool.execute(["another query"]))
+        self.assertTrue(search_tool.json_format)
+        self.assertEqual(stub.queries, ["test query", "test query", "another query"])
+
+    def test_search_cache_is_bounded(self):
+        stub, search_tool = self.make_tool(allow_json=True)
+        search_tool.search_cache_max_entries = 2
+        for query in ["first", "second", "third"]:
+            search_tool.execute([query])
+        search_tool.execute(["first"])
+        self.assertEqual(stub.queries, ["first", "second", "third", "first"])
+        self.assertEqual(len(search_tool.search_cache), 2)
+
+    def test_search_cache_and_session(self):
+        # Normalized queries hit the cache, other queries reuse the same connection
+        stub, search_tool = self.make_tool(allow_json=True)
+        first = search_tool.execute(["Test  Query"])
+        self.assertEqual(search_tool.execute(["test query "]), first)
+        search_tool.execute(["other query"])
+        self.assertEqual(stub.queries, ["Test  Query", "other query"])
+        self.assertEqual(len(stub.connections), 1)
+
+    def test_no_results_not_cached(self):
+        stub, search_tool = self.make_tool(allow_json=True)
+        self.assertEqual(search_tool.execute(["nothing here"]), "No search results, web search failed.")
+        search_tool.execute(["nothing here"])
+        self.assertEqual(len(stub.queries), 2)
+
 if __name__ == '__main__':
     unittest.main()
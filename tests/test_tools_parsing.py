@@ -225,6 +225,8 @@ param3 = value3"""
         self.assertEqual(self.tool.get_parameter_value(block, "param2"), "value2")
         self.assertEqual(self.tool.get_parameter_value(block, "param3"), "value3")
         self.assertIsNone(self.tool.get_parameter_value(block, "nonexistent"))
+        self.assertEqual(self.tool.get_parameter_value("name=lines.txt\nfilename=a.txt\nlines=1-5", "lines"), "1-5")
+        self.assertIsNone(self.tool.get_parameter_value("filename=a.txt", "name"))
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,85 @@
+import unittest
+import os
+import sys
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sources.tools.worker_pool import PythonWorkerPool
+from sources.tools.PyInterpreter import PyInterpreter
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+class TestWorkerPool(unittest.TestCase):
+    """
+    Test suite for the pool of Python worker processes running the code of the agents.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.pool = PythonWorkerPool(size=1, cwd=cls.temp_dir.name, warm_imports=["json"], cpu_time=1, wall_time=5)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.close()
+        cls.temp_dir.cleanup()
+
+    def test_run_output_and_cwd(self):
+        """Test that the output is returned and the code runs in the pool working directory."""
+        result = self.pool.run("import os\nprint('hello')\nprint(os.getcwd())")
+        self.assertEqual(result["status"], "ok")
+        self.assertEqual(result["output"].split("\n")[0], "hello")
+        self.assertEqual(os.path.realpath(result["output"].split("\n")[1]), os.path.realpath(self.temp_dir.name))
+
+    def test_streamed_output(self):
+        """Test that the listener receives the whole output."""
+        chunks = []
+        result = self.pool.run("for i in range(3):\n    print(i)", listener=chunks.append)
+        self.assertEqual(''.join(chunks), "0\n1\n2\n")
+        self.assertEqual(result["output"], "0\n1\n2\n")
+
+    def test_errors_and_isolation(self):
+        """Test that exceptions and exit are reported and variables don't leak between runs."""
+        self.pool.run("leaked = 42")
+        result = self.pool.run("print('before')\nprint(leaked)")
+        self.assertEqual(result["status"], "error")
+        self.assertIn("NameError", result["error"])
+        self.assertEqual(result["output"], "before\n")
+        self.assertEqual(self.pool.run("import sys\nsys.exit(1)")["status"], "exit")
+
+    def test_wall_time_limit(self):
+        """Test that a runaway loop is stopped and the worker replaced."""
+        pool = PythonWorkerPool(size=1, warm_imports=[], wall_time=1, cpu_time=0)
+        try:
+            result = pool.run("import time\nprint('start')\nwhile True: time.sleep(0.1)")
+            self.assertEqual(result["status"], "timeout")
+            self.assertEqual(result["output"], "start\n")
+            self.assertEqual(pool.run("print('alive')")["output"], "alive\n")
+            self.assertEqual(pool.get_stats()["recycled"], 1)
+        finally:
+            pool.close()
+
+    def test_threads_output_does_not_leak(self):
+        """Test that a worker whose code left a thread printing is replaced before the next run."""
+        code = "import threading, time\ndef talk():\n    for _ in range(20):\n        print('from thread')\n        time.sleep(0.05)\nthreading.Thread(target=talk).start()\nprint('started')"
+        recycled = self.pool.get_stats()["recycled"]
+        result = self.pool.run(code)
+        self.assertEqual(result["threads"], 1)
+        self.assertEqual(self.pool.get_stats()["recycled"], recycled + 1)
+        self.assertEqual(self.pool.run("import time\ntime.sleep(0.2)\nprint('clean')")["output"], "clean\n")
+
+    def test_interpreter_starts_pool_lazily(self):
+        self.assertIsNone(PyInterpreter().pool)
+
+    @unittest.skipIf(resource is None, "CPU time limit needs the resource module")
+    def test_cpu_time_limit(self):
+        """Test that a busy loop is killed by the CPU time limit."""
+        result = self.pool.run("while True: pass")
+        self.assertEqual(result["status"], "cpu")
+        self.assertEqual(self.pool.run("print('alive')")["output"], "alive\n")
+
+if __name__ == '__main__':
+    unittest.main()